@@ -0,0 +1,77 @@
+"""
+Background worker for the ROP Exporter queue (see shelf_export_rops).
+
+Run with hython:
+    hython rop_export_worker.py <hip snapshot> <rop path> <output parm> <original $HIP> <original $HIPNAME>
+
+Loads the hip snapshot, restores $HIP/$HIPNAME of the session that queued
+the job so relative output paths resolve as they would interactively, then
+renders the ROP. Progress is reported as one JSON object per stdout line.
+"""
+import json
+import os
+import sys
+import time
+
+import hou
+
+
+def emit(**event):
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def main(hip_path, rop_path, output_parm_name, hip_dir, hip_name):
+    hou.hipFile.load(hip_path, suppress_save_prompt=True, ignore_load_warnings=True)
+    hou.hscript(f'set -g HIP = "{hip_dir}"')
+    hou.hscript(f'set -g HIPNAME = "{hip_name}"')
+    hou.hscript("varchange")
+
+    rop = hou.node(rop_path)
+    if rop is None:
+        emit(event="done", error=f"Node not found: {rop_path}", seconds=0.0)
+        return 1
+
+    parm = rop.parm(output_parm_name) if output_parm_name else None
+    start = time.perf_counter()
+    frame_start = [start]
+
+    def on_render_event(rop_node, event_type, frame_time):
+        if event_type == hou.ropRenderEventType.PreFrame:
+            frame_start[0] = time.perf_counter()
+        elif event_type == hou.ropRenderEventType.PostFrame:
+            output = parm.evalAtTime(frame_time) if parm else ""
+            emit(
+                event="frame",
+                frame=hou.timeToFrame(frame_time),
+                seconds=time.perf_counter() - frame_start[0],
+                output=output,
+                bytes=file_size(output) if output else 0,
+            )
+
+    has_callbacks = hasattr(rop, 'addRenderEventCallback')
+    if has_callbacks:
+        rop.addRenderEventCallback(on_render_event)
+
+    error = None
+    try:
+        rop.render()
+    except hou.Error as e:
+        error = str(e)
+    finally:
+        if has_callbacks:
+            rop.removeRenderEventCallback(on_render_event)
+
+    emit(event="done", error=error, seconds=time.perf_counter() - start)
+    return 1 if error else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:6]))
@@ -1,89 +1,628 @@
 import hou
+import os
+import json
+import re
+import time
+from collections import deque
+from datetime import datetime
+from functools import partial
 from PySide6 import QtWidgets, QtCore, QtGui
 
-# --- Define the list of all ROP types we want to search for ---
-ROP_TYPES_TO_FIND = ['rop_fbx', 'rop_geometry', 'rop_alembic']
+# --- Define the ROP types we want to search for, per node type category ---
+# SOP-level ROPs, their /out (Driver) equivalents and the LOP USD ROP. Driver
+# nodes are found wherever they live, including ROP networks nested in LOP and
+# TOP networks.
+ROP_TYPES_TO_FIND = {
+    'Sop': ('rop_fbx', 'rop_geometry', 'rop_alembic'),
+    'Driver': ('filmboxfbx', 'geometry', 'alembic', 'usd'),
+    'Lop': ('usd_rop',),
+}
+
+# --- Output file parm and default extension for every supported ROP type ---
+ROP_OUTPUT_PARMS = {
+    'rop_geometry': ('sopoutput', 'bgeo.sc'),
+    'rop_fbx': ('sopoutput', 'fbx'),
+    'rop_alembic': ('filename', 'abc'),
+    'geometry': ('sopoutput', 'bgeo.sc'),
+    'filmboxfbx': ('sopoutput', 'fbx'),
+    'alembic': ('filename', 'abc'),
+    'usd': ('lopoutput', 'usd'),
+    'usd_rop': ('lopoutput', 'usd'),
+}
+
+DEFAULT_OUTPUT_TEMPLATE = "$HIP/export/{parent}/{rop}.{ext}"
+# {{ / }} escape a brace; a {name} right after $ is a Houdini variable (${HIP})
+OUTPUT_TEMPLATE_TOKEN = re.compile(r"\{\{|\}\}|(?<!\$)\{([A-Za-z_]\w*)\}")
+
+
+# --- Core Logic Functions ---
+
+class RopIndex:
+    """
+    Caches every ROP instance of the configured types, gathered in a single
+    type-filtered pass over hou.NodeType.instances(). The cache is dropped
+    when a hip file is loaded/cleared/merged (see _on_hip_event) or when a
+    node is created or deleted in a top-level manager or in a network that
+    holds a ROP. A watched node drops its callbacks when it is deleted, and
+    ROPs destroyed along with a nested network are filtered out when the
+    cache is read.
+    """
+
+    MANAGER_PATHS = ("/out", "/obj", "/stage")
+    NODE_EVENTS = (hou.nodeEventType.ChildCreated, hou.nodeEventType.ChildDeleted)
+    DELETE_EVENTS = (hou.nodeEventType.BeingDeleted,)
+    HIP_EVENTS = (hou.hipFileEventType.AfterLoad, hou.hipFileEventType.AfterClear, hou.hipFileEventType.AfterMerge)
+
+    def __init__(self, rop_types):
+        self.rop_types = rop_types
+        self._rops = None
+        self._watched = {}  # sessionId -> node
+
+    def on_hip_event(self, event_type):
+        if event_type in self.HIP_EVENTS:
+            self.invalidate()
+
+    def _on_node_event(self, **kwargs):
+        self.invalidate()
+
+    def _on_watched_deleted(self, node, **kwargs):
+        self._watched.pop(node.sessionId(), None)
+        self._unwatch(node)
+        self.invalidate()
+
+    def _watch(self, network):
+        if network.sessionId() in self._watched:
+            return
+        try:
+            network.addEventCallback(self.NODE_EVENTS, self._on_node_event)
+            network.addEventCallback(self.DELETE_EVENTS, self._on_watched_deleted)
+        except hou.Error:
+            return
+        self._watched[network.sessionId()] = network
+
+    def _unwatch(self, network):
+        for events, callback in ((self.NODE_EVENTS, self._on_node_event), (self.DELETE_EVENTS, self._on_watched_deleted)):
+            try:
+                network.removeEventCallback(events, callback)
+            except (hou.Error, hou.ObjectWasDeleted):
+                pass
+
+    def unwatch_all(self):
+        for network in self._watched.values():
+            self._unwatch(network)
+        self._watched = {}
+
+    def invalidate(self):
+        """Forces the next query to rediscover ROPs."""
+        self._rops = None
+
+    @staticmethod
+    def _alive(node):
+        try:
+            node.path()
+        except hou.ObjectWasDeleted:
+            return False
+        return True
+
+    def rops(self):
+        """Returns every matching ROP node in the scene (cached)."""
+        if self._rops is None:
+            self.unwatch_all()
+            categories = hou.nodeTypeCategories()
+            found = []
+            for category_name, type_names in self.rop_types.items():
+                category = categories.get(category_name)
+                if category is None:
+                    continue
+                for type_name in type_names:
+                    node_type = hou.nodeType(category, type_name)
+                    if node_type is not None:
+                        found.extend(node_type.instances())
+            self._rops = found
+
+            networks = [hou.node(path) for path in self.MANAGER_PATHS]
+            networks.extend(rop.parent() for rop in found)
+            for network in networks:
+                if network is not None:
+                    self._watch(network)
+        else:
+            self._rops = [rop for rop in self._rops if self._alive(rop)]
+        return self._rops
 
 
-# --- Core Logic Functions (Unchanged) ---
+def _on_hip_event(event_type):
+    rop_index.on_hip_event(event_type)
 
-def find_rop_nodes_in_selection(rop_type_names):
+
+def _register_hip_callback():
+    """Registers _on_hip_event once, replacing the one from a previous load of this module."""
+    for callback in hou.hipFile.eventCallbacks():
+        if getattr(callback, "__module__", None) == __name__ and getattr(callback, "__name__", None) == "_on_hip_event":
+            hou.hipFile.removeEventCallback(callback)
+    hou.hipFile.addEventCallback(_on_hip_event)
+
+
+# A reload keeps the module globals: detach the previous index's node callbacks
+_previous_index = globals().get("rop_index")
+if _previous_index is not None:
+    _previous_index.unwatch_all()
+rop_index = RopIndex(ROP_TYPES_TO_FIND)
+_register_hip_callback()
+
+
+def _group_by_parent(rop_nodes):
+    found_rops_by_parent = {}
+    for node in rop_nodes:
+        found_rops_by_parent.setdefault(node.parent().path(), []).append(node)
+    return found_rops_by_parent
+
+
+def find_rop_nodes_in_selection(index=None):
     """
     Finds ROP nodes within the user's current selection and their children.
     Returns a dictionary grouped by the ROP's immediate parent node path.
     """
-    selection = hou.selectedNodes()
-    found_rops_by_parent = {}
+    index = index or rop_index
+    selected_paths = [node.path() for node in hou.selectedNodes()]
+    prefixes = tuple(path.rstrip("/") + "/" for path in selected_paths)
+    selected = set(selected_paths)
+
+    matches = [
+        rop for rop in index.rops()
+        if rop.path() in selected or rop.path().startswith(prefixes)
+    ]
+    return _group_by_parent(matches)
 
-    nodes_to_process = []
-    for sel_node in selection:
-        # Add all children of the selected node
-        nodes_to_process.extend(sel_node.allSubChildren())
-        # Also check the selected node itself, in case it's a ROP
-        nodes_to_process.append(sel_node)
-
-    # Use a set to get a unique list of nodes to check
-    unique_nodes = set(nodes_to_process)
-
-    for node in unique_nodes:
-        if node.type().name() in rop_type_names:
-            parent_path = node.parent().path()
-            if parent_path not in found_rops_by_parent:
-                found_rops_by_parent[parent_path] = []
-            
-            # Since we're iterating over a unique set, no duplicate check needed here
-            found_rops_by_parent[parent_path].append(node)
-            
-    return found_rops_by_parent
 
-def find_rop_nodes_in_all_obj(rop_type_names):
+def find_all_rop_nodes(index=None):
     """
-    Finds all ROP nodes whose type matches any in the provided list,
-    searching all nodes under /obj.
+    Finds all ROP nodes of the configured types in every context
+    (/obj, /out, LOP and TOP networks).
     Returns a dictionary grouped by parent node.
     """
-    obj_node = hou.node("/obj")
-    if not obj_node:
-        hou.ui.displayMessage("'/obj' node not found.", severity=hou.severityType.Error)
-        return {}
+    index = index or rop_index
+    found_rops_by_parent = _group_by_parent(index.rops())
 
-    found_rops_by_parent = {}
+    if not found_rops_by_parent:
+        print("Search complete. No matching ROP nodes were found in the scene.")
 
-    all_obj_children = obj_node.allSubChildren()
+    return found_rops_by_parent
 
-    for child_node in all_obj_children:
-        if child_node.type().name() in rop_type_names:
-            parent_path = child_node.parent().path()
-            if parent_path not in found_rops_by_parent:
-                found_rops_by_parent[parent_path] = []
-            found_rops_by_parent[parent_path].append(child_node)
 
-    if not any(found_rops_by_parent.values()):
-        print("Search complete. No matching ROP nodes were found in /obj.")
-        
-    return found_rops_by_parent
+# --- Export Instrumentation ---
 
+HISTORY_DIR = "$HIP/export_history"
 
-def execute_rops(rop_nodes):
+
+def _output_parm(rop):
+    """Returns the parm holding the ROP's output file path, or None."""
+    parm_name, _ = ROP_OUTPUT_PARMS.get(rop.type().name(), ('sopoutput', ''))
+    return rop.parm(parm_name)
+
+
+def expand_output_template(template, rop):
+    """
+    Fills an output path template for a ROP. Supported fields are {parent},
+    {rop}, {type} and {ext}, and {{ / }} give literal braces. Houdini
+    variables such as $HIP, ${HIP} or $F4 and any other brace text are left
+    for the parm to expand. Raises ValueError on an unknown {field}.
+    """
+    _, ext = ROP_OUTPUT_PARMS.get(rop.type().name(), ('', 'bgeo.sc'))
+    fields = {
+        'parent': rop.parent().name(),
+        'rop': rop.name(),
+        'type': rop.type().name(),
+        'ext': ext,
+    }
+
+    def substitute(match):
+        name = match.group(1)
+        if name is None:
+            return match.group(0)[0]
+        if name not in fields:
+            known = ", ".join(f"{{{field}}}" for field in fields)
+            raise ValueError(f"Unknown field {{{name}}}. Use {known}, or {{{{ and }}}} for literal braces.")
+        return fields[name]
+
+    return OUTPUT_TEMPLATE_TOKEN.sub(substitute, template)
+
+
+def set_output_paths(paths_by_rop):
+    """
+    Sets the output path of many ROPs in a single undo block.
+    Returns a list of (rop, error message) for the ROPs that failed.
+    """
+    failures = []
+    with hou.undos.group(f"Set output path on {len(paths_by_rop)} ROP(s)"):
+        for rop, path in paths_by_rop.items():
+            parm = _output_parm(rop)
+            if not parm:
+                failures.append((rop, "No output path parameter."))
+                continue
+            try:
+                parm.set(path)
+            except hou.Error as e:
+                failures.append((rop, str(e)))
+    return failures
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _frame_range(rop):
+    """Returns the frames a ROP will write, based on its Valid Frame Range parms."""
+    trange = rop.parm('trange')
+    if not trange or trange.eval() == 0:
+        return [hou.frame()]
+    start, end, step = (rop.parm(name).eval() for name in ('f1', 'f2', 'f3'))
+    step = step or 1
+    count = int((end - start) / step) + 1
+    return [start + i * step for i in range(max(1, count))]
+
+
+class RopExportStats:
     """
-    Executes 'Save to Disk' on a list of ROP nodes.
+    Timing and throughput for a single ROP execution. Per-frame entries are
+    filled in by render event callbacks; ROP types without callback support
+    are timed as a whole and their per-frame times marked "estimated".
+    """
+
+    def __init__(self, rop):
+        self.rop = rop
+        self.path = rop.path()
+        self.type_name = rop.type().name()
+        self.status = "Queued"
+        self.error = None
+        self.start = None
+        self.seconds = 0.0
+        self.frames = []
+        self.estimated = False
+        self._frame_start = None
+
+    @property
+    def bytes_written(self):
+        # Single-file outputs (e.g. Alembic) report the same path every frame,
+        # so only the latest size per path counts.
+        sizes = {frame["output"]: frame["bytes"] for frame in self.frames}
+        return sum(sizes.values())
+
+    @property
+    def fps(self):
+        return len(self.frames) / self.seconds if self.seconds > 0 else 0.0
+
+    def begin(self):
+        self.status = "Running"
+        self.start = time.perf_counter()
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def _add_frame(self, frame, seconds, output, estimated=False):
+        record = {
+            "frame": frame,
+            "seconds": seconds,
+            "output": output,
+            "bytes": _file_size(output) if output else 0,
+        }
+        if estimated:
+            record["estimated"] = True
+        self.frames.append(record)
+
+    def end_frame(self, frame_time):
+        now = time.perf_counter()
+        parm = _output_parm(self.rop)
+        output = parm.evalAtTime(frame_time) if parm else ""
+        self._add_frame(hou.timeToFrame(frame_time), now - (self._frame_start or self.start), output)
+        self.seconds = now - self.start
+        self._frame_start = None
+
+    def record_unsplit_run(self, frames):
+        """
+        Spreads a run that raised no frame events evenly over its frames;
+        those per-frame times are estimates, not measurements.
+        """
+        per_frame = (time.perf_counter() - self.start) / len(frames)
+        parm = _output_parm(self.rop)
+        self.estimated = True
+        for frame in frames:
+            self._add_frame(frame, per_frame, parm.evalAtFrame(frame) if parm else "", estimated=True)
+
+    def finish(self, error=None):
+        self.seconds = time.perf_counter() - self.start
+        self.error = error
+        self.status = "Failed" if error else "Done"
+
+    def as_dict(self):
+        return {
+            "path": self.path,
+            "type": self.type_name,
+            "status": self.status,
+            "error": self.error,
+            "seconds": round(self.seconds, 4),
+            "frame_count": len(self.frames),
+            "bytes": self.bytes_written,
+            "fps": round(self.fps, 3),
+            "estimated": self.estimated,
+            "frames": self.frames,
+        }
+
+
+def _format_bytes(num):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num < 1024.0 or unit == "GB":
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024.0
+
+
+def write_export_history(stats_list, total_seconds):
+    """
+    Writes one JSON file per export run under $HIP/export_history so timings
+    can be compared between versions of an asset. Returns the file path.
+    """
+    history_dir = hou.text.expandString(HISTORY_DIR)
+    hip_name = os.path.splitext(hou.hipFile.basename())[0]
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    history_path = os.path.join(history_dir, f"{hip_name}_{stamp}.json")
+
+    record = {
+        "hip": hou.hipFile.path(),
+        "houdini_version": hou.applicationVersionString(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "total_seconds": round(total_seconds, 4),
+        "rops": [stats.as_dict() for stats in stats_list],
+    }
+    try:
+        os.makedirs(history_dir, exist_ok=True)
+        with open(history_path, 'w') as f:
+            json.dump(record, f, indent=4)
+    except OSError as e:
+        print(f"Could not write export history: {e}")
+        return None
+    return history_path
+
+
+def execute_rops(rop_nodes, progress_callback=None):
+    """
+    Executes 'Save to Disk' on a list of ROP nodes, timing every ROP and frame.
+    progress_callback(stats) is called whenever a ROP starts, finishes a frame
+    or completes. Returns the list of RopExportStats.
     """
     if not rop_nodes:
         print("No ROP nodes were provided for execution.")
-        return
+        return []
 
     print(f"\nExecuting {len(rop_nodes)} ROP node(s)...")
-    
-    for rop in rop_nodes:
+
+    def notify(stats):
+        if progress_callback:
+            progress_callback(stats)
+
+    stats_list = [RopExportStats(rop) for rop in rop_nodes]
+    run_start = time.perf_counter()
+
+    for stats in stats_list:
+        rop = stats.rop
+
+        def on_render_event(rop_node, event_type, frame_time, stats=stats):
+            if event_type == hou.ropRenderEventType.PreFrame:
+                stats.begin_frame()
+            elif event_type == hou.ropRenderEventType.PostFrame:
+                stats.end_frame(frame_time)
+                notify(stats)
+
+        has_callbacks = hasattr(rop, 'addRenderEventCallback')
+        if has_callbacks:
+            rop.addRenderEventCallback(on_render_event)
+
+        print(f"-> Executing {stats.path}")
+        stats.begin()
+        notify(stats)
+        error = None
         try:
-            print(f"-> Executing {rop.path()}")
             rop.render()
         except hou.Error as e:
-            message = f"Error executing {rop.path()}:\n{e}"
-            print(message)
-            hou.ui.displayMessage(message, severity=hou.severityType.Error)
-            
-    print("\nExecution complete.")
+            error = str(e)
+            print(f"Error executing {stats.path}:\n{e}")
+        finally:
+            if has_callbacks:
+                rop.removeRenderEventCallback(on_render_event)
+
+        if not stats.frames and not error:
+            stats.record_unsplit_run(_frame_range(rop))
+        stats.finish(error)
+        notify(stats)
+        print(f"   {stats.status} in {stats.seconds:.2f}s, {len(stats.frames)} frame(s), "
+              f"{_format_bytes(stats.bytes_written)}, {stats.fps:.2f} fps"
+              f"{' (per-frame times estimated)' if stats.estimated else ''}")
+
+    total_seconds = time.perf_counter() - run_start
+    history_path = write_export_history(stats_list, total_seconds)
+    if history_path:
+        print(f"Export history written to {history_path}")
+
+    failed = [stats for stats in stats_list if stats.error]
+    if failed:
+        message = "\n\n".join(f"Error executing {stats.path}:\n{stats.error}" for stats in failed)
+        hou.ui.displayMessage(message, severity=hou.severityType.Error)
+
+    print(f"\nExecution complete in {total_seconds:.2f}s.")
+    return stats_list
+
+
+# --- Background Export Queue ---
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rop_export_worker.py")
+
+FINISHED_STATES = ("Done", "Failed", "Cancelled")
+
+
+def _hython_path():
+    executable = "hython.exe" if os.name == "nt" else "hython"
+    return os.path.join(hou.text.expandString("$HFS"), "bin", executable)
+
+
+class ExportJob(RopExportStats):
+    """
+    A ROP export queued on the ExportQueueService. Frames and timings are
+    reported by the hython worker; seconds is the worker's render time, not
+    including the hip load.
+    """
+
+    def __init__(self, rop, snapshot, batch_id):
+        super().__init__(rop)
+        self.snapshot = snapshot
+        self.batch_id = batch_id
+        self.process = None
+        self._reported_seconds = None
+        self._buffer = b""
+
+    def finish(self, error=None):
+        super().finish(error)
+        if self._reported_seconds is not None:
+            self.seconds = self._reported_seconds
+
+    def cancel(self):
+        self.status = "Cancelled"
+
+
+class ExportQueueService(QtCore.QObject):
+    """
+    Module-level export queue. Jobs are rendered by hython worker processes
+    from a backup snapshot of the current hip file, so Houdini stays
+    interactive and the queue keeps draining after the exporter window is
+    closed. Any exporter window can reconnect to job_updated and read jobs.
+    """
+
+    job_updated = QtCore.Signal(object)
+
+    def __init__(self, max_workers=2):
+        super().__init__()
+        self.max_workers = max_workers
+        self.jobs = []
+        self._pending = deque()
+        self._running = []
+        self._batches = {}
+        self._batch_count = 0
+
+    def submit(self, rop_nodes):
+        """Snapshots the hip file and queues one job per ROP. Returns the jobs."""
+        snapshot = hou.hipFile.saveAsBackup()
+        self._batch_count += 1
+        batch_id = self._batch_count
+
+        jobs = [ExportJob(rop, snapshot, batch_id) for rop in rop_nodes]
+        self._batches[batch_id] = (jobs, time.perf_counter())
+        for job in jobs:
+            self.jobs.append(job)
+            self._pending.append(job)
+            self.job_updated.emit(job)
+
+        self._start_next()
+        return jobs
+
+    def set_max_workers(self, count):
+        self.max_workers = max(1, count)
+        self._start_next()
+
+    def summary(self):
+        return f"Queue: {len(self._running)} running, {len(self._pending)} pending"
+
+    def latest_jobs(self):
+        """Returns {rop path: most recent job} for every ROP ever queued."""
+        return {job.path: job for job in self.jobs}
+
+    def cancel_all(self):
+        """Drops pending jobs and kills running workers."""
+        while self._pending:
+            job = self._pending.popleft()
+            job.cancel()
+            self.job_updated.emit(job)
+            self._complete_batch_if_done(job.batch_id)
+        for job in list(self._running):
+            job.cancel()
+            job.process.kill()
+
+    def _start_next(self):
+        while self._pending and len(self._running) < self.max_workers:
+            self._launch(self._pending.popleft())
+
+    def _launch(self, job):
+        parm = _output_parm(job.rop)
+        arguments = [
+            WORKER_SCRIPT, job.snapshot, job.path, parm.name() if parm else "",
+            hou.text.expandString("$HIP"), hou.text.expandString("$HIPNAME"),
+        ]
+
+        process = QtCore.QProcess(self)
+        process.readyReadStandardOutput.connect(partial(self._on_output, job))
+        process.finished.connect(partial(self._on_finished, job))
+        process.errorOccurred.connect(partial(self._on_error, job))
+        job.process = process
+
+        self._running.append(job)
+        job.begin()
+        self.job_updated.emit(job)
+        process.start(_hython_path(), arguments)
+
+    def _on_output(self, job):
+        job._buffer += job.process.readAllStandardOutput().data()
+        *lines, job._buffer = job._buffer.split(b"\n")
+        for line in lines:
+            line = line.strip()
+            if not line.startswith(b"{"):
+                continue # hython banner or ROP chatter
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+
+            if event.pop("event", None) == "frame":
+                job.frames.append(event)
+                job.seconds = time.perf_counter() - job.start
+            else:
+                job._reported_seconds = event.get("seconds")
+                job.error = event.get("error")
+        self.job_updated.emit(job)
+
+    def _on_error(self, job, error):
+        if error == QtCore.QProcess.ProcessError.FailedToStart:
+            self._on_finished(job, -1, None, error=f"Could not start {_hython_path()}")
+
+    def _on_finished(self, job, exit_code, exit_status, error=None):
+        if job not in self._running:
+            return
+        self._running.remove(job)
+
+        if job.status != "Cancelled":
+            error = error or job.error
+            if not error and exit_code != 0:
+                error = f"Worker exited with code {exit_code}"
+            job.finish(error)
+        job.process.deleteLater()
+        job.process = None
+
+        self.job_updated.emit(job)
+        self._complete_batch_if_done(job.batch_id)
+        self._start_next()
+
+    def _complete_batch_if_done(self, batch_id):
+        jobs, batch_start = self._batches.get(batch_id, ((), 0.0))
+        if jobs and all(job.status in FINISHED_STATES for job in jobs):
+            del self._batches[batch_id]
+            history_path = write_export_history(jobs, time.perf_counter() - batch_start)
+            if history_path:
+                print(f"Export history written to {history_path}")
+
+
+# A reload keeps the module globals: keep the live queue so running hython
+# workers and their job state aren't orphaned
+export_queue = globals().get("export_queue")
+if export_queue is None:
+    export_queue = ExportQueueService()
 
 
 # --- PySide6 GUI Class ---
@@ -92,6 +631,8 @@ class RopExporterUI(QtWidgets.QWidget):
     
     ui_instance = None
 
+    HEADER_LABELS = ["ROP Name", "Node", "Output Path", "Status", "Time", "Size", "FPS"]
+
     def __init__(self, parent=None):
         # PySide6: Explicitly set the window flag type
         super().__init__(parent=hou.qt.mainWindow(), f=QtCore.Qt.WindowType.Window)
@@ -103,7 +644,9 @@ class RopExporterUI(QtWidgets.QWidget):
 
         # --- WIDGETS ---
         self.rop_model = QtGui.QStandardItemModel()
-        self.rop_model.setHorizontalHeaderLabels(["ROP Name", "Node", "Output Path"])
+        self.rop_model.setHorizontalHeaderLabels(self.HEADER_LABELS)
+        # ROP path -> [status, time, size, fps] items, updated live during export
+        self.stats_items = {}
 
         self.rop_tree_view = QtWidgets.QTreeView()
         self.rop_tree_view.setModel(self.rop_model)
@@ -122,6 +665,8 @@ class RopExporterUI(QtWidgets.QWidget):
         self.rop_tree_view.header().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Interactive)
         self.rop_tree_view.header().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Interactive)
         self.rop_tree_view.header().setSectionResizeMode(2, QtWidgets.QHeaderView.ResizeMode.Stretch)
+        for column in range(3, len(self.HEADER_LABELS)):
+            self.rop_tree_view.header().setSectionResizeMode(column, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
         
         self.rop_tree_view.header().resizeSection(0, 150)
         self.rop_tree_view.header().resizeSection(1, 150)
@@ -129,8 +674,23 @@ class RopExporterUI(QtWidgets.QWidget):
         self.rop_tree_view.header().setStyleSheet("QHeaderView::section { padding-left: 20px; padding-right: 40px; }")
         
         self.main_label = QtWidgets.QLabel("Found ROPs:")
+        self.template_edit = QtWidgets.QLineEdit(DEFAULT_OUTPUT_TEMPLATE)
+        self.template_edit.setToolTip(
+            "Output path template. Fields: {parent}, {rop}, {type}, {ext}; {{ and }} for literal braces.\n"
+            "Houdini variables like $HIP, ${HIP} and $F4 are kept as-is."
+        )
+        self.apply_template_button = QtWidgets.QPushButton("Apply to Selected")
         self.refresh_button = QtWidgets.QPushButton("Refresh List")
         self.export_button = QtWidgets.QPushButton("Export Selected ROPs")
+        self.background_checkbox = QtWidgets.QCheckBox("Run in Background")
+        self.background_checkbox.setChecked(True)
+        self.background_checkbox.setToolTip("Queue exports on hython worker processes so Houdini stays interactive.")
+        self.workers_spinbox = QtWidgets.QSpinBox()
+        self.workers_spinbox.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers_spinbox.setValue(export_queue.max_workers)
+        self.workers_spinbox.setPrefix("Workers: ")
+        self.cancel_button = QtWidgets.QPushButton("Cancel Queue")
+        self.queue_label = QtWidgets.QLabel(export_queue.summary())
         
         # --- Layout ---
         main_layout = QtWidgets.QVBoxLayout(self)
@@ -139,24 +699,49 @@ class RopExporterUI(QtWidgets.QWidget):
         
         main_layout.addWidget(self.main_label)
         main_layout.addWidget(self.rop_tree_view)
+
+        template_layout = QtWidgets.QHBoxLayout()
+        template_layout.addWidget(QtWidgets.QLabel("Output Template:"))
+        template_layout.addWidget(self.template_edit)
+        template_layout.addWidget(self.apply_template_button)
+        main_layout.addLayout(template_layout)
         
+        queue_layout = QtWidgets.QHBoxLayout()
+        queue_layout.addWidget(self.background_checkbox)
+        queue_layout.addWidget(self.workers_spinbox)
+        queue_layout.addStretch()
+        queue_layout.addWidget(self.queue_label)
+        queue_layout.addWidget(self.cancel_button)
+        main_layout.addLayout(queue_layout)
+
         button_layout = QtWidgets.QHBoxLayout()
         button_layout.addWidget(self.refresh_button)
         button_layout.addWidget(self.export_button)
         main_layout.addLayout(button_layout)
 
         # --- Connections ---
-        self.refresh_button.clicked.connect(self.populate_tree)
+        self.refresh_button.clicked.connect(self.refresh_list)
         self.export_button.clicked.connect(self.export_selected)
+        self.apply_template_button.clicked.connect(self.apply_output_template)
+        self.workers_spinbox.valueChanged.connect(export_queue.set_max_workers)
+        self.cancel_button.clicked.connect(export_queue.cancel_all)
+        export_queue.job_updated.connect(self.on_job_updated)
         self.rop_model.itemChanged.connect(self.on_item_changed)
 
         # Initial population
         self.populate_tree()
 
+    def refresh_list(self):
+        """
+        Drops the cached ROP index and repopulates the tree.
+        """
+        rop_index.invalidate()
+        self.populate_tree()
+
     def populate_tree(self):
         """
         Clears the tree and fills it with ROPs.
-        Searches selection first, then falls back to all of /obj.
+        Searches selection first, then falls back to every context in the scene.
         """
         # Temporarily disconnect the signal to prevent it firing during population
         try:
@@ -165,17 +750,18 @@ class RopExporterUI(QtWidgets.QWidget):
             pass # Signal wasn't connected
         
         self.rop_model.clear()
-        self.rop_model.setHorizontalHeaderLabels(["ROP Name", "Node", "Output Path"])
+        self.rop_model.setHorizontalHeaderLabels(self.HEADER_LABELS)
+        self.stats_items = {}
         
         selection = hou.selectedNodes()
         found_rops_by_parent = {}
         
         if selection:
             self.main_label.setText("Found ROPs in selected node(s):")
-            found_rops_by_parent = find_rop_nodes_in_selection(ROP_TYPES_TO_FIND)
+            found_rops_by_parent = find_rop_nodes_in_selection()
         else:
-            self.main_label.setText("Found ROPs in /obj (grouped by parent node):")
-            found_rops_by_parent = find_rop_nodes_in_all_obj(ROP_TYPES_TO_FIND)
+            self.main_label.setText("Found ROPs in scene (grouped by parent node):")
+            found_rops_by_parent = find_all_rop_nodes()
         
         if not any(found_rops_by_parent.values()):
             no_rops_item = QtGui.QStandardItem("No matching ROPs found.")
@@ -199,18 +785,28 @@ class RopExporterUI(QtWidgets.QWidget):
                     node_path_item = QtGui.QStandardItem(parent_path)
                     node_path_item.setEditable(False)
                     
-                    output_path = rop_node.parm('sopoutput').eval() if rop_node.parm('sopoutput') else ""
-                    rop_output_item = QtGui.QStandardItem(output_path)
+                    output_parm = _output_parm(rop_node)
+                    rop_output_item = QtGui.QStandardItem(output_parm.unexpandedString() if output_parm else "")
+                    rop_output_item.setEditable(output_parm is not None)
                     
                     # Store the hou.Node object. PySide6 prefers ItemDataRole enum for clarity.
                     rop_name_item.setData(rop_node, QtCore.Qt.ItemDataRole.UserRole)
                     rop_output_item.setData(rop_node, QtCore.Qt.ItemDataRole.UserRole)
                     
-                    parent_item.appendRow([rop_name_item, node_path_item, rop_output_item])
+                    stats_items = [QtGui.QStandardItem("") for _ in range(4)]
+                    for stats_item in stats_items:
+                        stats_item.setEditable(False)
+                    self.stats_items[rop_node.path()] = stats_items
+
+                    parent_item.appendRow([rop_name_item, node_path_item, rop_output_item] + stats_items)
                 
                 self.rop_model.appendRow(parent_item)
                 self.rop_tree_view.expand(parent_item.index())
             
+        # Show the state of exports queued from this or an earlier window
+        for job in export_queue.latest_jobs().values():
+            self.update_stats(job)
+
         # Reconnect the signal
         self.rop_model.itemChanged.connect(self.on_item_changed)
             
@@ -225,51 +821,127 @@ class RopExporterUI(QtWidgets.QWidget):
         if item.column() != 2:
             return
 
-        new_path = item.text()
         # PySide6: Retrieve data using ItemDataRole enum
         rop_node = item.data(QtCore.Qt.ItemDataRole.UserRole)
-        
-        if isinstance(rop_node, hou.Node) and rop_node.parm('sopoutput'):
-            try:
-                # Set the parameter on the actual Houdini node
-                rop_node.parm('sopoutput').set(new_path)
-                print(f"Updated {rop_node.path()} output path to: {new_path}")
-            except hou.Error as e:
-                message = f"Error setting output path for {rop_node.path()}:\n{e}"
-                print(message)
-                hou.ui.displayMessage(message, severity=hou.severityType.Error)
-                
-                # If setting the param fails, revert the UI text to the node's actual value
-                self.rop_model.itemChanged.disconnect(self.on_item_changed)
-                item.setText(rop_node.parm('sopoutput').eval())
-                self.rop_model.itemChanged.connect(self.on_item_changed)
+        if isinstance(rop_node, hou.Node):
+            self._apply_output_paths({rop_node: item.text()})
+
+    def _output_items(self):
+        """Returns {rop path: output path item} for every ROP row."""
+        items = {}
+        for parent_row in range(self.rop_model.rowCount()):
+            parent_item = self.rop_model.item(parent_row)
+            for row in range(parent_item.rowCount()):
+                output_item = parent_item.child(row, 2)
+                rop_node = output_item.data(QtCore.Qt.ItemDataRole.UserRole) if output_item else None
+                if isinstance(rop_node, hou.Node):
+                    items[rop_node.path()] = output_item
+        return items
+
+    def _apply_output_paths(self, paths_by_rop):
+        """
+        Sets the output paths in one undoable batch, then syncs the
+        Output Path cells with the values now on the nodes.
+        """
+        failures = set_output_paths(paths_by_rop)
+
+        self.rop_model.itemChanged.disconnect(self.on_item_changed)
+        output_items = self._output_items()
+        for rop_node in paths_by_rop:
+            output_item = output_items.get(rop_node.path())
+            output_parm = _output_parm(rop_node)
+            if output_item and output_parm:
+                output_item.setText(output_parm.unexpandedString())
+        self.rop_model.itemChanged.connect(self.on_item_changed)
 
-    def export_selected(self):
+        updated = len(paths_by_rop) - len(failures)
+        print(f"Updated output path on {updated} ROP(s).")
+        if failures:
+            message = "\n".join(f"Error setting output path for {rop.path()}: {error}" for rop, error in failures)
+            print(message)
+            hou.ui.displayMessage(message, severity=hou.severityType.Error)
+
+    def apply_output_template(self):
         """
-        Gets the selected ROP nodes from the tree view and runs the execute function.
+        Expands the output template for every selected ROP and applies all
+        paths in one undoable operation.
         """
-        selection_model = self.rop_tree_view.selectionModel()
-        selected_indexes = selection_model.selectedRows(0) # Get selected rows from the first column
-        
-        if not selected_indexes:
-            hou.ui.displayMessage("No ROPs selected in the list to export.", severity=hou.severityType.Warning)
+        rop_nodes = self.selected_rop_nodes()
+        if not rop_nodes:
+            hou.ui.displayMessage("No ROPs selected in the list.", severity=hou.severityType.Warning)
             return
-            
-        nodes_to_export = []
-        for index in selected_indexes:
+
+        template = self.template_edit.text().strip()
+        # Every path is expanded before the undo group opens, so a bad template changes nothing
+        try:
+            paths_by_rop = {rop: expand_output_template(template, rop) for rop in rop_nodes}
+        except ValueError as e:
+            hou.ui.displayMessage(f"Invalid output template:\n{e}", severity=hou.severityType.Error)
+            return
+        self._apply_output_paths(paths_by_rop)
+
+    def update_stats(self, stats):
+        """
+        Streams a ROP's export progress (a RopExportStats or queued
+        ExportJob) into its row.
+        """
+        items = self.stats_items.get(stats.path)
+        if not items:
+            return
+        status_item, time_item, size_item, fps_item = items
+
+        status = stats.status
+        if status == "Running" and stats.frames:
+            status = f"Running ({len(stats.frames)} fr)"
+        status_item.setText(status)
+        status_item.setToolTip(stats.error or "")
+        time_item.setText(f"{stats.seconds:.2f}s" if stats.seconds else "")
+        size_item.setText(_format_bytes(stats.bytes_written) if stats.frames else "")
+        fps_item.setText(f"{'~' if stats.estimated else ''}{stats.fps:.2f}" if stats.frames else "")
+        fps_item.setToolTip("Estimated: this ROP type reports no per-frame events" if stats.estimated else "")
+
+    def _update_stats_blocking(self, stats):
+        # Synchronous exports run on the UI thread; flush events so rows repaint.
+        self.update_stats(stats)
+        QtWidgets.QApplication.processEvents()
+
+    def on_job_updated(self, job):
+        self.update_stats(job)
+        self.queue_label.setText(export_queue.summary())
+
+    def selected_rop_nodes(self):
+        """
+        Returns the unique ROP nodes selected in the tree view, ignoring
+        the parent group rows.
+        """
+        selection_model = self.rop_tree_view.selectionModel()
+        nodes = []
+        for index in selection_model.selectedRows(0): # Get selected rows from the first column
             # We only care about child items (the actual ROPs), not the parent groups
             if index.parent().isValid():
                 item = self.rop_model.itemFromIndex(index)
                 if item:
                     # PySide6: Retrieve data using ItemDataRole enum
                     node = item.data(QtCore.Qt.ItemDataRole.UserRole)
-                    if isinstance(node, hou.Node):
-                        nodes_to_export.append(node)
-        
-        if nodes_to_export:
-            # Use a set to ensure each node is exported only once, even if selected multiple times
-            unique_nodes_to_export = list(set(nodes_to_export))
-            execute_rops(unique_nodes_to_export)
+                    if isinstance(node, hou.Node) and node not in nodes:
+                        nodes.append(node)
+        return nodes
+
+    def export_selected(self):
+        """
+        Gets the selected ROP nodes from the tree view and runs the execute function.
+        """
+        if not self.rop_tree_view.selectionModel().selectedRows(0):
+            hou.ui.displayMessage("No ROPs selected in the list to export.", severity=hou.severityType.Warning)
+            return
+
+        nodes_to_export = self.selected_rop_nodes()
+        if nodes_to_export and self.background_checkbox.isChecked():
+            export_queue.submit(nodes_to_export)
+        elif nodes_to_export:
+            for rop in nodes_to_export:
+                self.update_stats(RopExportStats(rop))
+            execute_rops(nodes_to_export, progress_callback=self._update_stats_blocking)
         else:
             hou.ui.displayMessage("No actual ROP nodes were selected. Please select the child ROP items, not the parent categories.", severity=hou.severityType.Warning)
 
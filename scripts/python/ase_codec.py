@@ -0,0 +1,215 @@
+import os
+import struct
+import threading
+from collections import OrderedDict, namedtuple
+
+# -----------------------------------------------------------------------------
+# Adobe Swatch Exchange (.ase) codec shared by the swatch tools
+# (axtools.swatches, batch_palettes)
+#
+# Layout (big-endian): "ASEF", version u16 major/minor, u32 block count, then
+# blocks of u16 type + u32 length. Color blocks hold a UTF-16 name, a 4-byte
+# model ("RGB ", "CMYK", "LAB ", "Gray"), float32 values and a u16 color
+# type; group start/end blocks bracket colors. Parsing walks a memoryview
+# with precompiled Structs, so no per-field slices are copied.
+# -----------------------------------------------------------------------------
+
+BLOCK_COLOR = 0x0001
+BLOCK_GROUP_START = 0xc001
+BLOCK_GROUP_END = 0xc002
+
+COLOR_TYPES = ("global", "spot", "normal")
+COLOR_TYPE_NORMAL = 2
+
+_HEADER = struct.Struct(">4sHHI")
+_BLOCK = struct.Struct(">HI")
+_U16 = struct.Struct(">H")
+_MODEL_VALUES = {
+    "RGB": struct.Struct(">3f"),
+    "CMYK": struct.Struct(">4f"),
+    "LAB": struct.Struct(">3f"),
+    "Gray": struct.Struct(">f"),
+}
+_RGB_COLOR = struct.Struct(">4s3fH")
+
+# name, 0-1 sRGB tuple, source model, raw model values, enclosing group (or None), color type
+AseColor = namedtuple("AseColor", ["name", "rgb", "model", "values", "group", "color_type"])
+
+
+class AseError(ValueError):
+    """Raised for malformed files; colors holds whatever was decoded before the error."""
+
+    def __init__(self, message, colors=()):
+        super().__init__(message)
+        self.colors = list(colors)
+
+
+def cmyk_to_rgb(c, m, y, k):
+    """Converts CMYK color values to RGB."""
+    r = 1.0 - min(1.0, c * (1 - k) + k)
+    g = 1.0 - min(1.0, m * (1 - k) + k)
+    b = 1.0 - min(1.0, y * (1 - k) + k)
+    return (r, g, b)
+
+
+# CIE XYZ (D50, Bradford-adapted) -> linear sRGB
+_XYZ_D50_TO_SRGB = (
+    (3.1338561, -1.6168667, -0.4906146),
+    (-0.9787684, 1.9161415, 0.0334540),
+    (0.0719453, -0.2289914, 1.4052427),
+)
+_WHITE_D50 = (0.96422, 1.0, 0.82521)
+
+
+def lab_to_rgb(l, a, b):
+    """
+    Converts ASE LAB values to 0-1 sRGB. ASE stores L as 0-1 (percent / 100)
+    and a/b in their natural -128..127 range, relative to D50.
+    """
+    fy = (l * 100.0 + 16.0) / 116.0
+    fx = fy + a / 500.0
+    fz = fy - b / 200.0
+    xyz = [
+        (f ** 3 if f ** 3 > 216.0 / 24389.0 else (116.0 * f - 16.0) * 27.0 / 24389.0) * white
+        for f, white in zip((fx, fy, fz), _WHITE_D50)
+    ]
+    rgb = []
+    for row in _XYZ_D50_TO_SRGB:
+        linear = min(1.0, max(0.0, sum(m * v for m, v in zip(row, xyz))))
+        rgb.append(linear * 12.92 if linear <= 0.0031308 else 1.055 * linear ** (1.0 / 2.4) - 0.055)
+    return tuple(rgb)
+
+
+def to_rgb(model, values):
+    if model == "RGB":
+        return tuple(values)
+    if model == "CMYK":
+        return cmyk_to_rgb(*values)
+    if model == "LAB":
+        return lab_to_rgb(*values)
+    if model == "Gray":
+        return (values[0],) * 3
+    raise AseError(f"Unsupported color model: {model}")
+
+
+def _read_name(view, pos):
+    """UTF-16BE name with u16 length (in code units, including the terminator)."""
+    (length,) = _U16.unpack_from(view, pos)
+    pos += 2
+    end = pos + length * 2
+    name = str(view[pos:end], "utf_16_be").rstrip("\0")
+    return name, end
+
+
+def decode(data):
+    """Decodes ASE bytes (or any buffer) into a list of AseColor."""
+    view = memoryview(data)
+    size = len(view)
+    if size < _HEADER.size:
+        raise AseError("File too small to be an ASE file.")
+    magic, _, _, _ = _HEADER.unpack_from(view, 0)
+    if magic != b"ASEF":
+        raise AseError("Invalid ASE file header.")
+
+    colors = []
+    group = None
+    pos = _HEADER.size
+    try:
+        while pos + _BLOCK.size <= size:
+            block_type, block_len = _BLOCK.unpack_from(view, pos)
+            pos += _BLOCK.size
+            block_end = pos + block_len
+            if block_end > size:
+                raise AseError(f"Truncated block at byte {pos - _BLOCK.size}.", colors)
+
+            if block_type == BLOCK_COLOR:
+                name, at = _read_name(view, pos)
+                model = str(view[at:at + 4], "ascii").strip()
+                values_struct = _MODEL_VALUES.get(model)
+                if values_struct is not None:
+                    values = values_struct.unpack_from(view, at + 4)
+                    type_at = at + 4 + values_struct.size
+                    color_type = _U16.unpack_from(view, type_at)[0] if type_at + 2 <= block_end else COLOR_TYPE_NORMAL
+                    colors.append(AseColor(name, to_rgb(model, values), model, values, group, color_type))
+            elif block_type == BLOCK_GROUP_START:
+                group = _read_name(view, pos)[0] if block_len else ""
+            elif block_type == BLOCK_GROUP_END:
+                group = None
+            pos = block_end
+    except (struct.error, UnicodeDecodeError) as e:
+        raise AseError(f"Error parsing ASE block: {e}", colors)
+    return colors
+
+
+def _encode_name(name):
+    encoded = name.encode("utf_16_be") + b"\0\0"
+    return _U16.pack(len(encoded) // 2) + encoded
+
+
+def _encode_block(block_type, payload):
+    return _BLOCK.pack(block_type, len(payload)) + payload
+
+
+def encode(swatches, group=None):
+    """Encodes [(name, (r, g, b)), ...] with 0-1 floats as ASE bytes, optionally inside a group."""
+    blocks = []
+    if group:
+        blocks.append(_encode_block(BLOCK_GROUP_START, _encode_name(group)))
+    for name, (r, g, b) in swatches:
+        payload = _encode_name(name) + _RGB_COLOR.pack(b"RGB ", r, g, b, COLOR_TYPE_NORMAL)
+        blocks.append(_encode_block(BLOCK_COLOR, payload))
+    if group:
+        blocks.append(_encode_block(BLOCK_GROUP_END, b""))
+    return _HEADER.pack(b"ASEF", 1, 0, len(blocks)) + b"".join(blocks)
+
+
+def write_ase(path, swatches, group=None):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(encode(swatches, group))
+
+
+class AseLibraryCache:
+    """
+    Decoded libraries keyed by path, valid while mtime and size match, with
+    LRU eviction by library count. Entries are tuples, safe to share.
+    """
+
+    def __init__(self, max_libraries=64):
+        self.max_libraries = max_libraries
+        self._entries = OrderedDict()  # path -> (mtime_ns, size, colors)
+        self._lock = threading.Lock()
+
+    def read(self, path):
+        path = os.path.normcase(os.path.abspath(path))
+        stat = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(path)
+                return entry[2]
+
+        with open(path, "rb") as f:
+            colors = tuple(decode(f.read()))
+
+        with self._lock:
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, colors)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_libraries:
+                self._entries.popitem(last=False)
+        return colors
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+library_cache = AseLibraryCache()
+
+
+def read_ase(path):
+    """
+    Cached decode of an .ase file: a tuple of AseColor. Raises IOError for
+    unreadable files and AseError (with the partial colors) for bad data.
+    """
+    return library_cache.read(path)
@@ -0,0 +1,16 @@
+"""
+Shared tool code for the axtools shelves, Python panels and HDAs.
+
+Subpackages load on first attribute access (axtools.swatches,
+axtools.materials), so importing axtools from a shelf button costs nothing
+until a tool is actually used.
+"""
+import importlib
+
+_SUBPACKAGES = ("swatches", "materials")
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,49 @@
+"""
+Material graph engine shared by the quick material HDAs and shelf tools
+(createOctaneMaterial, createRedshiftMaterial, createSolarisMaterials and
+the autoCreate* / CreateOctaneSolarisMaterial scripts).
+
+    from axtools import materials
+    materials.HdaMaterialBuilder(node, ["octane", "karma"], context="lop").build()
+
+A texture folder is scanned and classified once into MaterialDescriptions;
+renderer backends turn those into nodes. Modules are imported on first use.
+
+    description  MaterialDescription, suffix parms, folder scanning (no hou)
+    backends     Octane / Redshift / Karma / Arnold backends and their registry
+    engine       MaterialEngine, HdaMaterialBuilder
+    manifest     BuildManifest: what the last build used, for incremental rebuilds
+"""
+import importlib
+
+_EXPORTS = {
+    "CHANNELS": "description",
+    "SUFFIX_PARMS": "description",
+    "LEGACY_SUFFIX_PARMS": "description",
+    "DEFAULT_SUFFIXES": "description",
+    "TEXDIR_PARMS": "description",
+    "LEGACY_TEXDIR_PARMS": "description",
+    "TextureMap": "description",
+    "MaterialDescription": "description",
+    "describe_folder": "description",
+    "describe_textures": "description",
+    "Backend": "backends",
+    "register_backend": "backends",
+    "get_backend": "backends",
+    "MaterialEngine": "engine",
+    "HdaMaterialBuilder": "engine",
+    "BuildManifest": "manifest",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
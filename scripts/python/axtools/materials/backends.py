@@ -0,0 +1,248 @@
+from collections import namedtuple
+
+import hou
+
+# -----------------------------------------------------------------------------
+# Renderer backends: how a MaterialDescription becomes nodes
+#
+# A backend is data plus a few hooks: the material container type, the core
+# nodes inside it (surface shader, output, optional displacement), and per
+# channel the image node type, its parms and where it is wired. The engine
+# does the creating, updating and wiring, so adding a renderer means adding
+# a Backend subclass and registering it.
+# -----------------------------------------------------------------------------
+
+# Image node per channel: type, input on the target core node, parms set on
+# creation, optional secondary node between image and target, and the core
+# role it plugs into ("surface", "output" or "displacement")
+ImageSpec = namedtuple("ImageSpec", ["node_type", "port", "parms", "secondary", "target"], defaults=({}, None, "surface"))
+
+# Utility node between image and target: type, input the image feeds, parms kept in sync
+SecondarySpec = namedtuple("SecondarySpec", ["node_type", "input", "parms"], defaults=({},))
+
+# Node multiplying base color by AO: type, the two inputs, parms set on creation
+MultiplySpec = namedtuple("MultiplySpec", ["node_type", "input1", "input2", "parms"], defaults=({},))
+
+# Where the displacement amount goes: "secondary" (the channel's secondary
+# node) or "displacement" (the core displacement node), parm name, default
+DisplacementSpec = namedtuple("DisplacementSpec", ["role", "parm", "default"])
+
+
+class Backend:
+    renderer = ""
+    label = ""
+    # Prefix of material names when several renderers build into one collect node
+    prefix = ""
+    container_type = None
+    surface_type = None
+    output_type = None
+    output_input = None
+    displacement_type = None
+    # Core roles wired into the output, as (output input, role)
+    output_wiring = ()
+    file_parm = "file"
+    images = {}
+    multiply = None
+    displacement = None
+
+    def owns(self, material):
+        """True if an existing material node was built by this backend."""
+        return material.type().name() == self.container_type
+
+    def create_container(self, parent, name):
+        return parent.createNode(self.container_type, name)
+
+    def core_nodes(self, material):
+        """
+        {role: node} for the surface shader, output and displacement node
+        (when the backend has one), creating missing ones and wiring them.
+        """
+        found = {}
+        types = {self.surface_type: "surface", self.output_type: "output", self.displacement_type: "displacement"}
+        for child in material.children():
+            role = types.get(child.type().name())
+            if role and role not in found:
+                found[role] = child
+        for node_type, role in types.items():
+            if node_type and role not in found:
+                found[role] = material.createNode(node_type)
+        found["output"].setNamedInput(self.output_input, found["surface"], 0)
+        for output_input, role in self.output_wiring:
+            found["output"].setNamedInput(output_input, found[role], 0)
+        return found
+
+
+class OctaneBackend(Backend):
+    """Octane VOP network in a matnet (Octane quick material SOP)."""
+    renderer = "octane"
+    label = "Octane"
+    prefix = "OR_"
+    container_type = "octane_vopnet"
+    surface_type = "NT_MAT_UNIVERSAL"
+    output_type = "octane_material"
+    output_input = "material"
+    file_parm = "A_FILENAME"
+    images = {
+        "basecolor": ImageSpec("NT_TEX_IMAGE", "albedo", {"colorSpace": "NAMED_COLOR_SPACE_SRGB"}),
+        "ao": ImageSpec("NT_TEX_IMAGE", None, {"colorSpace": "NAMED_COLOR_SPACE_OTHER"}),
+        "specular": ImageSpec("NT_TEX_FLOATIMAGE", "specular", {"colorSpace": "NAMED_COLOR_SPACE_OTHER"}),
+        "roughness": ImageSpec("NT_TEX_FLOATIMAGE", "roughness", {"colorSpace": "NAMED_COLOR_SPACE_OTHER"}),
+        "metallic": ImageSpec("NT_TEX_FLOATIMAGE", "metallic", {"colorSpace": "NAMED_COLOR_SPACE_OTHER"}),
+        "opacity": ImageSpec("NT_TEX_FLOATIMAGE", "opacity", {"colorSpace": "NAMED_COLOR_SPACE_OTHER"}),
+        "normal": ImageSpec("NT_TEX_IMAGE", "normal", {"colorSpace": "NAMED_COLOR_SPACE_OTHER"}),
+        "displacement": ImageSpec(
+            "NT_TEX_FLOATIMAGE", "displacement", {"colorSpace": "NAMED_COLOR_SPACE_OTHER"},
+            SecondarySpec("NT_VERTEX_DISPLACEMENT", "texture", {"black_level": 0.5}),
+        ),
+        "emission": ImageSpec(
+            "NT_TEX_IMAGE", "emission", {"colorSpace": "NAMED_COLOR_SPACE_SRGB"},
+            SecondarySpec("NT_EMIS_TEXTURE", "efficiency_or_texture"),
+        ),
+    }
+    multiply = MultiplySpec("NT_TEX_MULTIPLY", "texture1", "texture2")
+    displacement = DisplacementSpec("secondary", "amount", 0.01)
+
+    def create_container(self, parent, name):
+        material = parent.createNode(self.container_type, name)
+        # Delete default nodes immediately so we have a clean slate
+        material.deleteItems(material.children())
+        return material
+
+
+class OctaneSolarisBackend(OctaneBackend):
+    """Octane material builder in a LOP material library."""
+    container_type = "octane_solaris_material_builder"
+    images = dict(OctaneBackend.images, ao=ImageSpec("NT_TEX_FLOATIMAGE", None, {"colorSpace": "NAMED_COLOR_SPACE_OTHER"}))
+
+    def create_container(self, parent, name):
+        return parent.createNode(self.container_type, name)
+
+    def core_nodes(self, material):
+        unwanted_node = material.node('Material_Standard_Surface1')
+        if unwanted_node:
+            unwanted_node.destroy()
+        return super().core_nodes(material)
+
+
+class RedshiftBackend(Backend):
+    """Redshift VOP network in a matnet (Redshift quick material SOP)."""
+    renderer = "redshift"
+    label = "Redshift"
+    prefix = "RS_"
+    container_type = "redshift_vopnet"
+    surface_type = "redshift::StandardMaterial"
+    output_type = "redshift_material"
+    output_input = "Surface"
+    file_parm = "tex0"
+    images = {
+        "basecolor": ImageSpec("redshift::TextureSampler", "base_color", {"tex0_colorSpace": "Auto"}),
+        "ao": ImageSpec("redshift::TextureSampler", None, {"tex0_colorSpace": "Auto"}),
+        "roughness": ImageSpec("redshift::TextureSampler", "refl_roughness", {"tex0_colorSpace": "Raw"}),
+        "metallic": ImageSpec("redshift::TextureSampler", "metalness", {"tex0_colorSpace": "Raw"}),
+        "opacity": ImageSpec("redshift::TextureSampler", "opacity", {"tex0_colorSpace": "Auto"}),
+        "emission": ImageSpec("redshift::TextureSampler", "emission_color", {"tex0_colorSpace": "sRGB"}),
+        "normal": ImageSpec(
+            "redshift::TextureSampler", "bump_input", {"tex0_colorSpace": "Raw"},
+            SecondarySpec("redshift::BumpMap", "input", {"inputType": "1"}),
+        ),
+        "displacement": ImageSpec(
+            "redshift::TextureSampler", "Displacement", {"tex0_colorSpace": "Raw"},
+            SecondarySpec("redshift::Displacement", "texMap"), target="output",
+        ),
+    }
+    multiply = MultiplySpec("redshift::RSMathMulVector", "input1", "input2")
+    displacement = DisplacementSpec("secondary", "scale", 0.01)
+
+
+class RedshiftSolarisBackend(RedshiftBackend):
+    """Redshift USD material builder in a LOP material library."""
+    container_type = "rs_usd_material_builder"
+    surface_type = "StandardMaterial"
+    output_type = "redshift_usd_material"
+
+
+class KarmaBackend(Backend):
+    """MaterialX builder subnet for Karma in a LOP material library."""
+    renderer = "karma"
+    label = "Karma"
+    prefix = "KMA_"
+    container_type = "subnet"
+    surface_type = "mtlxstandard_surface"
+    output_type = "suboutput"
+    output_input = "surface"
+    displacement_type = "mtlxdisplacement"
+    output_wiring = (("displacement", "displacement"),)
+    images = {
+        "basecolor": ImageSpec("mtlximage", "base_color", {"signature": "color3"}),
+        "ao": ImageSpec("mtlximage", None, {"signature": "float"}),
+        "specular": ImageSpec("mtlximage", "specular", {"signature": "float"}),
+        "roughness": ImageSpec("mtlximage", "specular_roughness", {"signature": "float"}),
+        "metallic": ImageSpec("mtlximage", "metalness", {"signature": "float"}),
+        "opacity": ImageSpec("mtlximage", "transmission", {"signature": "float"}),
+        "normal": ImageSpec("mtlximage", "normal", {"signature": "vector3"}, SecondarySpec("mtlxnormalmap", "in")),
+        "displacement": ImageSpec("mtlximage", "displacement", {"signature": "float"}, target="displacement"),
+        "emission": ImageSpec("mtlximage", "emission_color", {"signature": "color3"}),
+    }
+    multiply = MultiplySpec("mtlxmultiply", "in1", "in2", {"signature": "color3"})
+    displacement = DisplacementSpec("displacement", "scale", 0.1)
+
+    def owns(self, material):
+        # Karma builders are plain subnets; anything that isn't another renderer's builder counts
+        return material.type().name() not in {backend.container_type for backend in _BACKENDS.values() if backend is not self}
+
+    def create_container(self, parent, name):
+        import voptoolutils
+        return voptoolutils._setupMtlXBuilderSubnet(
+            destination_node=parent,
+            name=name,
+            mask=voptoolutils.KARMAMTLX_TAB_MASK,
+            folder_label='Karma Material Builder'
+        )
+
+
+class ArnoldBackend(Backend):
+    """Arnold material builder (matnet or LOP material library)."""
+    renderer = "arnold"
+    label = "Arnold"
+    prefix = "AR_"
+    container_type = "arnold_materialbuilder"
+    surface_type = "arnold::standard_surface"
+    output_type = "arnold_material"
+    output_input = "surface"
+    file_parm = "filename"
+    images = {
+        "basecolor": ImageSpec("arnold::image", "base_color", {"color_space": "auto"}),
+        "ao": ImageSpec("arnold::image", None, {"color_space": "Raw"}),
+        "specular": ImageSpec("arnold::image", "specular", {"color_space": "Raw"}),
+        "roughness": ImageSpec("arnold::image", "specular_roughness", {"color_space": "Raw"}),
+        "metallic": ImageSpec("arnold::image", "metalness", {"color_space": "Raw"}),
+        "opacity": ImageSpec("arnold::image", "opacity", {"color_space": "Raw"}),
+        "normal": ImageSpec("arnold::image", "normal", {"color_space": "Raw"}, SecondarySpec("arnold::normal_map", "input")),
+        "displacement": ImageSpec("arnold::image", "displacement", {"color_space": "Raw"}, target="output"),
+        "emission": ImageSpec("arnold::image", "emission_color", {"color_space": "auto"}),
+    }
+    multiply = MultiplySpec("arnold::multiply", "input1", "input2")
+
+
+# (renderer, context) -> backend; context is "sop" (matnet inside a SOP HDA) or "lop"
+_BACKENDS = {
+    ("octane", "sop"): OctaneBackend(),
+    ("octane", "lop"): OctaneSolarisBackend(),
+    ("redshift", "sop"): RedshiftBackend(),
+    ("redshift", "lop"): RedshiftSolarisBackend(),
+    ("karma", "lop"): KarmaBackend(),
+    ("arnold", "sop"): ArnoldBackend(),
+    ("arnold", "lop"): ArnoldBackend(),
+}
+
+
+def register_backend(renderer, context, backend):
+    """Adds or replaces the backend used for renderer in context ("sop" or "lop")."""
+    _BACKENDS[(renderer.lower(), context)] = backend
+
+
+def get_backend(renderer, context):
+    backend = _BACKENDS.get((renderer.lower(), context))
+    if backend is None:
+        raise hou.OperationFailed(f"No {context.upper()} material backend for renderer '{renderer}'")
+    return backend
@@ -0,0 +1,132 @@
+import os
+from collections import namedtuple
+
+import texture_sets
+import megascans_metadata
+
+# -----------------------------------------------------------------------------
+# Renderer-agnostic material descriptions
+#
+# A texture folder is scanned and classified once (texture_sets) into one
+# MaterialDescription per texture set: the material name, where its files
+# live and which file feeds each channel. Backends only ever see these, so
+# the scanning and matching rules are the same for every renderer and tool.
+# No hou imports.
+# -----------------------------------------------------------------------------
+
+CHANNELS = ("basecolor", "ao", "specular", "roughness", "metallic", "opacity", "normal", "displacement", "emission")
+
+# Suffix list parms per channel on the quick material HDAs; the first one present is used
+SUFFIX_PARMS = {
+    "basecolor": ("albedo_suffix", "basecolor_suffix"),
+    "ao": ("ambientocclusion_suffix",),
+    "specular": ("specular_suffix",),
+    "roughness": ("roughness_suffix",),
+    "metallic": ("metallic_suffix",),
+    "opacity": ("opacity_suffix",),
+    "normal": ("normal_suffix",),
+    "displacement": ("displacement_suffix",),
+    "emission": ("emission_suffix",),
+}
+
+# Single-suffix parms of the 1.0 quick material HDAs
+LEGACY_SUFFIX_PARMS = {
+    "basecolor": ("ch_baseColor",),
+    "ao": ("ch_ambientocclusion",),
+    "roughness": ("ch_roughness",),
+    "metallic": ("ch_metallic",),
+    "opacity": ("ch_opacity",),
+    "normal": ("ch_normal",),
+    "displacement": ("ch_displacement",),
+    "emission": ("ch_emissive",),
+}
+
+# Defaults of the quick material HDAs, used for channels without a parm
+DEFAULT_SUFFIXES = {
+    "basecolor": ["albedo", "basecolor", "base_color", "diffuse", "diff"],
+    "ao": ["ambientocclusion", "ao", "ambient_occlusion", "occlusion"],
+    "specular": ["specular", "spec", "glossiness", "gloss"],
+    "roughness": ["roughness", "rough"],
+    "metallic": ["metallic", "metalness"],
+    "opacity": ["opacity", "transparency", "alpha"],
+    "normal": ["normal", "normals", "normal_map", "norm"],
+    "displacement": ["displacement", "disp", "height", "displace"],
+    "emission": ["emission", "emissive"],
+}
+
+# HDA multiparm (name + iteration) that shows each channel's texture path
+TEXDIR_PARMS = {
+    "basecolor": "basecolordir",
+    "ao": "aodir",
+    "specular": "speculardir",
+    "roughness": "roughnessdir",
+    "metallic": "metallicdir",
+    "opacity": "opacitydir",
+    "normal": "normaldir",
+    "displacement": "displacementdir",
+    "emission": "emissivedir",
+}
+
+# Texture path parms of the 1.0 quick material HDAs
+LEGACY_TEXDIR_PARMS = dict(TEXDIR_PARMS, ao="ambientocclusiondir", metallic="metalnessdir")
+
+# channel key, configured suffix it matched, file name in the material's folder
+TextureMap = namedtuple("TextureMap", ["channel", "suffix", "filename"])
+
+
+class MaterialDescription(namedtuple("MaterialDescription", ["name", "directory", "directory_path", "maps", "metadata"])):
+    """
+    One texture set: name, folder as written in paths (may hold variables
+    such as $MEGASCANS), evaluated folder, {channel: TextureMap} and the
+    folder's MegascansMetadata.
+    """
+    __slots__ = ()
+
+    def path(self, channel):
+        """Texture path for the node parm, keeping the folder's variables."""
+        return os.path.join(self.directory, self.maps[channel].filename)
+
+    def eval_path(self, channel):
+        return os.path.join(self.directory_path, self.maps[channel].filename)
+
+
+def suffixes_from_node(node, suffix_parms=SUFFIX_PARMS, defaults=DEFAULT_SUFFIXES):
+    """{channel: [suffix, ...]} from the HDA's suffix parms, falling back to defaults."""
+    suffixes = {}
+    for channel in CHANNELS:
+        parm = next((node.parm(name) for name in suffix_parms.get(channel, ()) if node.parm(name)), None)
+        suffixes[channel] = parm.evalAsString().split() if parm else list(defaults.get(channel, ()))
+    return suffixes
+
+
+def list_texture_files(directory_path):
+    """Texture file names directly in directory_path (preview renders excluded)."""
+    try:
+        with os.scandir(directory_path) as entries:
+            return [entry.name for entry in entries if texture_sets.is_texture_file(entry.name) and entry.is_file()]
+    except OSError:
+        return []
+
+
+def describe_textures(files, suffixes, directory, directory_path, metadata=None):
+    """MaterialDescriptions, sorted by name, for texture file names of one folder."""
+    metadata = metadata or megascans_metadata.MegascansMetadata()
+    index = texture_sets.index_texture_sets(files, [suffix for channel in CHANNELS for suffix in suffixes.get(channel, ())])
+    descriptions = []
+    for name in sorted(index):
+        maps = {}
+        for channel in CHANNELS:
+            suffix, filename = texture_sets.find_texture(index, name, suffixes.get(channel, ()))
+            if filename:
+                maps[channel] = TextureMap(channel, suffix, filename)
+        if maps:
+            descriptions.append(MaterialDescription(name, directory, directory_path, maps, metadata))
+    return descriptions
+
+
+def describe_folder(directory, directory_path, suffixes):
+    """MaterialDescriptions for a texture folder, with its cached Megascans metadata."""
+    if not os.path.isdir(directory_path):
+        return []
+    metadata = megascans_metadata.folder_metadata(directory_path)
+    return describe_textures(list_texture_files(directory_path), suffixes, directory, directory_path, metadata)
@@ -0,0 +1,497 @@
+import os
+
+import hou
+
+import texture_sets
+import material_library
+
+from ..network import batched_network_edit
+from .backends import get_backend
+from .manifest import BuildManifest, backend_key, file_stats, graph_signature, settings_signature
+from .description import (
+    SUFFIX_PARMS, DEFAULT_SUFFIXES, TEXDIR_PARMS, describe_folder, describe_textures, suffixes_from_node,
+)
+
+# -----------------------------------------------------------------------------
+# Material graph engine
+#
+# MaterialEngine turns a MaterialDescription into one backend's node graph
+# under a parent network: it finds or creates the container and core nodes,
+# creates each image node with its parms in a single setParms call, updates
+# only what differs on existing graphs and reports created/updated/skipped.
+#
+# HdaMaterialBuilder drives it from a quick material HDA: reads the folder
+# and suffix parms, builds every texture set with one or more backends in
+# one undo step with cooking held, fills the HDA's material slots and
+# texture path parms, and ingests whole libraries (material_library).
+# Builds are incremental: a BuildManifest on the HDA records what each
+# material was built from, and unchanged texture sets skip the engine.
+# -----------------------------------------------------------------------------
+
+# Tolerance for comparing float parms against the values they should hold
+_EPSILON = 0.00001
+
+
+def _parm_differs(parm, value):
+    current = parm.eval()
+    if isinstance(current, float) and isinstance(value, (int, float)):
+        return abs(current - value) > _EPSILON
+    return current != value
+
+
+def _node_suffix(suffix):
+    """Suffix as used in node names ("_Base Color" -> "Base_Color")."""
+    return "_".join(token for token in texture_sets.tokenize(suffix) if token)
+
+
+class MaterialEngine:
+    """Creates or updates materials of one backend under one parent network."""
+
+    def __init__(self, backend, parent):
+        self.backend = backend
+        self.parent = parent
+
+    def image_names(self, description):
+        """{channel: image node name} inside a material built from description."""
+        return {
+            channel: f"{description.name}_{_node_suffix(texture.suffix)}"
+            for channel, texture in description.maps.items() if channel in self.backend.images
+        }
+
+    def owns(self, name):
+        """False if parent holds a node called name that another backend built."""
+        material = self.parent.node(name)
+        return material is None or self.backend.owns(material)
+
+    def build_material(self, description, name=None, displacement_scale=None, texdir_parms=None):
+        """
+        Creates or updates the material for description, named name (default
+        the description's name). texdir_parms maps channels to HDA parms
+        that get a reference to the channel's file parm.
+        Returns (material node or None, "created" / "updated" / "skipped").
+        """
+        name = name or description.name
+        if not self.owns(name):
+            return None, "skipped"
+
+        material = self.parent.node(name)
+        is_new = material is None
+        if is_new:
+            material = self.backend.create_container(self.parent, name)
+        core = self.backend.core_nodes(material)
+        texdir_parms = texdir_parms or {}
+
+        changed = False
+        images = {}
+        multiply_ao = self.backend.multiply and "ao" in self.backend.images and "ao" in description.maps
+        for channel in description.maps:
+            spec = self.backend.images.get(channel)
+            if spec is None:
+                continue
+            image, image_changed = self._image_node(material, description, channel, spec, texdir_parms.get(channel))
+            images[channel] = image
+            changed |= image_changed
+            if spec.port is None:
+                continue
+            source, secondary_changed = self._secondary_node(material, image, channel, spec, displacement_scale)
+            changed |= secondary_changed
+            if channel == "basecolor" and multiply_ao:
+                continue
+            core[spec.target].setNamedInput(spec.port, source, 0)
+
+        if multiply_ao and "basecolor" in images:
+            changed |= self._multiply_node(material, description.name, images["basecolor"], images["ao"], core)
+
+        displacement = self.backend.displacement
+        if displacement and displacement.role != "secondary" and displacement.role in core:
+            parm = core[displacement.role].parm(displacement.parm)
+            amount = displacement.default if displacement_scale is None else displacement_scale
+            if parm and _parm_differs(parm, amount):
+                parm.set(amount)
+                changed = True
+
+        if is_new or changed:
+            material.layoutChildren()
+        return material, "created" if is_new else "updated" if changed else "skipped"
+
+    def _image_node(self, material, description, channel, spec, texdir_parm):
+        """(image node, changed) for one channel, created with all its parms at once."""
+        file_parm = self.backend.file_parm
+        file_path = description.path(channel)
+        eval_file_path = description.eval_path(channel)
+        node_name = self.image_names(description)[channel]
+
+        image = material.node(node_name)
+        if image is None:
+            image = material.createNode(spec.node_type)
+            image.setName(node_name, unique_name=True)
+            image.setParms(dict(spec.parms, **{file_parm: file_path}))
+        else:
+            ui_eval_path = texdir_parm.evalAsString() if texdir_parm else eval_file_path
+            if image.parm(file_parm).evalAsString() == eval_file_path and ui_eval_path == eval_file_path:
+                return image, False
+            image.parm(file_parm).set(file_path)
+
+        if texdir_parm:
+            texdir_parm.set(image.parm(file_parm))
+        return image, True
+
+    def _secondary_node(self, material, image, channel, spec, displacement_scale):
+        """(node feeding the target, changed): the image, or its secondary node kept in sync."""
+        secondary = spec.secondary
+        if secondary is None:
+            return image, False
+
+        parms = dict(secondary.parms)
+        displacement = self.backend.displacement
+        if channel == "displacement" and displacement and displacement.role == "secondary":
+            parms[displacement.parm] = displacement.default if displacement_scale is None else displacement_scale
+
+        changed = False
+        node_name = f"{image.name()}_sec"
+        node = material.node(node_name)
+        if node is None:
+            node = material.createNode(secondary.node_type)
+            node.setName(node_name, unique_name=True)
+            node.setNamedInput(secondary.input, image, 0)
+            changed = True
+
+        stale = {name: value for name, value in parms.items() if node.parm(name) and _parm_differs(node.parm(name), value)}
+        if stale:
+            node.setParms(stale)
+            changed = True
+        return node, changed
+
+    def _multiply_node(self, material, name, albedo, ao, core):
+        """Multiplies base color by AO into the surface's base color input; True if created."""
+        spec = self.backend.multiply
+        node_name = f"{name}_albedo_ao_mult"
+        node = material.node(node_name)
+        created = node is None
+        if created:
+            node = material.createNode(spec.node_type)
+            node.setName(node_name, unique_name=True)
+            if spec.parms:
+                node.setParms(spec.parms)
+            node.setNamedInput(spec.input1, albedo, 0)
+            node.setNamedInput(spec.input2, ao, 0)
+        basecolor = self.backend.images["basecolor"]
+        core[basecolor.target].setNamedInput(basecolor.port, node, 0)
+        return created
+
+
+class HdaMaterialBuilder:
+    """
+    Builds the texture sets of a quick material HDA's directory with the
+    backends of renderers in context "sop" (materials in an AX_MATNET
+    matnet, assigned by the material1 SOP) or "lop" (materials in the
+    HDA's first child, a material library).
+
+    With several renderers, or collect=True, each texture set gets a
+    "<name>_collect" node gathering its materials, and material names get
+    the backend prefix when prefixed (default: several renderers).
+    """
+
+    def __init__(
+        self,
+        node,
+        renderers,
+        context="lop",
+        suffix_parms=SUFFIX_PARMS,
+        default_suffixes=DEFAULT_SUFFIXES,
+        suffixes=None,
+        texdir_parms=TEXDIR_PARMS,
+        collect=False,
+        prefixed=None,
+        rename_node=False,
+    ):
+        self.node = node
+        self.context = context
+        self.backends = [get_backend(renderer, context) for renderer in renderers]
+        self.collect = collect or len(self.backends) > 1
+        self.prefixed = len(self.backends) > 1 if prefixed is None else prefixed
+        self.texdir_parms = texdir_parms
+        self.rename_node = rename_node
+        self.iteration = 0
+        self.last_material = None
+
+        try:
+            self.directory = self.node.parm('directory').unexpandedString()
+        except hou.OperationFailed:
+            self.directory = self.node.parm('directory').evalAsString()
+        self.directory_path = self.node.parm('directory').eval()
+        self.suffixes = suffixes or suffixes_from_node(self.node, suffix_parms, default_suffixes)
+
+        if context == "sop":
+            self.mat_node = self.node.node('material1')
+            self.parent = self.node.node('AX_MATNET') or self.node.createNode('matnet', 'AX_MATNET')
+        else:
+            self.mat_node = self.node.children()[0] if self.node.children() else self.node
+            self.parent = self.mat_node
+        self.engines = [MaterialEngine(backend, self.parent) for backend in self.backends]
+
+    @property
+    def label(self):
+        return "/".join(backend.label for backend in self.backends)
+
+    def describe(self):
+        """MaterialDescriptions of the HDA's texture directory."""
+        return describe_folder(self.directory, self.directory_path, self.suffixes)
+
+    def _material_name(self, backend, name):
+        return backend.prefix + name if self.prefixed else name
+
+    def _texdir_parms(self):
+        return {channel: self.node.parm(f"{parm}{self.iteration}") for channel, parm in self.texdir_parms.items()}
+
+    def set_counts(self, total_materials):
+        """Sets the number of texture sets and material slots on the HDA."""
+        if self.node.parm('texSets'):
+            self.node.parm('texSets').set(total_materials)
+        if not self.mat_node:
+            return
+
+        if self.context == "sop":
+            self.mat_node.parm('num_materials').set(total_materials)
+            if self.node.parm('groupnum'):
+                self.node.parm('groupnum').set(total_materials)
+        elif self.mat_node.parm('materials'):
+            self.mat_node.parm('materials').set(total_materials)
+
+    def set_slot(self, total_materials, target):
+        """Points the HDA's material slot for the current iteration at target."""
+        self.set_counts(total_materials)
+        if not self.mat_node:
+            return
+
+        if self.context == "sop":
+            self.mat_node.parm(f'shop_materialpath{self.iteration}').set(f'../{self.parent.name()}/{target.name()}')
+            self.mat_node.parm(f'group{self.iteration}').set(f'@shop_materialpath={target.name()}')
+        else:
+            for slot_parm in (f'matnode{self.iteration}', f'matpath{self.iteration}'):
+                if self.mat_node.parm(slot_parm):
+                    self.mat_node.parm(slot_parm).set(target.name())
+
+    def _collect_node(self, name, materials):
+        """(collect node, created) gathering materials in backend order."""
+        collect = self.parent.node(f"{name}_collect")
+        created = collect is None
+        if created:
+            collect = self.parent.createNode('collect', f"{name}_collect")
+        for index, material in enumerate(materials):
+            if collect.input(index) != material:
+                collect.setInput(index, material, 0)
+        return collect, created
+
+    def _settings(self, source):
+        """Build-wide settings a manifest is valid for; source is the folder or library roots."""
+        return settings_signature([
+            self.context, [backend_key(backend) for backend in self.backends], self.collect, self.prefixed,
+            self.suffixes, self.texdir_parms, self.parent.name(), source,
+        ])
+
+    def _restore_slot(self, engine, entry, total_materials):
+        """
+        Keeps a material the manifest says is current: checks its nodes and
+        image nodes still exist and, when its slot moved, re-points the slot
+        and texture path parms. False when any are missing and it must be
+        rebuilt.
+        """
+        nodes = [self.parent.node(name) for name in entry["nodes"] + [entry["target"]]]
+        if not all(nodes):
+            return False
+        images = {channel: nodes[0].node(name) for channel, name in entry["images"].items()}
+        if not all(images.values()):
+            return False
+        if entry["iteration"] == self.iteration:
+            return True
+
+        self.set_slot(total_materials, nodes[-1])
+        texdir_parms = self._texdir_parms()
+        for channel, image in images.items():
+            if texdir_parms.get(channel):
+                texdir_parms[channel].set(image.parm(engine.backend.file_parm))
+        entry["iteration"] = self.iteration
+        return True
+
+    def build_material(self, description, total_materials, displacement_scale=None, manifest=None):
+        """
+        Creates or updates one texture set with every backend. With a
+        manifest, a texture set built from the same files and graph is only
+        checked and re-slotted, and what gets built is recorded in it.
+        Returns "created", "updated" or "skipped".
+        """
+        engines = [
+            engine for engine in self.engines
+            if engine.owns(self._material_name(engine.backend, description.name))
+        ]
+        if not engines:
+            return "skipped"
+
+        self.iteration += 1
+        self.last_material = description.name
+
+        if manifest is not None:
+            graph = graph_signature(description, displacement_scale)
+            files = file_stats(description)
+            entry = manifest.current(description.name, graph, files)
+            if entry and self._restore_slot(engines[0], entry, total_materials):
+                return "skipped"
+
+        materials = []
+        statuses = set()
+        for index, engine in enumerate(engines):
+            # Only the first backend's image nodes drive the HDA's texture path parms
+            material, status = engine.build_material(
+                description,
+                self._material_name(engine.backend, description.name),
+                displacement_scale,
+                self._texdir_parms() if index == 0 else None,
+            )
+            materials.append(material)
+            statuses.add(status)
+
+        target = materials[0]
+        if self.collect:
+            target, created = self._collect_node(description.name, materials)
+            if created:
+                statuses.add("created")
+        self.set_slot(total_materials, target)
+
+        if manifest is not None:
+            manifest.record(
+                description.name, graph, files, self.iteration, [material.name() for material in materials],
+                target.name(), engines[0].image_names(description),
+            )
+        for status in ("created", "updated"):
+            if status in statuses:
+                return status
+        return "skipped"
+
+    def _report(self, title, total_materials, counts, extra_lines=()):
+        """Shows the created/updated/skipped summary of a build."""
+        msg_lines = [f"Processed {total_materials} {self.label} material(s)."]
+        msg_lines.extend(extra_lines)
+
+        if counts["created"] > 0: msg_lines.append(f"- Created: {counts['created']}")
+        if counts["updated"] > 0: msg_lines.append(f"- Updated: {counts['updated']}")
+        if counts["skipped"] > 0: msg_lines.append(f"- Skipped (unchanged or mismatch): {counts['skipped']}")
+
+        hou.ui.displayMessage("\n".join(msg_lines), title=title)
+
+    def _build_all(self, descriptions, settings, full, label, rename_node, progress=None):
+        """
+        Builds descriptions in one undo step with cooking held, against the
+        HDA's manifest unless full, and renames the HDA after the last
+        material when rename_node. Returns the created/updated/skipped counts.
+        """
+        total_materials = len(descriptions)
+        manifest = BuildManifest(settings) if full else BuildManifest.load(self.node, settings)
+        counts = {"created": 0, "updated": 0, "skipped": 0}
+        self.iteration = 0
+        self.last_material = None
+
+        with batched_network_edit(label):
+            if manifest.total != total_materials:
+                self.set_counts(total_materials)
+            for done, description in enumerate(descriptions, 1):
+                counts[self.build_material(description, total_materials, description.metadata.height, manifest)] += 1
+                if progress:
+                    progress(done, total_materials, description.name)
+            if counts["created"] or counts["updated"]:
+                self.parent.layoutChildren()
+            manifest.save(self.node, [description.name for description in descriptions], total_materials)
+
+            if rename_node and self.last_material and self.node.name() != self.last_material:
+                try:
+                    self.node.setName(self.last_material, unique_name=True)
+                except hou.PermissionError:
+                    pass
+        return counts
+
+    def build(self, full=False):
+        """
+        Creates or updates every texture set of the directory in one undo
+        step. Only texture sets whose files changed since the last build
+        are rebuilt; full=True rebuilds every one (e.g. after editing the
+        generated networks by hand).
+        """
+        descriptions = self.describe()
+        total_materials = len(descriptions)
+
+        if total_materials == 0:
+            hou.ui.displayMessage("No valid textures found in the selected directory.", severity=hou.severityType.Warning, title="No Textures Found")
+            return
+
+        # Every description of the folder shares its Megascans metadata
+        custom_disp_scale = descriptions[0].metadata.height
+        settings = self._settings(["directory", self.directory, self.directory_path])
+        counts = self._build_all(descriptions, settings, full, f"Build {self.label} Materials", self.rename_node)
+
+        extra_lines = [f"- JSON Custom Scale Applied: {custom_disp_scale}"] if custom_disp_scale is not None else []
+        self._report("Material Builder Completed", total_materials, counts, extra_lines)
+
+    def ingest_library(self, roots=None, full=False):
+        """
+        Builds the materials of every texture folder under several library
+        roots in one pass: folders are scanned concurrently (and cached, see
+        material_library), then all materials are created in a single undo
+        step with cooking held until the end. Without roots, asks for them.
+        Like build(), unchanged texture sets are skipped unless full.
+        """
+        if roots is None:
+            selection = hou.ui.selectFile(
+                title="Select Library Folders", file_type=hou.fileType.Directory, multiple_select=True
+            )
+            roots = [path.strip() for path in selection.split(";") if path.strip()]
+        if not roots:
+            return
+
+        expanded_roots = {hou.expandString(root): root for root in roots}
+        cache_path = os.path.join(hou.expandString("$HOUDINI_USER_PREF_DIR"), material_library.LIBRARY_CACHE_NAME)
+        stages = {"scan": "Scanning", "metadata": "Reading metadata"}
+
+        try:
+            with hou.InterruptableOperation("Ingesting material library", long_operation_name="Material Library", open_interrupt_dialog=True) as operation:
+                # An interrupt raised here cancels the scan; scan_library saves its caches before re-raising
+                def report(stage, done, total, path):
+                    operation.updateLongProgress(done / float(max(total, 1)), f"{stages[stage]}: {path}")
+
+                folders = material_library.scan_library(list(expanded_roots), cache_path, progress_callback=report)
+                if folders is None:
+                    return
+
+                # Material names are unique across the library; later duplicates get a numbered suffix
+                descriptions = []
+                taken = set()
+                for folder in folders:
+                    # Keep the root as entered ($MEGASCANS, $JOB, ...) in the texture paths
+                    root = expanded_roots[folder.root]
+                    relative = os.path.relpath(folder.path, folder.root)
+                    directory = root if relative == os.curdir else os.path.join(root, relative)
+                    for description in describe_textures(folder.textures, self.suffixes, directory, folder.path, folder.metadata):
+                        unique = description.name
+                        number = 1
+                        while unique in taken:
+                            number += 1
+                            unique = f"{description.name}_{number}"
+                        taken.add(unique)
+                        descriptions.append(description._replace(name=unique))
+
+                total_materials = len(descriptions)
+                if total_materials == 0:
+                    hou.ui.displayMessage("No valid textures found in the selected folders.", severity=hou.severityType.Warning, title="No Textures Found")
+                    return
+
+                def built(done, total, name):
+                    operation.updateLongProgress(done / float(total), f"Building: {name}")
+
+                settings = self._settings(["library", sorted(roots)])
+                counts = self._build_all(descriptions, settings, full, "Ingest Material Library", False, built)
+        except hou.OperationInterrupted:
+            return
+
+        self._report(
+            "Material Library Ingested", total_materials, counts,
+            [f"- Folders: {len({description.directory_path for description in descriptions})}"],
+        )
@@ -0,0 +1,100 @@
+import os
+import json
+import hashlib
+
+# -----------------------------------------------------------------------------
+# Build manifests for incremental material rebuilds
+#
+# After a build the HDA keeps, in its node user data, what every material
+# was built from: the stat of each texture file, a signature of the graph
+# the backends emitted for it, its slot (iteration) and node names. The
+# next build compares against it and only hands changed texture sets to
+# the engine; unchanged ones cost a few stats and one node lookup. The
+# manifest is dropped when anything that shapes every graph changes
+# (renderers, backend specs, suffixes, folder). Stored in user data, it is
+# saved with the hip file and follows undo. No hou imports.
+# -----------------------------------------------------------------------------
+
+MANIFEST_KEY = "ax_material_manifest"
+MANIFEST_VERSION = 1
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
+
+
+def backend_key(backend):
+    """Everything about a backend that shapes the graphs it emits."""
+    return [
+        type(backend).__name__, backend.container_type, backend.surface_type, backend.output_type,
+        backend.displacement_type, backend.file_parm, repr(sorted(backend.images.items())),
+        repr(backend.multiply), repr(backend.displacement), backend.prefix,
+    ]
+
+
+def settings_signature(settings):
+    """Signature of the build-wide settings a manifest is valid for."""
+    return _digest(settings)
+
+
+def graph_signature(description, displacement_scale):
+    """Signature of the graph built for one description: paths, channels and displacement amount."""
+    maps = [[channel, texture.suffix, texture.filename] for channel, texture in sorted(description.maps.items())]
+    return _digest([description.name, description.directory, description.directory_path, maps, displacement_scale])
+
+
+def file_stats(description):
+    """{channel: [mtime_ns, size]} of the description's texture files (None when missing)."""
+    stats = {}
+    for channel in description.maps:
+        try:
+            stat = os.stat(description.eval_path(channel))
+            stats[channel] = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            stats[channel] = None
+    return stats
+
+
+class BuildManifest:
+    """
+    {material name: entry} of the last build for one settings signature,
+    where an entry is {"graph", "files", "iteration", "nodes", "target",
+    "images"}: graph and file signatures, the HDA slot, the names of the
+    materials built in the parent network, the node the slot points at
+    (first material or collect node) and {channel: image node name}
+    inside the first material.
+    """
+
+    def __init__(self, settings, materials=None, total=None):
+        self.settings = settings
+        self.materials = materials or {}
+        self.total = total
+
+    @classmethod
+    def load(cls, node, settings, key=MANIFEST_KEY):
+        """The manifest stored on node, or an empty one if it is missing or was built with other settings."""
+        try:
+            data = json.loads(node.userData(key) or "{}")
+        except ValueError:
+            data = {}
+        if data.get("version") != MANIFEST_VERSION or data.get("settings") != settings:
+            return cls(settings)
+        return cls(settings, data.get("materials"), data.get("total"))
+
+    def current(self, name, graph, files):
+        """The entry of name if it was built from the same graph and unchanged files, else None."""
+        entry = self.materials.get(name)
+        if entry and entry["graph"] == graph and entry["files"] == files:
+            return entry
+        return None
+
+    def record(self, name, graph, files, iteration, nodes, target, images):
+        self.materials[name] = {
+            "graph": graph, "files": files, "iteration": iteration, "nodes": nodes, "target": target, "images": images,
+        }
+
+    def save(self, node, names, total, key=MANIFEST_KEY):
+        """Stores the entries of names (the texture sets just built) on node."""
+        materials = {name: self.materials[name] for name in names if name in self.materials}
+        data = {"version": MANIFEST_VERSION, "settings": self.settings, "total": total, "materials": materials}
+        node.setUserData(key, json.dumps(data, separators=(",", ":")))
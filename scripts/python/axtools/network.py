@@ -0,0 +1,18 @@
+"""
+Node network helpers shared by the axtools subpackages.
+"""
+from contextlib import contextmanager
+
+import hou
+
+
+@contextmanager
+def batched_network_edit(label):
+    """One undo step for a batch of node edits, with cooking held until the batch is done."""
+    mode = hou.updateModeSetting()
+    with hou.undos.group(label):
+        hou.setUpdateMode(hou.updateMode.Manual)
+        try:
+            yield
+        finally:
+            hou.setUpdateMode(mode)
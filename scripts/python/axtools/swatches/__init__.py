@@ -0,0 +1,47 @@
+"""
+Swatch library tools shared by the Swatches Python panel, swatchesShelfTool
+and the ax.shelf swatch tools.
+
+    from axtools import swatches
+    swatches.launch_viewer()          # floating viewer (shelf tools)
+    swatches.SwatchViewer()           # panel widget (onCreateInterface)
+    swatches.SwatchNodeCreator()      # node creation without any UI
+
+Modules are imported on first use: the Qt binding, hou and NumPy load only
+when a name that needs them is accessed. Everything runs in one Python
+session, so every entry point shares the parsed-library cache (ase_codec),
+the swatch index (swatch_index) and the one floating viewer.
+
+    qt      PySide6 / PySide2 binding shim
+    model   Swatch, SwatchModel, SwatchDelegate
+    view    SwatchListView (virtualized grid)
+    nodes   SwatchNodeCreator and batched node creation helpers
+    atlas   palette texture (strip + index sidecar) export
+    viewer  SwatchViewer, launch_viewer
+"""
+import importlib
+
+_EXPORTS = {
+    "Swatch": "model",
+    "SwatchModel": "model",
+    "SwatchDelegate": "model",
+    "SwatchListView": "view",
+    "SwatchNodeCreator": "nodes",
+    "sanitize_name": "nodes",
+    "batched_network_edit": "nodes",
+    "SwatchViewer": "viewer",
+    "launch_viewer": "viewer",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
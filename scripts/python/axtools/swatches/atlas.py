@@ -0,0 +1,84 @@
+import os
+import json
+
+import numpy as np
+from PIL import Image
+
+import image_loader
+
+# -----------------------------------------------------------------------------
+# Palette textures: a swatch set written as one horizontal strip, so a single
+# image node plus an index (or uv) lookup can stand in for hundreds of
+# constant color nodes.
+#
+# Swatch i fills the CELL_SIZE x CELL_SIZE block starting at x = i * CELL_SIZE
+# and is sampled at u = (i + 0.5) / count, v = 0.5. Cells are a few pixels
+# wide so filtered and MIP-mapped lookups at the cell center keep the exact
+# color. A JSON sidecar (<texture>.json) maps indices back to swatch names.
+# -----------------------------------------------------------------------------
+
+CELL_SIZE = 4
+PALETTE_EXTENSIONS = (".png", ".exr")
+SIDECAR_SUFFIX = ".json"
+
+
+def palette_u(index, count):
+    """Texture u coordinate at the center of swatch index's cell."""
+    return (index + 0.5) / count
+
+
+def palette_pixels(swatches, cell_size=CELL_SIZE):
+    """(cell_size, count * cell_size, 3) float sRGB strip of the swatch colors."""
+    colors = np.clip(np.array([swatch.rgb for swatch in swatches], dtype=np.float32).reshape(-1, 3), 0.0, 1.0)
+    return np.repeat(np.repeat(colors[None, :, :], cell_size, axis=1), cell_size, axis=0)
+
+
+def _write_exr(path, pixels):
+    oiio = image_loader.oiio
+    if oiio is None:
+        raise IOError("Writing .exr palettes needs the OpenImageIO Python module; use .png instead.")
+    height, width, channels = pixels.shape
+    spec = oiio.ImageSpec(width, height, channels, oiio.HALF)
+    spec.attribute("oiio:ColorSpace", "Linear")
+    out = oiio.ImageOutput.create(path)
+    if not out or not out.open(path, spec):
+        raise IOError(f"Cannot write {path}: {oiio.geterror()}")
+    try:
+        out.write_image(np.ascontiguousarray(pixels, dtype=np.float32))
+    finally:
+        out.close()
+
+
+def write_palette_texture(path, swatches, cell_size=CELL_SIZE):
+    """
+    Writes the swatches as a palette strip (.png: 8-bit sRGB, .exr: half
+    float scene-linear) plus the <path>.json index sidecar.
+    Returns the sidecar dict.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in PALETTE_EXTENSIONS:
+        raise ValueError(f"Palette textures must be one of {', '.join(PALETTE_EXTENSIONS)}: {path}")
+    if not swatches:
+        raise ValueError("No swatches to write.")
+
+    pixels = palette_pixels(swatches, cell_size)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if extension == ".exr":
+        _write_exr(path, image_loader.srgb_to_linear(pixels))
+    else:
+        Image.fromarray(np.round(pixels * 255.0).astype(np.uint8), "RGB").save(path)
+
+    count = len(swatches)
+    index = {
+        "texture": os.path.basename(path),
+        "count": count,
+        "cell_size": cell_size,
+        "colorspace": "linear" if extension == ".exr" else "srgb",
+        "swatches": [
+            {"index": i, "name": swatch.name, "rgb": list(swatch.rgb), "u": palette_u(i, count)}
+            for i, swatch in enumerate(swatches)
+        ],
+    }
+    with open(path + SIDECAR_SUFFIX, "w") as f:
+        json.dump(index, f, indent=2)
+    return index
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+from .qt import QtWidgets, QtCore, QtGui, Qt
+
+# A swatch as the model and node creators see it: name, 0-1 RGB tuple, and
+# the ASE group and source color model when known
+Swatch = namedtuple("Swatch", ["name", "rgb", "group", "model"], defaults=(None, "RGB"))
+
+SWATCH_SIZE = 100
+SELECTED_BORDER = "#33AADD"
+
+class SwatchModel(QtCore.QAbstractListModel):
+    """List model over the parsed swatches; the view only asks for visible rows."""
+    RgbRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._swatches = []
+
+    def set_swatches(self, swatches):
+        self.beginResetModel()
+        self._swatches = [Swatch(name, tuple(rgb), *rest) for name, rgb, *rest in swatches]
+        self.endResetModel()
+
+    def swatch(self, row):
+        return self._swatches[row]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._swatches)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        swatch = self._swatches[index.row()]
+        if role == Qt.DisplayRole:
+            return swatch.name
+        if role == Qt.ToolTipRole:
+            tooltip = f"{swatch.name}\nRGB: {swatch.rgb}"
+            if swatch.model != "RGB":
+                tooltip += f"\nConverted from {swatch.model}"
+            if swatch.group:
+                tooltip += f"\nGroup: {swatch.group}"
+            return tooltip
+        if role == self.RgbRole:
+            return swatch.rgb
+        return None
+
+class SwatchDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a swatch cell (color square, selection border, elided name) without any widgets."""
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(SWATCH_SIZE, SWATCH_SIZE + 4 + option.fontMetrics.height())
+
+    def paint(self, painter, option, index):
+        rect = option.rect
+        square = QtCore.QRect(rect.x() + (rect.width() - SWATCH_SIZE) // 2, rect.y(), SWATCH_SIZE, SWATCH_SIZE)
+        r, g, b = [max(0, min(255, int(c * 255))) for c in index.data(SwatchModel.RgbRole)]
+
+        painter.save()
+        painter.fillRect(square, QtGui.QColor(r, g, b))
+        if option.state & QtWidgets.QStyle.StateFlag.State_Selected:
+            pen = QtGui.QPen(QtGui.QColor(SELECTED_BORDER), 3)
+            inset = 1
+        else:
+            pen = QtGui.QPen(QtGui.QColor(0, 0, 0), 1)
+            inset = 0
+        pen.setJoinStyle(Qt.MiterJoin)
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(square.adjusted(inset, inset, -1 - inset, -1 - inset))
+
+        text_rect = QtCore.QRect(rect.x(), square.bottom() + 4, rect.width(), option.fontMetrics.height())
+        name = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, SWATCH_SIZE)
+        painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Text))
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop, name)
+        painter.restore()
@@ -0,0 +1,358 @@
+import json
+import re
+
+import hou
+
+from . import atlas
+from ..network import batched_network_edit
+
+def sanitize_name(name):
+    """Sanitize swatch names for Houdini node names"""
+    sanitized = re.sub(r'[^\w\s-]', '', name)
+    sanitized = re.sub(r'\s+', '_', sanitized)
+    sanitized = sanitized.strip('_')
+    if sanitized and not (sanitized[0].isalpha() or sanitized[0] == '_'):
+        sanitized = 'swatch_' + sanitized
+    if not sanitized:
+        sanitized = 'unnamed_swatch'
+    return sanitized
+
+def unique_node_names(parent, names):
+    """
+    Unique child names for a batch of new nodes, checked against one
+    snapshot of parent's children instead of a lookup per setName call.
+    """
+    taken = {child.name() for child in parent.children()}
+    unique = []
+    for name in names:
+        candidate, i = name, 1
+        while candidate in taken:
+            candidate = f"{name}{i}"
+            i += 1
+        taken.add(candidate)
+        unique.append(candidate)
+    return unique
+
+# Swatches per row on the board built by create_swatches_in_geo
+SWATCH_BOARD_COLUMNS = 10
+
+def swatch_board_vex(swatches, columns=SWATCH_BOARD_COLUMNS):
+    """
+    Detail wrangle code that builds one unit quad per swatch, laid out in
+    rows, with Cd, name and swatch_index primitive attributes. Point uvs
+    sit at the swatch's cell center in a palette texture exported from
+    the same swatches, so one image node can shade the whole board.
+    """
+    colors = ", ".join("{%.6g, %.6g, %.6g}" % tuple(swatch.rgb) for swatch in swatches)
+    names = ", ".join(json.dumps(swatch.name, ensure_ascii=False) for swatch in swatches)
+    return f"""vector colors[] = {{{colors}}};
+string names[] = {{{names}}};
+vector corners[] = {{{{0, 0, 0}}, {{1, 0, 0}}, {{1, 1, 0}}, {{0, 1, 0}}}};
+for (int i = 0; i < len(colors); i++) {{
+    vector origin = set((i % {columns}) * 1.1, -(i / {columns}) * 1.1, 0);
+    int prim = addprim(0, "poly");
+    vector uv = set((i + 0.5) / len(colors), 0.5, 0);
+    foreach (vector corner; corners) {{
+        int pt = addpoint(0, origin + corner);
+        setpointattrib(0, "uv", pt, uv);
+        addvertex(0, prim, pt);
+    }}
+    setprimattrib(0, "Cd", prim, colors[i]);
+    setprimattrib(0, "name", prim, names[i]);
+    setprimattrib(0, "swatch_index", prim, i);
+}}
+"""
+
+def color_ramp_parms(node):
+    """The color ramp parameters of a node."""
+    return [
+        parm for parm in node.parms()
+        if parm.parmTemplate().type() == hou.parmTemplateType.Ramp
+        and parm.parmTemplate().parmType() == hou.rampParmType.Color
+    ]
+
+class SwatchNodeCreator:
+    """Creates Houdini nodes from swatches in the current network context."""
+
+    KARMA_CONTEXTS = ('materialbuilder', 'materiallibrary', 'karmamaterialbuilder', 'subnet')
+    OCTANE_CONTEXTS = ('octane_vopnet', 'octane_solaris_material_builder')
+    REDSHIFT_CONTEXTS = ('redshift_vopnet', 'rs_usd_material_builder')
+    MATNET_CONTEXTS = ('matnet',)
+
+    def create_in_network(self, swatch):
+        """Double-click: creates one swatch node at the center of the Network Editor."""
+        pane = hou.ui.paneTabOfType(hou.paneTabType.NetworkEditor)
+        if not pane:
+            hou.ui.displayMessage("No active Network Editor found.")
+            return
+
+        context = pane.pwd()
+        pos = pane.visibleBounds().center()
+        created_nodes = []
+
+        try:
+            with batched_network_edit(f"Create Swatch {swatch.name}"):
+                context_type = context.type().name()
+                swatch_to_create = [swatch]
+
+                if context.childTypeCategory().name() == 'Sop':
+                    created_nodes = self._create_sop_nodes(context, swatch_to_create, pos)
+                elif context_type in self.KARMA_CONTEXTS:
+                    created_nodes = self._create_karma_nodes(context, swatch_to_create, pos)
+                elif context_type in self.OCTANE_CONTEXTS:
+                    created_nodes = self._create_octane_nodes(context, swatch_to_create, pos)
+                elif context_type in self.REDSHIFT_CONTEXTS:
+                    created_nodes = self._create_redshift_nodes(context, swatch_to_create, pos)
+                elif context_type in self.MATNET_CONTEXTS:
+                    created_nodes = self._create_matnet_nodes(context, swatch_to_create, pos)
+                elif context.childTypeCategory().name() == 'Object':
+                    created_nodes = self._create_object_nodes(context, swatch_to_create)
+                else:
+                    hou.ui.displayMessage(f"Unsupported network context for swatch creation: {context_type}")
+
+                if created_nodes:
+                    created_nodes[-1].setSelected(True, clear_all_selected=True)
+
+        except Exception as e:
+            hou.ui.displayMessage(f"Error creating node: {e}")
+
+    def drop_on_network(self, swatches_to_create):
+        """Drag and drop: creates nodes (or a gradient) where the cursor is released."""
+        pane = hou.ui.paneTabUnderCursor()
+        if not isinstance(pane, hou.NetworkEditor): return
+        if not swatches_to_create: return
+
+        context, pos = pane.pwd(), pane.cursorPosition()
+        created_nodes = []
+        try:
+            with batched_network_edit(f"Create {len(swatches_to_create)} Swatches"):
+                context_type = context.type().name()
+            
+                if context.childTypeCategory().name() == 'Sop':
+                    created_nodes = self._handle_sop_creation(context, swatches_to_create, pos, self._create_sop_nodes, self._create_sop_gradient)
+                elif context_type in self.KARMA_CONTEXTS:
+                    created_nodes = self._handle_material_creation(context, swatches_to_create, pos, self._create_karma_nodes, self._create_karma_gradient)
+                elif context_type in self.OCTANE_CONTEXTS:
+                    created_nodes = self._handle_material_creation(context, swatches_to_create, pos, self._create_octane_nodes, self._create_octane_gradient)
+                elif context_type in self.REDSHIFT_CONTEXTS:
+                    created_nodes = self._handle_material_creation(context, swatches_to_create, pos, self._create_redshift_nodes, self._create_redshift_gradient)
+                elif context_type in self.MATNET_CONTEXTS:
+                    created_nodes = self._handle_matnet_creation(context, swatches_to_create, pos, self._create_matnet_nodes, self._create_matnet_gradient)
+                elif context.childTypeCategory().name() == 'Object':
+                    created_nodes = self._create_object_nodes(context, swatches_to_create)
+                else:
+                    hou.ui.displayMessage(f"Unsupported network context for drag & drop: {context_type}")
+
+                if created_nodes:
+                    created_nodes[-1].setSelected(True, clear_all_selected=True)
+                    if context.childTypeCategory().name() == 'Sop':
+                        pane.setCurrentNode(created_nodes[-1])
+        except Exception as e:
+            hou.ui.displayMessage(f"Error creating node(s): {e}")
+
+    @staticmethod
+    def sort_colors_by_hue(swatches):
+        def rgb_to_hsv(rgb):
+            r, g, b = rgb; mx, mn = max(rgb), min(rgb); diff = mx - mn
+            h = 0
+            if diff != 0:
+                if mx == r: h = (60 * ((g - b) / diff) + 360) % 360
+                elif mx == g: h = (60 * ((b - r) / diff) + 120) % 360
+                elif mx == b: h = (60 * ((r - g) / diff) + 240) % 360
+            return (h, mx)
+        return sorted(swatches, key=lambda s: rgb_to_hsv(s.rgb))
+
+    def _handle_sop_creation(self, context, selected, pos, node_creation_func, gradient_creation_func):
+        if len(selected) > 1:
+            choice = hou.ui.displayMessage("Create individual nodes or a gradient?", buttons=["Nodes", "Gradient", "Cancel"], default_choice=0, close_choice=2)
+            if choice == 0: return node_creation_func(context, selected, pos)
+            elif choice == 1:
+                sort_choice = hou.ui.displayMessage("Sort swatches by hue?", buttons=["Yes", "No", "Cancel"], default_choice=0, close_choice=2)
+                if sort_choice == 2: return []
+                swatches_to_use = self.sort_colors_by_hue(selected) if sort_choice == 0 else selected
+                return gradient_creation_func(context, swatches_to_use, pos)
+            else: return []
+        else:
+            return node_creation_func(context, selected, pos)
+
+    def _handle_material_creation(self, context, selected, pos, node_creation_func, gradient_creation_func):
+        return self._handle_sop_creation(context, selected, pos, node_creation_func, gradient_creation_func)
+
+    def _handle_matnet_creation(self, context, selected, pos, node_creation_func, gradient_creation_func):
+        return self._handle_sop_creation(context, selected, pos, node_creation_func, gradient_creation_func)
+
+    def _create_nodes(self, context, selected, pos, node_type, parm_tuple, setup_parms=None):
+        """
+        One node per swatch with its color set as a whole parm tuple. Names
+        are made unique up front and nodes are placed on a diagonal, so
+        nothing is looked up or laid out per node. Callers wrap this in
+        batched_network_edit.
+        """
+        created = []
+        spacing = hou.Vector2(1.5, -1.5)
+        names = unique_node_names(context, [sanitize_name(swatch.name) for swatch in selected])
+        for i, (swatch, name) in enumerate(zip(selected, names)):
+            node = context.createNode(node_type, name)
+            if setup_parms:
+                node.setParms(setup_parms)
+            node.parmTuple(parm_tuple).set(swatch.rgb)
+            node.setPosition(pos + spacing * i)
+            created.append(node)
+        return created
+
+    def _create_sop_nodes(self, context, selected, pos):
+        nodes = self._create_nodes(context, selected, pos, "color", "color")
+        for a, b in zip(nodes[:-1], nodes[1:]):
+            b.setNextInput(a)
+        return nodes
+
+    def _create_karma_nodes(self, context, selected, pos):
+        return self._create_nodes(context, selected, pos, "mtlxconstant", "value_color3", {"signature": "color3"})
+
+    def _create_octane_nodes(self, context, selected, pos):
+        return self._create_nodes(context, selected, pos, "NT_TEX_RGB", "A_VALUE")
+
+    def _create_redshift_nodes(self, context, selected, pos):
+        return self._create_nodes(context, selected, pos, "redshift::RSColorConstant", "color")
+
+    def _create_matnet_nodes(self, context, selected, pos):
+        # "color" is the consttype string value for a color constant
+        return self._create_nodes(context, selected, pos, "constant", "colordef", {"consttype": "color"})
+
+    def _create_object_nodes(self, context, selected):
+        created = []
+        spacing = hou.Vector2(0.0, -1.5)
+        names = unique_node_names(context, [sanitize_name(swatch.name) for swatch in selected])
+        for i, (swatch, name) in enumerate(zip(selected, names)):
+            geo = context.createNode("geo", name)
+            if created:
+                geo.setPosition(created[0].position() + spacing * i)
+            else:
+                geo.moveToGoodPosition()
+            if file_node := geo.node("file1"): file_node.destroy()
+            color = geo.createNode("color", sanitize_name(swatch.name))
+            color.parmTuple("color").set(swatch.rgb)
+            color.setDisplayFlag(True); color.setRenderFlag(True)
+            created.append(geo)
+        return created
+
+    def _create_gradient(self, context, selected, pos, node_type, parm_name):
+        node = context.createNode(node_type)
+        node.setName("swatch_gradient", unique_name=True)
+        node.setPosition(pos)
+        
+        num = len(selected)
+        positions = [i / max(1, num - 1) for i in range(num)]
+        colors = [s.rgb for s in selected]
+        ramp = hou.Ramp([hou.rampBasis.Linear] * num, positions, colors)
+        node.parm(parm_name).set(ramp)
+        return [node]
+
+    def _create_sop_gradient(self, context, selected, pos):
+        node = self._create_gradient(context, selected, pos, "color", "ramp")
+        node[0].parm("colortype").set(3)
+        return node
+
+    def _create_karma_gradient(self, context, selected, pos):
+        return self._create_gradient(context, selected, pos, "kma_rampconst", "vramp")
+    
+    def _create_octane_gradient(self, context, selected, pos):
+        return self._create_gradient(context, selected, pos, "NT_TEX_GRADIENT", "octane_gradient")
+
+    def _create_redshift_gradient(self, context, selected, pos):
+        return self._create_gradient(context, selected, pos, "redshift::RSRamp", "ramp")
+    
+    # --- THIS METHOD CONTAINS YOUR NEW CODE ---
+    def _create_matnet_gradient(self, context, selected, pos):
+        return self._create_gradient(context, selected, pos, "rampparm", "rampcolordefault")
+
+    def create_gradient_from_swatches(self, selected):
+        if not selected: return
+
+        choice = hou.ui.displayMessage("Sort swatches by hue?", buttons=["Yes", "No", "Cancel"], default_choice=0, close_choice=2)
+        if choice == 2: return
+        if choice == 0:
+            selected = self.sort_colors_by_hue(selected)
+
+        pane = next((p for p in hou.ui.paneTabs() if isinstance(p, hou.NetworkEditor)), None)
+        if not pane: return
+
+        context = pane.pwd()
+        if context.childTypeCategory().name() != 'Sop':
+            hou.ui.displayMessage("Can only create a gradient in a SOP context.")
+            return
+
+        try:
+            pos = pane.cursorPosition()
+            with batched_network_edit("Create Swatch Gradient"):
+                nodes = self._create_sop_gradient(context, selected, pos)
+            if nodes:
+                nodes[0].setSelected(True, clear_all_selected=True)
+                pane.setCurrentNode(nodes[0])
+        except Exception as e:
+            hou.ui.displayMessage(f"Error creating gradient: {e}")
+            
+    # Image node type, file parm and setup parms per material context, for palette textures
+    PALETTE_IMAGE_NODES = (
+        (KARMA_CONTEXTS, "mtlximage", "file", {"signature": "color3"}),
+        (OCTANE_CONTEXTS, "NT_TEX_IMAGE", "A_FILENAME", {}),
+        (REDSHIFT_CONTEXTS, "redshift::TextureSampler", "tex0", {}),
+        (MATNET_CONTEXTS, "texture", "map", {}),
+    )
+
+    def export_palette_texture(self, selected, path):
+        """
+        Writes the swatches as a palette strip (see atlas) and, when the
+        Network Editor is inside a supported material network, creates one
+        image node reading it. Swatch i is at u = (i + 0.5) / count, v = 0.5;
+        the node comment and the .json sidecar spell out the mapping.
+        """
+        if not selected: return
+        try:
+            atlas.write_palette_texture(path, selected)
+        except (IOError, ValueError) as e:
+            hou.ui.displayMessage(f"Error exporting palette texture: {e}")
+            return
+
+        pane = hou.ui.paneTabOfType(hou.paneTabType.NetworkEditor)
+        context = pane.pwd() if pane else None
+        context_type = context.type().name() if context else None
+        image_node = next((entry[1:] for entry in self.PALETTE_IMAGE_NODES if context_type in entry[0]), None)
+        if image_node is None:
+            hou.ui.displayMessage(
+                f"Exported {len(selected)} swatches to {path}\n(index: {path}{atlas.SIDECAR_SUFFIX})"
+            )
+            return
+
+        node_type, file_parm, setup_parms = image_node
+        try:
+            with batched_network_edit("Create Palette Texture"):
+                node = context.createNode(node_type, unique_node_names(context, ["swatch_palette"])[0])
+                if setup_parms:
+                    node.setParms(setup_parms)
+                node.parm(file_parm).set(path)
+                node.setPosition(pane.visibleBounds().center())
+                node.setComment(f"{len(selected)} swatches: swatch i at u = (i + 0.5) / {len(selected)}, v = 0.5")
+                node.setGenericFlag(hou.nodeFlag.DisplayComment, True)
+                node.setSelected(True, clear_all_selected=True)
+        except Exception as e:
+            hou.ui.displayMessage(f"Exported {path}, but creating the image node failed: {e}")
+
+    def create_swatches_in_geo(self, selected):
+        if not selected: return
+        
+        try:
+            # One detail wrangle builds a quad per swatch (Cd + name), instead of a chain of color SOPs
+            with batched_network_edit("Create Swatches in Geo"):
+                obj_context = hou.node("/obj")
+                geo = obj_context.createNode("geo", "swatch_colors")
+                geo.moveToGoodPosition()
+                if file_node := geo.node("file1"): file_node.destroy()
+
+                board = geo.createNode("attribwrangle", "swatch_board")
+                board.parm("class").set(0)  # run over detail (only once)
+                board.parm("snippet").set(swatch_board_vex(selected))
+                board.setDisplayFlag(True); board.setRenderFlag(True)
+            hou.ui.displayMessage(f"Created {len(selected)} color swatches inside {geo.path()}.")
+        except Exception as e:
+            hou.ui.displayMessage(f"Error creating swatches in Geo node: {e}")
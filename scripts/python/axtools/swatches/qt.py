@@ -0,0 +1,15 @@
+"""
+Qt binding for the swatch tools: PySide6 in current Houdini builds, PySide2
+in older ones. Only APIs present in both are used by the package.
+"""
+try:
+    from PySide6 import QtWidgets, QtCore, QtGui
+except ImportError:
+    from PySide2 import QtWidgets, QtCore, QtGui
+
+Qt = QtCore.Qt
+
+
+def exec_menu(menu, pos):
+    """QMenu.exec under either binding (PySide2 only has exec_)."""
+    return (menu.exec if hasattr(menu, "exec") else menu.exec_)(pos)
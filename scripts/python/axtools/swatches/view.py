@@ -0,0 +1,131 @@
+from .qt import QtWidgets, QtCore, exec_menu
+from .model import SWATCH_SIZE, SwatchDelegate
+from . import atlas
+from .nodes import SwatchNodeCreator
+
+
+class SwatchListView(QtWidgets.QListView):
+    """
+    Icon-mode list of swatches. Qt lays out and paints only the visible
+    cells, and reflows on resize without creating widgets.
+
+    Selection follows the usual extended rules (click, Ctrl toggle, Shift
+    range, Ctrl+Shift add range). A plain click on an already selected swatch
+    keeps the selection until release so the whole set can be dragged.
+    Dragging with the left or middle button and releasing over a Network
+    Editor creates nodes there.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.creator = SwatchNodeCreator()
+        self.setViewMode(QtWidgets.QListView.ViewMode.IconMode)
+        self.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
+        self.setMovement(QtWidgets.QListView.Movement.Static)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setUniformItemSizes(True)
+        self.setSelectionRectVisible(True)
+        self.setItemDelegate(SwatchDelegate(self))
+        self.setGridSize(QtCore.QSize(SWATCH_SIZE + 10, SWATCH_SIZE + 24 + self.fontMetrics().height()))
+        self.setCursor(QtCore.Qt.OpenHandCursor)
+        self._press_index = None
+        self._press_button = None
+        self._has_moved = False
+        self._defer_select = False
+
+    def selected_swatches(self):
+        # Walk the selection's row ranges instead of expanding it into one QModelIndex per swatch
+        model = self.model()
+        rows = sorted({
+            row for selection_range in self.selectionModel().selection()
+            for row in range(selection_range.top(), selection_range.bottom() + 1)
+        })
+        return [model.swatch(row) for row in rows]
+
+    def _swatches_for(self, index):
+        """The selection, or just the swatch at index when nothing is selected."""
+        return self.selected_swatches() or [self.model().swatch(index.row())]
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.pos())
+        self._press_index = index if index.isValid() else None
+        self._press_button = event.button()
+        self._start_pos = event.pos()
+        self._has_moved = False
+        self._defer_select = False
+
+        if event.button() == QtCore.Qt.MiddleButton:
+            return  # middle-drag never changes the selection
+        if (
+            event.button() == QtCore.Qt.LeftButton and self._press_index is not None
+            and event.modifiers() == QtCore.Qt.NoModifier
+            and self.selectionModel().isSelected(index)
+        ):
+            self._defer_select = True
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._press_index is None:
+            super().mouseMoveEvent(event)  # rubber band selection from empty space
+            return
+        if (event.pos() - self._start_pos).manhattanLength() > 5:
+            self._has_moved = True
+            self.setCursor(QtCore.Qt.ClosedHandCursor)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)  # always let the view leave its press state
+        self.setCursor(QtCore.Qt.OpenHandCursor)
+        index = self._press_index
+        self._press_index = None
+
+        if index is None or not self._has_moved:
+            if index is not None and self._defer_select:
+                # Simple click on a selected swatch: reduce the selection to it
+                self.selectionModel().select(index, QtCore.QItemSelectionModel.SelectionFlag.ClearAndSelect)
+                self.selectionModel().setCurrentIndex(index, QtCore.QItemSelectionModel.SelectionFlag.NoUpdate)
+            return
+
+        if self._press_button == QtCore.Qt.MiddleButton and not self.selectionModel().isSelected(index):
+            swatches = [self.model().swatch(index.row())]
+        else:
+            swatches = self._swatches_for(index)
+        self.creator.drop_on_network(swatches)
+
+    def mouseDoubleClickEvent(self, event):
+        index = self.indexAt(event.pos())
+        if event.button() == QtCore.Qt.LeftButton and index.isValid():
+            self.creator.create_in_network(self.model().swatch(index.row()))
+
+    def export_palette_texture(self, swatches):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Palette Texture", "swatch_palette.png", "PNG (*.png);;OpenEXR (*.exr)"
+        )
+        if not path:
+            return
+        if not path.lower().endswith(atlas.PALETTE_EXTENSIONS):
+            path += ".png"
+        self.creator.export_palette_texture(swatches, path)
+
+    def contextMenuEvent(self, event):
+        index = self.indexAt(event.pos())
+        if not index.isValid():
+            return
+        selected = self._swatches_for(index)
+
+        menu = QtWidgets.QMenu(self)
+        menu.setStyleSheet("""
+            QMenu { background-color: #3C3C3C; color: #DDDDDD; border: 1px solid #2A2A2A; }
+            QMenu::item:selected { background-color: #555555; }
+        """)
+        
+        grad_action = menu.addAction("Create Gradient from Colors")
+        grad_action.triggered.connect(lambda: self.creator.create_gradient_from_swatches(selected))
+
+        swatch_action = menu.addAction("Create Swatches in Geo")
+        swatch_action.triggered.connect(lambda: self.creator.create_swatches_in_geo(selected))
+
+        palette_action = menu.addAction("Export Palette Texture...")
+        palette_action.triggered.connect(lambda: self.export_palette_texture(selected))
+        
+        exec_menu(menu, event.globalPos())
@@ -0,0 +1,366 @@
+import os
+import json
+
+import hou
+
+import ase_codec
+import swatch_index
+from .qt import QtWidgets, QtCore, QtGui, Qt
+from .model import Swatch, SwatchModel
+from .view import SwatchListView
+from .nodes import color_ramp_parms
+
+class ConfigManager:
+    """Manages loading and saving of the JSON configuration file."""
+    def __init__(self, config_file):
+        self.config_file = config_file
+
+    def load_config(self):
+        if not os.path.exists(self.config_file): return {}
+        try:
+            with open(self.config_file, 'r') as f:
+                return json.load(f)
+        except (IOError, json.JSONDecodeError):
+            return {}
+
+    def save_config(self, config):
+        try:
+            with open(self.config_file, 'w') as f:
+                json.dump(config, f, indent=4)
+        except IOError:
+            pass
+
+# Swatches listed by "Match Color..."
+MATCH_RESULTS = 24
+
+class IndexSignals(QtCore.QObject):
+    # (updated, removed) file counts
+    finished = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+
+class IndexScanJob(QtCore.QRunnable):
+    """Brings the swatch index up to date for a root folder off the Qt thread."""
+
+    def __init__(self, db_path, root, signals):
+        super().__init__()
+        self.db_path = db_path
+        self.root = root
+        self.signals = signals
+
+    def run(self):
+        try:
+            index = swatch_index.SwatchIndex(self.db_path)
+            try:
+                counts = index.scan(self.root)
+            finally:
+                index.close()
+            self.signals.finished.emit(counts)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+class SwatchViewer(QtWidgets.QWidget):
+    """The main widget for the ASE Swatch Viewer."""
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("ASE Swatch Viewer")
+        self.setMinimumSize(600, 500)
+
+        pref_dir = hou.expandString("$HOUDINI_USER_PREF_DIR")
+        config_path = os.path.join(pref_dir, "ase_swatch_viewer_config.json")
+        self.config_manager = ConfigManager(config_path)
+        config = self.config_manager.load_config()
+        self.default_path = config.get("default_path", os.path.expanduser("~"))
+
+        self.swatches = []
+
+        # Folders, names and colors come from the index; a background scan keeps it current
+        self.index_path = os.path.join(pref_dir, swatch_index.INDEX_FILE_NAME)
+        self.index = swatch_index.SwatchIndex(self.index_path)
+        self._library_matcher = None  # all indexed swatches, rebuilt after index changes
+        self._index_pool = QtCore.QThreadPool(self)
+        self._index_pool.setMaxThreadCount(1)
+        self._index_signals = IndexSignals(self)
+        self._index_signals.finished.connect(self.on_index_updated)
+        self._index_signals.failed.connect(lambda message: self.log(f"Swatch index error: {message}"))
+
+        self._init_ui()
+        self.populate_path_dropdown()
+        self.update_dropdown()
+        self.refresh_index()
+
+    def _init_ui(self):
+        self.tabs = QtWidgets.QTabWidget(self)
+        self.library_tab, self.pref_tab = QtWidgets.QWidget(), QtWidgets.QWidget()
+        self.tabs.addTab(self.library_tab, "Library")
+        self.tabs.addTab(self.pref_tab, "Preference")
+
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addWidget(self.tabs)
+        self.setLayout(main_layout)
+
+        lib_layout = QtWidgets.QVBoxLayout(self.library_tab)
+        path_layout = QtWidgets.QHBoxLayout()
+
+        self.path_dropdown = QtWidgets.QComboBox()
+        self.path_dropdown.currentIndexChanged.connect(self.update_dropdown)
+        self.path_dropdown.setEditable(True)
+        self.path_dropdown.lineEdit().editingFinished.connect(self.on_path_edit_finished)
+        self.path_dropdown.setStyleSheet("QComboBox { padding-right: 7px; }")
+
+        self.file_dropdown = QtWidgets.QComboBox()
+        self.file_dropdown.currentIndexChanged.connect(self.load_selected_ase)
+        self.file_dropdown.setMaximumWidth(250)
+
+        self.open_button = QtWidgets.QPushButton("Open...")
+        self.open_button.setToolTip("Load any .ase file")
+        self.open_button.clicked.connect(self.open_ase_file)
+
+        path_layout.addWidget(self.path_dropdown)
+        path_layout.addWidget(self.file_dropdown)
+        path_layout.addWidget(self.open_button)
+        lib_layout.addLayout(path_layout)
+
+        search_layout = QtWidgets.QHBoxLayout()
+        self.search_edit = QtWidgets.QLineEdit()
+        self.search_edit.setPlaceholderText("Search swatch names in all libraries")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.search_swatches)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+
+        self.rescan_button = QtWidgets.QPushButton("Rescan")
+        self.rescan_button.setToolTip("Update the swatch index from the .ase files under the default path")
+        self.rescan_button.clicked.connect(self.refresh_index)
+
+        self.match_button = QtWidgets.QPushButton("Match Color...")
+        self.match_button.setToolTip("List the closest swatches (CIEDE2000) across all indexed libraries")
+        self.match_button.clicked.connect(self.match_color)
+
+        self.snap_button = QtWidgets.QPushButton("Snap Ramps")
+        self.snap_button.setToolTip(
+            "Snap every key of the selected nodes' color ramps to the nearest selected swatch\n"
+            "(or the nearest shown swatch when none are selected)"
+        )
+        self.snap_button.clicked.connect(self.snap_selected_ramps)
+
+        search_layout.addWidget(self.search_edit)
+        search_layout.addWidget(self.match_button)
+        search_layout.addWidget(self.snap_button)
+        search_layout.addWidget(self.rescan_button)
+        lib_layout.addLayout(search_layout)
+
+        self.swatch_model = SwatchModel(self)
+        self.swatch_view = SwatchListView()
+        self.swatch_view.setModel(self.swatch_model)
+        lib_layout.addWidget(self.swatch_view)
+
+        self.console = QtWidgets.QPlainTextEdit()
+        self.console.setReadOnly(True)
+        self.console.setMaximumHeight(100)
+        self.console.setStyleSheet("background-color: #111; color: #eee; font-family: Consolas;")
+        lib_layout.addWidget(self.console)
+
+        pref_layout = QtWidgets.QVBoxLayout(self.pref_tab)
+        self.pref_edit = QtWidgets.QLineEdit(self.default_path)
+        self.pref_edit.setPlaceholderText("Default ASE directory path")
+        self.pref_edit.editingFinished.connect(self.save_preference)
+        pref_layout.addWidget(QtWidgets.QLabel("Default ASE Path:"))
+        pref_layout.addWidget(self.pref_edit)
+        pref_layout.addStretch()
+
+    def save_preference(self):
+        path = self.pref_edit.text().strip()
+        if os.path.isdir(path):
+            self.default_path = path
+            self.config_manager.save_config({"default_path": path})
+            self.log(f"Default path saved: {path}")
+            self.populate_path_dropdown()
+            self.refresh_index()
+        else:
+            self.log(f"Invalid path: {path}")
+
+    def log(self, message):
+        self.console.appendPlainText(str(message))
+
+    def clear_grid(self):
+        self.swatch_model.set_swatches([])
+
+    def on_path_edit_finished(self):
+        new_path = self.path_dropdown.currentText().strip()
+        if os.path.isdir(new_path):
+            if new_path not in [self.path_dropdown.itemText(i) for i in range(self.path_dropdown.count())]:
+                self.path_dropdown.addItem(new_path)
+            self.path_dropdown.setCurrentText(new_path)
+        else:
+            self.log(f"Invalid folder: {new_path}")
+
+    def update_dropdown(self):
+        path = self.path_dropdown.currentText().strip()
+        self.file_dropdown.clear()
+        if not os.path.isdir(path):
+            self.log(f"Invalid folder: {path}")
+            return
+        try:
+            ase_files = [f for f in os.listdir(path) if f.lower().endswith(".ase")]
+            if not ase_files:
+                self.log("No .ase files found.")
+                return
+            self.file_dropdown.addItems(sorted(ase_files))
+        except OSError as e:
+            self.log(f"Error reading directory: {e}")
+
+    def open_ase_file(self):
+        """Browses for an .ase file and shows it through the folder and file dropdowns."""
+        filepath, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Select ASE File", self.path_dropdown.currentText().strip(), "*.ase"
+        )
+        if not filepath:
+            return
+        folder, filename = os.path.split(os.path.normpath(filepath))
+        folder_index = self.path_dropdown.findText(folder)
+        if folder_index < 0:
+            self.path_dropdown.addItem(folder)
+            folder_index = self.path_dropdown.count() - 1
+        if folder_index == self.path_dropdown.currentIndex():
+            self.update_dropdown()
+        else:
+            self.path_dropdown.setCurrentIndex(folder_index)
+        self.file_dropdown.setCurrentIndex(self.file_dropdown.findText(filename))
+
+    def load_selected_ase(self):
+        folder = self.path_dropdown.currentText().strip()
+        filename = self.file_dropdown.currentText()
+        if not filename: return
+
+        filepath = os.path.join(folder, filename)
+        if os.path.exists(filepath):
+            self.log(f"Loading ASE file: {filepath}")
+            self.swatches = self.parse_ase(filepath)
+            self.populate_grid()
+            self.log(f"Loaded {len(self.swatches)} swatches.")
+
+    def populate_path_dropdown(self):
+        """Populates dropdown with the indexed subdirectories containing .ase files."""
+        current = self.path_dropdown.currentText().strip()
+        self.path_dropdown.clear()
+        if not os.path.isdir(self.default_path):
+            self.log(f"Invalid default path: {self.default_path}")
+            self.path_dropdown.addItem(self.default_path)
+            return
+        paths = self.index.folders(self.default_path)
+        if paths:
+            self.path_dropdown.addItems(paths)
+            if current in paths:
+                self.path_dropdown.setCurrentText(current)
+        else:
+            self.path_dropdown.addItem(self.default_path)
+
+    def refresh_index(self):
+        """Rescans the default path in the background; the dropdown updates if folders changed."""
+        if os.path.isdir(self.default_path):
+            self._index_pool.start(IndexScanJob(self.index_path, self.default_path, self._index_signals))
+
+    def on_index_updated(self, counts):
+        updated, removed = counts
+        if updated or removed:
+            self._library_matcher = None
+            self.log(f"Swatch index: {updated} updated, {removed} removed .ase files")
+        folders = self.index.folders(self.default_path)
+        if not folders:
+            self.log(f"No folders with .ase files found under {self.default_path}")
+        if (folders or [self.default_path]) != [self.path_dropdown.itemText(i) for i in range(self.path_dropdown.count())]:
+            self.populate_path_dropdown()
+        if self.search_edit.text().strip():
+            self.search_swatches()
+
+    def search_swatches(self):
+        """Shows the swatches matching the search text across every indexed library."""
+        text = self.search_edit.text().strip()
+        if not text:
+            self.load_selected_ase()
+            return
+        results = self.index.search(text)
+        self.swatches = [(swatch.name, swatch.rgb, swatch.group) for swatch in results]
+        self.populate_grid()
+        self.log(f"Found {len(results)} swatches matching '{text}'.")
+
+    def populate_grid(self):
+        self.swatch_model.set_swatches(self.swatches)
+
+    def parse_ase(self, path):
+        try:
+            colors = ase_codec.read_ase(path)
+        except IOError as e:
+            self.log(f"Error reading file: {e}"); return []
+        except ase_codec.AseError as e:
+            self.log(str(e)); colors = e.colors
+        return [Swatch(color.name, color.rgb, color.group, color.model) for color in colors]
+
+    def library_matcher(self):
+        if self._library_matcher is None:
+            self._library_matcher = swatch_index.SwatchMatcher(self.index.all_swatches(self.default_path))
+        return self._library_matcher
+
+    def match_color(self):
+        """Picks a color and shows the closest swatches from every library under the default path."""
+        selected = self.swatch_view.selected_swatches()
+        initial = QtGui.QColor.fromRgbF(*selected[0].rgb) if selected else QtGui.QColor(128, 128, 128)
+        color = QtWidgets.QColorDialog.getColor(initial, self, "Match Color")
+        if not color.isValid():
+            return
+        matcher = self.library_matcher()
+        if not len(matcher):
+            self.log("The swatch index is empty; rescan the default path first.")
+            return
+        matches = matcher.nearest([color.getRgbF()[:3]], MATCH_RESULTS)[0]
+        self.swatches = [(swatch.name, swatch.rgb, swatch.group) for _, swatch in matches]
+        self.populate_grid()
+        distance, best = matches[0]
+        self.log(f"Closest to {color.name()}: '{best.name}' (dE2000 {distance:.2f}) in {best.path}")
+
+    def snap_selected_ramps(self):
+        """
+        Replaces every key color of the selected nodes' color ramps with its
+        nearest swatch (CIEDE2000), all in one undo step. Candidates are the
+        selected swatches, or everything shown in the grid.
+        """
+        palette = self.swatch_view.selected_swatches() or [Swatch(name, tuple(rgb), *rest) for name, rgb, *rest in self.swatches]
+        if not palette:
+            self.log("Load a library or select swatches to snap to.")
+            return
+        parms = [parm for node in hou.selectedNodes() for parm in color_ramp_parms(node)]
+        if not parms:
+            self.log("Select nodes with color ramp parameters to snap.")
+            return
+
+        matcher = swatch_index.SwatchMatcher(palette)
+        with hou.undos.group("Snap Ramps to Swatches"):
+            for parm in parms:
+                ramp = parm.evalAsRamp()
+                snapped = matcher.snap(ramp.values())
+                parm.set(hou.Ramp(ramp.basis(), ramp.keys(), [swatch.rgb for _, swatch in snapped]))
+                worst = max(distance for distance, _ in snapped) if snapped else 0.0
+                names = ", ".join(swatch.name for _, swatch in snapped)
+                self.log(f"Snapped {parm.path()} to {names} (max dE2000 {worst:.2f})")
+
+
+_floating_viewer = None
+
+def launch_viewer():
+    """
+    Shows the floating viewer used by the shelf tools. The window is kept
+    when closed, so later clicks only show it again.
+    """
+    global _floating_viewer
+    try:
+        _floating_viewer.isVisible()
+    except (AttributeError, RuntimeError):  # not created yet, or its Qt object was deleted
+        _floating_viewer = SwatchViewer()
+        _floating_viewer.setParent(hou.qt.mainWindow(), Qt.Window)
+    _floating_viewer.show()
+    _floating_viewer.raise_()
+    _floating_viewer.activateWindow()
+    return _floating_viewer
@@ -0,0 +1,138 @@
+import os
+import json
+from concurrent.futures import as_completed
+
+import image_loader
+import color_palette
+import ase_codec
+import worker_pool
+
+# -----------------------------------------------------------------------------
+# Batch palette extraction: one .ase swatch library per image in a folder,
+# readable by axtools.swatches.SwatchViewer, plus a JSON manifest that lets
+# re-runs skip images whose file and settings haven't changed.
+#
+# Workers only import the sampling core (no hou / Qt), so they can run in a
+# plain Python interpreter next to Houdini (see worker_pool).
+# -----------------------------------------------------------------------------
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".tx", ".exr", ".hdr")
+MANIFEST_NAME = "palettes.json"
+MANIFEST_VERSION = 1
+
+
+def find_images(folder, recursive=False):
+    """Image files under folder as paths relative to it, sorted."""
+    found = []
+    if recursive:
+        for root, _, files in os.walk(folder):
+            for name in files:
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    found.append(os.path.relpath(os.path.join(root, name), folder))
+    else:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    found.append(entry.name)
+    return sorted(found)
+
+
+def extract_image_palette(image_path, count, method, seed):
+    """Worker: decodes one image and returns its palette as a list of RGB lists."""
+    pixels = image_loader.load_rgb(image_path)
+    colors, _ = color_palette.image_palette(pixels, count, method, seed)
+    return [list(c) for c in colors]
+
+
+def _load_manifest(path):
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (IOError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def batch_extract_palettes(
+    folder,
+    output_dir=None,
+    count=9,
+    method="kmeans",
+    seed=1,
+    recursive=False,
+    max_workers=None,
+    progress_callback=None,
+):
+    """
+    Extracts a palette from every image in folder and writes
+    <output_dir>/<relative image path>.ase (one group per image) plus a
+    palettes.json manifest. Images whose mtime and size match the manifest,
+    with the same count/method/seed, are skipped.
+
+    progress_callback(done, total, rel_path) is called as each image
+    finishes; returning False from it, or raising, cancels the remaining
+    work (an exception is re-raised after the manifest is written).
+    Returns the manifest dict; failures are listed under "errors".
+    """
+    if method not in color_palette.PALETTE_METHODS:
+        raise ValueError(f"Unknown palette method '{method}'")
+    folder = os.path.abspath(folder)
+    output_dir = os.path.abspath(output_dir or os.path.join(folder, "palettes"))
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    settings = {
+        "count": count, "method": method, "seed": seed,
+        "max_pixels": image_loader.MAX_DECODE_PIXELS,
+    }
+
+    previous = _load_manifest(manifest_path)
+    cached = previous["images"] if previous and previous.get("settings") == settings else {}
+    manifest = {"version": MANIFEST_VERSION, "settings": settings, "images": {}, "errors": {}}
+
+    pending = []
+    for rel_path in find_images(folder, recursive):
+        stat = os.stat(os.path.join(folder, rel_path))
+        entry = cached.get(rel_path)
+        if (
+            entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size
+            and os.path.exists(os.path.join(output_dir, entry.get("ase", "")))
+        ):
+            manifest["images"][rel_path] = entry
+        else:
+            pending.append((rel_path, stat))
+
+    def record(rel_path, stat, colors):
+        ase_rel = os.path.splitext(rel_path)[0] + ".ase"
+        stem = os.path.splitext(os.path.basename(rel_path))[0]
+        swatches = [(f"{stem}_{i + 1:02d}", tuple(c)) for i, c in enumerate(colors)]
+        ase_codec.write_ase(os.path.join(output_dir, ase_rel), swatches, group=stem)
+        manifest["images"][rel_path] = {
+            "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "ase": ase_rel, "colors": colors,
+        }
+
+    total = len(pending)
+    try:
+        if pending:
+            with worker_pool.process_pool(max_workers) as pool:
+                futures = {
+                    pool.submit(extract_image_palette, os.path.join(folder, rel_path), count, method, seed): (rel_path, stat)
+                    for rel_path, stat in pending
+                }
+                try:
+                    for done, future in enumerate(as_completed(futures), 1):
+                        rel_path, stat = futures[future]
+                        try:
+                            record(rel_path, stat, future.result())
+                        except Exception as e:
+                            manifest["errors"][rel_path] = str(e)
+                        if progress_callback and progress_callback(done, total, rel_path) is False:
+                            break
+                finally:
+                    # On cancel (False or an exception such as hou.OperationInterrupted
+                    # from the callback) drop queued images; only running ones finish
+                    pool.shutdown(wait=False, cancel_futures=True)
+    finally:
+        # Palettes written before a cancel stay recorded, so re-runs skip them
+        os.makedirs(output_dir, exist_ok=True)
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
@@ -0,0 +1,282 @@
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Palette extraction shared by the image color tools
+# (sampleColorFromImage.ImageRampUI, sampleColorFromImageHDA, image_preview panel)
+#
+# All methods work on a downsampled (n, 3) float RGB array in the 0-1 range
+# and return colors sorted dark to bright, plus the index of the pixel that
+# best represents each color (used to place the preview markers).
+# -----------------------------------------------------------------------------
+
+PALETTE_METHODS = ("kmeans", "median_cut", "octree")
+PALETTE_LABELS = {
+    "kmeans": "K-Means (Lab)",
+    "median_cut": "Median Cut",
+    "octree": "Octree",
+}
+
+MAX_PALETTE_PIXELS = 64 * 1024
+MAX_KMEANS_POINTS = 16 * 1024
+
+# sRGB (D65) <-> CIE XYZ
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+_LAB_EPSILON = 216.0 / 24389.0
+_LAB_KAPPA = 24389.0 / 27.0
+
+
+def srgb_to_lab(rgb):
+    """Converts an (n, 3) sRGB array (0-1) to CIELAB (D65)."""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _RGB_TO_XYZ.T / _WHITE_D65
+    f = np.where(xyz > _LAB_EPSILON, np.cbrt(xyz), (_LAB_KAPPA * xyz + 16.0) / 116.0)
+    lab = np.empty_like(f)
+    lab[:, 0] = 116.0 * f[:, 1] - 16.0
+    lab[:, 1] = 500.0 * (f[:, 0] - f[:, 1])
+    lab[:, 2] = 200.0 * (f[:, 1] - f[:, 2])
+    return lab
+
+
+def lab_to_srgb(lab):
+    """Converts an (n, 3) CIELAB array (D65) back to clamped sRGB (0-1)."""
+    lab = np.asarray(lab, dtype=np.float64)
+    fy = (lab[:, 0] + 16.0) / 116.0
+    f = np.stack([fy + lab[:, 1] / 500.0, fy, fy - lab[:, 2] / 200.0], axis=1)
+    xyz = np.where(f ** 3 > _LAB_EPSILON, f ** 3, (116.0 * f - 16.0) / _LAB_KAPPA) * _WHITE_D65
+    linear = np.clip(xyz @ _XYZ_TO_RGB.T, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1.0 / 2.4) - 0.055)
+
+
+def ciede2000(lab1, lab2):
+    """
+    CIEDE2000 color difference between CIELAB arrays of shape (..., 3),
+    broadcast against each other (e.g. (m, 1, 3) against (n, 3) gives (m, n)).
+    """
+    lab1 = np.asarray(lab1, dtype=np.float64)
+    lab2 = np.asarray(lab2, dtype=np.float64)
+    l1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    l2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    c_mean = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2.0
+    g = 0.5 * (1.0 - np.sqrt(c_mean ** 7 / (c_mean ** 7 + 25.0 ** 7)))
+    a1p, a2p = a1 * (1.0 + g), a2 * (1.0 + g)
+    c1p, c2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360.0
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360.0
+
+    delta_l = l2 - l1
+    delta_c = c2p - c1p
+    chroma_product = c1p * c2p
+    delta_h = h2p - h1p
+    delta_h = np.where(delta_h > 180.0, delta_h - 360.0, np.where(delta_h < -180.0, delta_h + 360.0, delta_h))
+    delta_h = np.where(chroma_product == 0.0, 0.0, delta_h)
+    delta_hp = 2.0 * np.sqrt(chroma_product) * np.sin(np.radians(delta_h) / 2.0)
+
+    l_mean = (l1 + l2) / 2.0
+    cp_mean = (c1p + c2p) / 2.0
+    h_sum = h1p + h2p
+    h_mean = np.where(
+        np.abs(h1p - h2p) > 180.0,
+        np.where(h_sum < 360.0, (h_sum + 360.0) / 2.0, (h_sum - 360.0) / 2.0),
+        h_sum / 2.0,
+    )
+    h_mean = np.where(chroma_product == 0.0, h_sum, h_mean)
+
+    t = (
+        1.0
+        - 0.17 * np.cos(np.radians(h_mean - 30.0))
+        + 0.24 * np.cos(np.radians(2.0 * h_mean))
+        + 0.32 * np.cos(np.radians(3.0 * h_mean + 6.0))
+        - 0.20 * np.cos(np.radians(4.0 * h_mean - 63.0))
+    )
+    s_l = 1.0 + 0.015 * (l_mean - 50.0) ** 2 / np.sqrt(20.0 + (l_mean - 50.0) ** 2)
+    s_c = 1.0 + 0.045 * cp_mean
+    s_h = 1.0 + 0.015 * cp_mean * t
+    r_c = 2.0 * np.sqrt(cp_mean ** 7 / (cp_mean ** 7 + 25.0 ** 7))
+    r_t = -np.sin(np.radians(60.0 * np.exp(-(((h_mean - 275.0) / 25.0) ** 2)))) * r_c
+
+    term_l = delta_l / s_l
+    term_c = delta_c / s_c
+    term_h = delta_hp / s_h
+    return np.sqrt(term_l ** 2 + term_c ** 2 + term_h ** 2 + r_t * term_c * term_h)
+
+
+def downsample_pixels(pixels, max_pixels=MAX_PALETTE_PIXELS):
+    """
+    Strides an (h, w, 3) uint8 array down to at most max_pixels samples.
+    Returns xs, ys (source coordinates) and an (n, 3) float RGB array.
+    """
+    height, width = pixels.shape[:2]
+    step = max(1, int(np.ceil(np.sqrt(height * width / float(max_pixels)))))
+    grid = pixels[::step, ::step]
+    ys, xs = np.mgrid[0:height:step, 0:width:step]
+    return xs.ravel(), ys.ravel(), grid.reshape(-1, 3).astype(np.float64) / 255.0
+
+
+def _nearest(points, centers):
+    """Index of the nearest center for every point (squared Euclidean)."""
+    distances = (
+        np.einsum("ij,ij->i", points, points)[:, None]
+        - 2.0 * points @ centers.T
+        + np.einsum("ij,ij->i", centers, centers)[None, :]
+    )
+    np.maximum(distances, 0.0, out=distances)
+    return distances.argmin(axis=1), distances
+
+
+def _representatives(lab, labels, centers_lab):
+    """For each cluster, the index of its member closest to the center."""
+    _, distances = _nearest(lab, centers_lab)
+    indices = []
+    for cluster in range(len(centers_lab)):
+        members = np.flatnonzero(labels == cluster)
+        if len(members):
+            indices.append(members[distances[members, cluster].argmin()])
+        else:
+            indices.append(distances[:, cluster].argmin())
+    return np.array(indices, dtype=np.intp)
+
+
+def kmeans_palette(rgb, count, seed=1, iterations=24, tolerance=1e-3):
+    """
+    Vectorized k-means in CIELAB with k-means++ seeding, fitted on at most
+    MAX_KMEANS_POINTS of the pixels. Deterministic for a given seed.
+    Returns (colors, representative indices) in cluster order.
+    """
+    lab = srgb_to_lab(rgb)
+    rng = np.random.default_rng(seed)
+    points = lab
+    if len(lab) > MAX_KMEANS_POINTS:
+        points = lab[np.sort(rng.choice(len(lab), MAX_KMEANS_POINTS, replace=False))]
+
+    centers = np.empty((count, 3))
+    centers[0] = points[rng.integers(len(points))]
+    closest = ((points - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, count):
+        total = closest.sum()
+        index = rng.choice(len(points), p=closest / total) if total > 0 else rng.integers(len(points))
+        centers[i] = points[index]
+        closest = np.minimum(closest, ((points - centers[i]) ** 2).sum(axis=1))
+
+    for _ in range(iterations):
+        labels, distances = _nearest(points, centers)
+        counts = np.bincount(labels, minlength=count)
+        sums = np.stack([np.bincount(labels, weights=points[:, c], minlength=count) for c in range(3)], axis=1)
+
+        updated = centers.copy()
+        filled = counts > 0
+        updated[filled] = sums[filled] / counts[filled, None]
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            # Re-seed empty clusters on the points worst served by their center
+            worst = np.argsort(distances[np.arange(len(points)), labels])[::-1]
+            updated[empty] = points[worst[:len(empty)]]
+
+        shift = np.abs(updated - centers).max()
+        centers = updated
+        if shift < tolerance:
+            break
+
+    labels, _ = _nearest(lab, centers)
+    return lab_to_srgb(centers), _representatives(lab, labels, centers)
+
+
+def median_cut_palette(rgb, count):
+    """
+    Median-cut quantization: repeatedly splits the box with the widest
+    channel range at its median. Returns (colors, representative indices).
+    """
+    boxes = [np.arange(len(rgb))]
+    while len(boxes) < count:
+        ranges = [np.ptp(rgb[box], axis=0).max() if len(box) > 1 else -1.0 for box in boxes]
+        widest = int(np.argmax(ranges))
+        if ranges[widest] <= 0:
+            break
+        box = boxes.pop(widest)
+        channel = int(np.ptp(rgb[box], axis=0).argmax())
+        order = box[np.argsort(rgb[box, channel], kind="stable")]
+        half = len(order) // 2
+        boxes.extend([order[:half], order[half:]])
+
+    lab = srgb_to_lab(rgb)
+    labels = np.empty(len(rgb), dtype=np.intp)
+    for cluster, box in enumerate(boxes):
+        labels[box] = cluster
+    centers_lab = np.array([lab[box].mean(axis=0) for box in boxes])
+    colors = np.array([rgb[box].mean(axis=0) for box in boxes])
+    return colors, _representatives(lab, labels, centers_lab)
+
+
+def octree_palette(rgb, count):
+    """
+    Octree quantization: pixels are bucketed by the top bits of each channel,
+    using the shallowest tree level with at least count occupied nodes, and
+    the most populated nodes become the palette. Returns (colors, indices).
+    """
+    values = np.clip((rgb * 255.0).round(), 0, 255).astype(np.int64)
+    for level in range(1, 9):
+        shift = 8 - level
+        keys = ((values[:, 0] >> shift) << (2 * level)) | ((values[:, 1] >> shift) << level) | (values[:, 2] >> shift)
+        nodes, inverse, populations = np.unique(keys, return_inverse=True, return_counts=True)
+        if len(nodes) >= count:
+            break
+
+    kept = np.argsort(-populations, kind="stable")[:count]
+    remap = np.full(len(nodes), -1)
+    remap[kept] = np.arange(len(kept))
+
+    lab = srgb_to_lab(rgb)
+    colors = np.array([rgb[inverse == node].mean(axis=0) for node in kept])
+    centers_lab = srgb_to_lab(colors)
+    # Pixels from dropped nodes fold into the nearest kept color
+    labels = remap[inverse]
+    orphans = labels < 0
+    if orphans.any():
+        labels[orphans], _ = _nearest(lab[orphans], centers_lab)
+    return colors, _representatives(lab, labels, centers_lab)
+
+
+def extract_palette(rgb, count, method="kmeans", seed=1):
+    """
+    Extracts up to count colors from an (n, 3) float RGB array.
+    Returns (colors, indices) sorted dark to bright; fewer colors are
+    returned when the pixels hold fewer distinct colors than requested.
+    """
+    if len(rgb) == 0:
+        return np.empty((0, 3)), np.empty(0, dtype=np.intp)
+    packed = np.clip((rgb * 255.0).round(), 0, 255).astype(np.int64) @ np.array([1 << 16, 1 << 8, 1])
+    count = max(1, min(count, len(np.unique(packed))))
+
+    if method == "median_cut":
+        colors, indices = median_cut_palette(rgb, count)
+    elif method == "octree":
+        colors, indices = octree_palette(rgb, count)
+    else:
+        colors, indices = kmeans_palette(rgb, count, seed)
+
+    order = np.argsort(srgb_to_lab(colors)[:, 0], kind="stable")
+    return colors[order], indices[order]
+
+
+def image_palette(pixels, count, method="kmeans", seed=1, mask=None, max_pixels=MAX_PALETTE_PIXELS):
+    """
+    Extracts a palette from an (h, w, 3) uint8 image array.
+    mask is an optional callable taking the (n, 3) float colors and returning
+    a boolean keep-mask (the dark/bright/muted/deep filters).
+    Returns a list of RGB tuples and a list of (x, y) source positions.
+    """
+    xs, ys, rgb = downsample_pixels(pixels, max_pixels)
+    if mask is not None:
+        keep = mask(rgb)
+        xs, ys, rgb = xs[keep], ys[keep], rgb[keep]
+
+    colors, indices = extract_palette(rgb, count, method, seed)
+    positions = list(zip(xs[indices].tolist(), ys[indices].tolist()))
+    return [tuple(color) for color in colors.tolist()], positions
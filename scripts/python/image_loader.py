@@ -0,0 +1,222 @@
+import os
+import numpy as np
+from PIL import Image
+
+# OpenImageIO ships with most pipelines (and recent Houdini builds) but is optional here:
+# without it EXR/HDR can't be read and TIFFs fall back to PIL (see _read_pil).
+try:
+    import OpenImageIO as oiio
+except ImportError:
+    oiio = None
+
+# -----------------------------------------------------------------------------
+# Bounded-memory image decoding for the image color tools (see image_sampling)
+#
+# Every loader returns an (h, w, 3) uint8 display-referred array holding at
+# most MAX_DECODE_PIXELS pixels. Larger sources are reduced while decoding:
+# JPEG through DCT draft scaling, TIFF/EXR through strip reads that keep
+# every n-th row and column (or a smaller MIP level when the file has one).
+# Without OpenImageIO, sources PIL can't read in pieces are decoded whole
+# up to WHOLE_DECODE_FACTOR x the limit and refused beyond it.
+# Scene-linear float images are tone-mapped to sRGB for the ramp.
+# -----------------------------------------------------------------------------
+
+MAX_DECODE_PIXELS = 4096 * 4096
+# JPEG drafts can land up to 2x over the target per axis; whole-image PIL
+# decodes get the same headroom (an 8K texture still decodes at the default)
+WHOLE_DECODE_FACTOR = 4
+STRIP_ROWS = 64
+OIIO_EXTENSIONS = (".exr", ".hdr", ".tif", ".tiff", ".tx")
+FLOAT_ONLY_EXTENSIONS = (".exr", ".hdr")
+LUMINANCE = np.array([0.2126, 0.7152, 0.0722])
+
+
+def reduction_step(width, height, max_pixels=MAX_DECODE_PIXELS):
+    """Integer stride that brings width x height under max_pixels."""
+    return max(1, int(np.ceil(np.sqrt(width * height / float(max_pixels)))))
+
+
+def linear_to_srgb(rgb):
+    rgb = np.clip(rgb, 0.0, 1.0)
+    return np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * rgb ** (1.0 / 2.4) - 0.055)
+
+
+def srgb_to_linear(rgb):
+    rgb = np.clip(rgb, 0.0, 1.0)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def tone_map(rgb, white_percentile=99.5):
+    """
+    Maps scene-linear float RGB to display sRGB uint8. Images that already
+    sit in 0-1 are only encoded; brighter ones go through extended Reinhard
+    on luminance with the white point at the given luminance percentile, so
+    hue is kept and highlights roll off instead of clipping.
+    """
+    rgb = np.maximum(np.nan_to_num(np.asarray(rgb, dtype=np.float32), posinf=0.0), 0.0)
+    luminance = rgb @ LUMINANCE.astype(np.float32)
+    white = float(np.percentile(luminance, white_percentile)) if luminance.size else 0.0
+    if white > 1.0:
+        scale = (1.0 + luminance / (white * white)) / (1.0 + luminance)
+        rgb = rgb * scale[..., None]
+    return np.round(linear_to_srgb(rgb) * 255.0).astype(np.uint8)
+
+
+def _to_rgb(array):
+    """Drops alpha/extra channels and expands grayscale to three channels."""
+    if array.ndim == 2:
+        array = array[..., None]
+    if array.shape[2] >= 3:
+        return array[..., :3]
+    return np.repeat(array[..., :1], 3, axis=2)
+
+
+def _read_oiio(path, max_pixels):
+    """
+    Reads an image through OpenImageIO with bounded memory: picks the
+    smallest MIP level still above the target size, then reads STRIP_ROWS
+    scanlines at a time keeping every step-th row and column.
+    Returns (float32 (h, w, c) array, is_float_source).
+    """
+    inp = oiio.ImageInput.open(path)
+    if not inp:
+        raise IOError(f"Cannot open {path}: {oiio.geterror()}")
+    try:
+        spec = inp.spec()
+        target = min(max_pixels, spec.width * spec.height)
+        level = 0
+        while inp.seek_subimage(0, level + 1):
+            mip_spec = inp.spec()
+            if mip_spec.width * mip_spec.height < target:
+                break
+            level += 1
+            spec = mip_spec
+        inp.seek_subimage(0, level)
+
+        step = reduction_step(spec.width, spec.height, max_pixels)
+        channels = min(spec.nchannels, 3)
+        is_float = spec.format.basetype in (oiio.FLOAT, oiio.HALF, oiio.DOUBLE)
+
+        # Strip height is a multiple of step so every strip starts on a kept row
+        strip_rows = step * max(1, STRIP_ROWS // step)
+        rows = []
+        y_end = spec.y + spec.height
+        for y0 in range(spec.y, y_end, strip_rows):
+            y1 = min(y0 + strip_rows, y_end)
+            strip = inp.read_scanlines(0, level, y0, y1, 0, 0, channels, oiio.FLOAT)
+            if strip is None:
+                raise IOError(f"Failed reading {path}: {inp.geterror()}")
+            strip = np.asarray(strip).reshape(y1 - y0, spec.width, channels)
+            rows.append(strip[::step, ::step])
+        return np.concatenate(rows, axis=0), is_float
+    finally:
+        inp.close()
+
+
+def _pil_rgb(img):
+    """An opened/loaded PIL image converted to 8-bit RGB."""
+    if img.mode in ("I;16", "I;16B", "I;16L", "I"):
+        # 16-bit grayscale (PIL may open it as "I"): scale to 8-bit instead of clipping at 255
+        array = np.clip(np.asarray(img, dtype=np.float32) / 65535.0, 0.0, 1.0)
+        img = Image.fromarray(np.round(array * 255.0).astype(np.uint8), "L")
+    return img.convert("RGB")
+
+
+def _decode_raw_tile(fp, mode, tile):
+    """Decodes one raw strip/tile of an opened PIL image into its own image."""
+    x0, y0, x1, y1 = tile[1]
+    part = Image.new(mode, (x1 - x0, y1 - y0))
+    decoder = Image._getdecoder(mode, "raw", tile[3])
+    try:
+        decoder.setimage(part.im, (0, 0) + part.size)
+        fp.seek(tile[2])
+        data = b""
+        while True:
+            chunk = fp.read(65536)
+            if not chunk:
+                raise IOError("image file is truncated")
+            data += chunk
+            consumed, error = decoder.decode(data)
+            if consumed < 0:
+                break
+            data = data[consumed:]
+        if error < 0:
+            raise IOError(f"decoder error {error}")
+    finally:
+        decoder.cleanup()
+    return part
+
+
+def _read_pil_strips(img, fp, step):
+    """
+    Decodes an image stored as independent raw strips/tiles one at a time,
+    keeping every step-th row and column like _read_oiio.
+    """
+    width, height = img.size
+    out = np.empty((-(-height // step), -(-width // step), 3), dtype=np.uint8)
+    for tile in img.tile:
+        x0, y0 = tile[1][:2]
+        # First kept row/column inside the tile, in tile coordinates
+        dy, dx = -y0 % step, -x0 % step
+        part = np.asarray(_pil_rgb(_decode_raw_tile(fp, img.mode, tile)))[dy::step, dx::step]
+        oy, ox = (y0 + dy) // step, (x0 + dx) // step
+        out[oy:oy + part.shape[0], ox:ox + part.shape[1]] = part
+    return out
+
+
+def _read_pil(path, max_pixels):
+    """
+    Reads through PIL without decoding more than WHOLE_DECODE_FACTOR x
+    max_pixels at once. JPEG decodes straight to a reduced size in draft
+    mode; other images within that bound decode whole and are reduced
+    after. Larger images stored as raw strips or tiles (uncompressed TIFF)
+    are read a strip at a time; anything else that large (PNG, compressed
+    TIFF) raises IOError, as only OpenImageIO can read it in pieces.
+    """
+    with open(path, "rb") as f, Image.open(f) as img:
+        width, height = img.size
+        step = reduction_step(width, height, max_pixels)
+        if step > 1 and img.format == "JPEG":
+            # libjpeg scales by 1/2, 1/4 or 1/8 during decode; reduce() covers the rest
+            img.draft("RGB", (width // step, height // step))
+            width, height = img.size
+            step = reduction_step(width, height, max_pixels)
+
+        limit = WHOLE_DECODE_FACTOR * max_pixels
+        if width * height <= limit:
+            img = _pil_rgb(img)
+            if step > 1:
+                img = img.reduce(step)
+            return np.asarray(img)
+
+        # Palette images are left out: their palette is only complete once loaded
+        if img.mode != "P" and img.tile and all(
+            tile[0] == "raw" and (tile[1][2] - tile[1][0]) * (tile[1][3] - tile[1][1]) <= limit
+            for tile in img.tile
+        ):
+            return _read_pil_strips(img, f, step)
+        raise IOError(
+            f"{path} is {width}x{height}, over the {limit} pixel decode limit; "
+            f"reading it needs the OpenImageIO Python module"
+        )
+
+
+def load_rgb(image_path, max_pixels=MAX_DECODE_PIXELS):
+    """
+    Decodes image_path to an (h, w, 3) uint8 sRGB array of at most
+    max_pixels pixels. Images under the limit decode at full resolution.
+    Without OpenImageIO, no more than WHOLE_DECODE_FACTOR x max_pixels are
+    held while decoding, and images over that which PIL can only decode
+    whole raise IOError.
+    """
+    extension = os.path.splitext(image_path)[1].lower()
+    if oiio is not None and extension in OIIO_EXTENSIONS:
+        array, is_float = _read_oiio(image_path, max_pixels)
+        array = _to_rgb(array)
+        if is_float:
+            return np.ascontiguousarray(tone_map(array))
+        return np.ascontiguousarray(np.round(np.clip(array, 0.0, 1.0) * 255.0).astype(np.uint8))
+
+    if extension in FLOAT_ONLY_EXTENSIONS:
+        raise IOError(f"Reading {extension} images needs the OpenImageIO Python module: {image_path}")
+    return _read_pil(image_path, max_pixels)
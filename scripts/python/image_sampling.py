@@ -0,0 +1,310 @@
+import os
+import random
+import threading
+from collections import OrderedDict
+import numpy as np
+from PIL import Image
+import image_loader
+
+# -----------------------------------------------------------------------------
+# Vectorized pixel sampling shared by the image color tools
+# (sampleColorFromImage, sampleColorFromImageHDA, image_preview panel)
+# -----------------------------------------------------------------------------
+
+MT_STATE_LEN = 624
+
+# A handful of images at the loader's size cap
+IMAGE_CACHE_MAX_BYTES = 8 * image_loader.MAX_DECODE_PIXELS * 3
+
+
+class ImageCache:
+    """
+    LRU cache of decoded RGB arrays keyed by path and mtime.
+
+    Each path holds the decoded array (full resolution up to
+    image_loader.MAX_DECODE_PIXELS; seeded sampling needs the original pixel
+    grid) plus any downsampled previews derived from it, so
+    changing the sample count or seed never decodes the file again. An
+    edited file (new mtime) replaces its stale entry. Arrays are read-only
+    because they are shared between the tools.
+    """
+
+    def __init__(self, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (mtime_ns, {max_size: array})
+        self._lock = threading.Lock()
+
+    def get(self, image_path, max_size=None):
+        """
+        Returns the image as an (h, w, 3) uint8 array. With max_size, the
+        image is shrunk (LANCZOS, aspect kept) to fit in max_size x max_size.
+        """
+        path = os.path.normcase(os.path.abspath(image_path))
+        mtime = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(path)
+                variants = entry[1]
+                if max_size in variants:
+                    return variants[max_size]
+            else:
+                variants = None
+
+        if variants is None:
+            full = image_loader.load_rgb(path)
+            full.setflags(write=False)
+            variants = {None: full}
+
+        array = variants.get(max_size)
+        if array is None:
+            thumb = Image.fromarray(variants[None])
+            thumb.thumbnail((max_size, max_size), Image.LANCZOS)
+            array = np.asarray(thumb)
+            array.setflags(write=False)
+
+        with self._lock:
+            variants[max_size] = array
+            self._entries[path] = (mtime, variants)
+            self._entries.move_to_end(path)
+            self._evict()
+        return array
+
+    def peek(self, image_path, max_size=None):
+        """The cached array if this file version is already loaded, else None (never decodes)."""
+        path = os.path.normcase(os.path.abspath(image_path))
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != mtime:
+                return None
+            return entry[1].get(max_size)
+
+    def _evict(self):
+        """Drops least recently used images until under max_bytes (keeps the newest)."""
+        total = sum(a.nbytes for _, variants in self._entries.values() for a in variants.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, (_, variants) = self._entries.popitem(last=False)
+            total -= sum(a.nbytes for a in variants.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+image_cache = ImageCache()
+
+
+def load_rgb_array(image_path):
+    """Decoded (height, width, 3) uint8 array, read from disk once per file version."""
+    return image_cache.get(image_path)
+
+
+def load_preview_array(image_path, max_size):
+    """Cached downsampled copy of the image that fits in max_size x max_size."""
+    return image_cache.get(image_path, max_size)
+
+
+def nearest_preview(pixels, max_size):
+    """
+    Quick nearest-neighbour shrink of an (h, w, 3) array to fit in
+    max_size x max_size. Only gathers the output pixels, so it costs the
+    same for any source size; used until the filtered preview is ready.
+    """
+    height, width = pixels.shape[:2]
+    scale = min(1.0, max_size / float(max(height, width)))
+    out_w, out_h = max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+    rows = ((np.arange(out_h) + 0.5) * (height / float(out_h))).astype(np.intp)
+    cols = ((np.arange(out_w) + 0.5) * (width / float(out_w))).astype(np.intp)
+    return pixels[rows[:, None], cols[None, :]]
+
+
+def _bit_generator_from(rng):
+    """Returns a NumPy MT19937 in the same state as a random.Random."""
+    version, internal, gauss = rng.getstate()
+    bit_generator = np.random.MT19937()
+    bit_generator.state = {
+        "bit_generator": "MT19937",
+        "state": {"key": np.array(internal[:MT_STATE_LEN], dtype=np.uint32), "pos": internal[MT_STATE_LEN]},
+    }
+    return bit_generator
+
+
+def _advance(rng, words):
+    """Moves a random.Random forward by a number of 32-bit outputs."""
+    bit_generator = _bit_generator_from(rng)
+    bit_generator.random_raw(words)
+    state = bit_generator.state["state"]
+    version = rng.getstate()[0]
+    rng.setstate((version, tuple(int(k) for k in state["key"]) + (int(state["pos"]),), None))
+
+
+def _next_accepted(accepted):
+    """For every index i, the first index j >= i where accepted[j] (len if none)."""
+    size = len(accepted)
+    indices = np.where(accepted, np.arange(size), size)
+    return np.append(np.minimum.accumulate(indices[::-1])[::-1], size)
+
+
+def random_coords(rng, width, height, count):
+    """
+    Draws count pixel coordinates exactly as the loop
+
+        x = rng.randint(0, width - 1)
+        y = rng.randint(0, height - 1)
+
+    would, so seeded results match the original per-pixel implementation.
+    Python's randint rejection-samples the top bits of 32-bit Mersenne Twister
+    outputs; here the outputs are generated in bulk with NumPy's MT19937 and
+    only the accept/reject bookkeeping walks the stream. rng is left in the
+    state the loop would have left it in.
+    """
+    kx, ky = width.bit_length(), height.bit_length()
+    words_needed = count * 4 + 64
+
+    while True:
+        words = _bit_generator_from(rng).random_raw(words_needed)
+        cand_x = words >> np.uint64(32 - kx)
+        cand_y = words >> np.uint64(32 - ky)
+        next_x = _next_accepted(cand_x < width).tolist()
+        next_y = _next_accepted(cand_y < height).tolist()
+
+        x_index, y_index = [], []
+        pos = 0
+        for _ in range(count):
+            jx = next_x[pos]
+            if jx >= words_needed:
+                break
+            jy = next_y[jx + 1]
+            if jy >= words_needed:
+                break
+            x_index.append(jx)
+            y_index.append(jy)
+            pos = jy + 1
+        else:
+            _advance(rng, pos)
+            return cand_x[x_index].astype(np.intp), cand_y[y_index].astype(np.intp)
+
+        words_needed *= 2
+
+
+def stratified_coords(seed, width, height, count):
+    """
+    Jittered-grid coordinates: the image is split into at least count
+    cells matching its aspect ratio, one uniformly jittered point per cell.
+    When the grid has spare cells, a seeded random subset is kept. Points
+    come back in random order, so any prefix is still spread out.
+    """
+    rng = np.random.default_rng(seed)
+    columns = max(1, int(np.ceil(np.sqrt(count * width / float(height)))))
+    rows = max(1, int(np.ceil(count / float(columns))))
+    cells = rng.permutation(columns * rows)[:count]
+    fx = (cells % columns + rng.random(len(cells))) * (width / float(columns))
+    fy = (cells // columns + rng.random(len(cells))) * (height / float(rows))
+    return (
+        np.minimum(fx.astype(np.intp), width - 1),
+        np.minimum(fy.astype(np.intp), height - 1),
+    )
+
+
+# Maximal Poisson-disk fills hold about this many points per radius^2 of area
+POISSON_PACKING = 0.55
+POISSON_ROUNDS = 12
+
+
+def poisson_disk_coords(seed, width, height, count):
+    """
+    Poisson-disk coordinates: no two points closer than a radius derived
+    from count, so small regions are reached without clumps.
+
+    Uses parallel dart throwing on an acceleration grid with cells of
+    radius/sqrt(2) (at most one point each). Cells sharing the same
+    (x mod 5, y mod 5) phase are too far apart to conflict, so each phase
+    throws one dart into all of its empty cells at once and tests them
+    against their 5x5 neighbourhood in one vectorized step. The result is
+    trimmed to count (random subset) or topped up with uniform points.
+    """
+    rng = np.random.default_rng(seed)
+    radius = np.sqrt(POISSON_PACKING * width * height / float(count))
+    cell = radius / np.sqrt(2.0)
+    grid_w, grid_h = int(np.ceil(width / cell)), int(np.ceil(height / cell))
+    # Padded by two cells on every side so neighbourhood lookups never clip
+    grid = np.full((grid_h + 4, grid_w + 4), -1, dtype=np.intp)
+    offsets_y, offsets_x = (o.ravel() for o in np.mgrid[-2:3, -2:3])
+
+    cell_y, cell_x = (c.ravel() for c in np.mgrid[0:grid_h, 0:grid_w])
+    phase = (cell_y % 5) * 5 + cell_x % 5
+    phases = [np.flatnonzero(phase == p) for p in range(25)]
+
+    points = np.zeros((grid_w * grid_h, 2))
+    total = 0
+    for _ in range(POISSON_ROUNDS):
+        for p in rng.permutation(25):
+            cells = phases[p]
+            cells = cells[grid[cell_y[cells] + 2, cell_x[cells] + 2] < 0]
+            if not len(cells):
+                continue
+            cx, cy = cell_x[cells], cell_y[cells]
+            darts = (np.stack([cx, cy], axis=1) + rng.random((len(cells), 2))) * cell
+            inside = (darts[:, 0] < width) & (darts[:, 1] < height)
+            darts, cx, cy = darts[inside], cx[inside], cy[inside]
+
+            neighbours = grid[cy[:, None] + 2 + offsets_y, cx[:, None] + 2 + offsets_x]
+            occupied = neighbours >= 0
+            delta = points[np.where(occupied, neighbours, 0)] - darts[:, None, :]
+            valid = ~(occupied & ((delta ** 2).sum(axis=2) < radius * radius)).any(axis=1)
+
+            accepted = np.flatnonzero(valid)
+            points[total:total + len(accepted)] = darts[accepted]
+            grid[cy[accepted] + 2, cx[accepted] + 2] = np.arange(total, total + len(accepted))
+            total += len(accepted)
+
+    points = points[rng.permutation(total)[:count]]
+    if len(points) < count:
+        extra = rng.random((count - len(points), 2)) * (width, height)
+        points = np.concatenate([points, extra])
+    return (
+        np.minimum(points[:, 0].astype(np.intp), width - 1),
+        np.minimum(points[:, 1].astype(np.intp), height - 1),
+    )
+
+
+# Pixel sampling patterns: "random" reproduces the original random.randint loop
+SAMPLING_PATTERNS = ("random", "stratified", "poisson")
+SAMPLING_LABELS = {
+    "random": "Random",
+    "stratified": "Stratified (Jittered Grid)",
+    "poisson": "Poisson Disk",
+}
+
+
+def sample_pixels(pixels, seed, count, pattern="random"):
+    """
+    Samples count pixels from an (h, w, 3) uint8 array using one of
+    SAMPLING_PATTERNS. Returns xs, ys, rgb (float64 in 0-1) and the seeded
+    random.Random for any follow-up choices (for "random", positioned after
+    the coordinate draws exactly as the original loop left it).
+    """
+    height, width = pixels.shape[:2]
+    rng = random.Random(seed)
+    if pattern == "stratified":
+        xs, ys = stratified_coords(seed, width, height, count)
+    elif pattern == "poisson":
+        xs, ys = poisson_disk_coords(seed, width, height, count)
+    else:
+        xs, ys = random_coords(rng, width, height, count)
+    rgb = pixels[ys, xs].astype(np.float64) / 255.0
+    return xs, ys, rgb, rng
+
+
+def saturation_value(rgb):
+    """Vectorized colorsys.rgb_to_hsv saturation and value for an (n, 3) array."""
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        saturation = np.where(maxc == minc, 0.0, (maxc - minc) / maxc)
+    return saturation, maxc
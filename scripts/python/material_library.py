@@ -0,0 +1,207 @@
+import os
+import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import texture_sets
+import megascans_metadata
+import worker_pool
+
+# -----------------------------------------------------------------------------
+# Library ingest for the material builders: finds every texture folder under
+# several roots (Megascans / GSG style libraries) and the metadata of each
+# folder's Megascans JSON.
+#
+# Folders are listed with os.scandir on a thread pool, each new subfolder
+# queued as soon as its parent is read. JSON files missing from the
+# megascans_metadata cache are parsed in a process pool. With listings cached
+# per folder mtime and metadata per file mtime, re-ingesting an unchanged
+# library costs one stat per folder and JSON file. No hou imports: the
+# workers run in plain Python.
+# -----------------------------------------------------------------------------
+
+LIBRARY_CACHE_NAME = "ax_material_library.json"
+CACHE_VERSION = 2
+
+SCAN_THREADS = 8
+# Fewer pending JSON files than this are parsed inline (spawning workers costs more)
+PARALLEL_JSON_MIN = 16
+
+# root as given, absolute folder path, sorted texture file names, merged MegascansMetadata
+LibraryFolder = namedtuple("LibraryFolder", ["root", "path", "textures", "metadata"])
+
+
+def _load_cache(path):
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (IOError, ValueError):
+        return {}
+    return cache.get("folders", {}) if cache.get("version") == CACHE_VERSION else {}
+
+
+def _save_cache(path, folders):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"version": CACHE_VERSION, "folders": folders}, f)
+    os.replace(temp_path, path)
+
+
+def _scan_folder(path, cached):
+    """
+    (cache entry, [(json path, stat), ...]) for one folder. The entry holds
+    {"mtime_ns", "textures", "subfolders", "jsons"} and is reused as is
+    while the folder mtime matches.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    if cached and cached.get("mtime_ns") == mtime_ns:
+        entry = cached
+    else:
+        textures, subfolders, jsons = [], [], []
+        with os.scandir(path) as entries:
+            for item in entries:
+                if item.is_dir(follow_symlinks=False):
+                    subfolders.append(item.path)
+                elif texture_sets.is_texture_file(item.name):
+                    textures.append(item.name)
+                elif item.name.lower().endswith('.json'):
+                    jsons.append(item.name)
+        entry = {"mtime_ns": mtime_ns, "textures": sorted(textures), "subfolders": sorted(subfolders), "jsons": sorted(jsons)}
+
+    json_stats = []
+    for name in entry["jsons"]:
+        json_path = os.path.join(path, name)
+        try:
+            json_stats.append((json_path, os.stat(json_path)))
+        except OSError:
+            continue
+    return entry, json_stats
+
+
+def _under(path, root):
+    return path == root or path.startswith(os.path.join(root, ""))
+
+
+def scan_library(
+    roots,
+    cache_path=None,
+    metadata_cache=megascans_metadata.metadata_cache,
+    max_threads=SCAN_THREADS,
+    max_workers=None,
+    progress_callback=None,
+):
+    """
+    Scans every folder under roots and returns a LibraryFolder per folder
+    holding texture files, sorted by root then path, with the merged
+    metadata of the folder's Megascans JSON files.
+
+    progress_callback(stage, done, total, path) is called with stage
+    "scan" per folder read and "metadata" per JSON parsed; returning False
+    from it cancels the ingest and None is returned, raising from it (e.g.
+    hou.OperationInterrupted) cancels and re-raises. Either way pending
+    work is dropped and what was already read is saved to both caches.
+    """
+    roots = [(root, os.path.abspath(root)) for root in roots]
+    cache = _load_cache(cache_path) if cache_path else {}
+    folders = {}
+    json_stats = {}
+    metadata = {}
+    scanned = False
+
+    try:
+        if not _scan_folders(roots, cache, folders, json_stats, max_threads, progress_callback):
+            return None
+        scanned = True
+
+        unparsed = []
+        for path in sorted(json_stats):
+            for json_path, stat in json_stats[path]:
+                metadata[json_path] = metadata_cache.lookup(json_path, stat)
+                if metadata[json_path] is None:
+                    unparsed.append((json_path, stat))
+
+        total = len(unparsed)
+        if total >= PARALLEL_JSON_MIN:
+            with worker_pool.process_pool(max_workers) as pool:
+                try:
+                    parsed = pool.map(megascans_metadata.read_metadata, [json_path for json_path, _ in unparsed], chunksize=8)
+                    if not _record_metadata(metadata_cache, metadata, zip(unparsed, parsed), total, progress_callback):
+                        return None
+                finally:
+                    # Drops queued chunks on cancel; only running ones finish
+                    pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            parsed = (megascans_metadata.read_metadata(json_path) for json_path, _ in unparsed)
+            if not _record_metadata(metadata_cache, metadata, zip(unparsed, parsed), total, progress_callback):
+                return None
+    finally:
+        metadata_cache.save()
+        if cache_path:
+            # A finished folder scan also forgets folders under the roots that no longer exist
+            merged = {
+                path: entry for path, entry in cache.items()
+                if not (scanned and any(_under(path, root) for _, root in roots))
+            }
+            merged.update(folders)
+            _save_cache(cache_path, merged)
+
+    library = []
+    listed = set()
+    for raw_root, root in roots:
+        for path in sorted(path for path in folders if _under(path, root) and path not in listed):
+            listed.add(path)
+            entry = folders[path]
+            if entry["textures"]:
+                folder_metadata = megascans_metadata.merge_metadata(
+                    metadata[json_path] for json_path, _ in json_stats[path] if metadata.get(json_path)
+                )
+                library.append(LibraryFolder(raw_root, path, tuple(entry["textures"]), folder_metadata))
+    return library
+
+
+def _scan_folders(roots, cache, folders, json_stats, max_threads, progress_callback):
+    """
+    Reads every folder under roots into folders / json_stats on a thread
+    pool. False when the callback cancels; an exception from it cancels
+    the queued folders and propagates.
+    """
+    with ThreadPoolExecutor(max_workers=max_threads) as threads:
+        pending = {}
+        queued = set()
+
+        def queue(path):
+            if path not in queued:
+                queued.add(path)
+                pending[threads.submit(_scan_folder, path, cache.get(path))] = path
+
+        try:
+            for _, root in roots:
+                if os.path.isdir(root):
+                    queue(root)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        folders[path], json_stats[path] = future.result()
+                    except OSError:
+                        continue
+                    for subfolder in folders[path]["subfolders"]:
+                        queue(subfolder)
+                    if progress_callback and progress_callback("scan", len(folders), len(folders) + len(pending), path) is False:
+                        return False
+        finally:
+            for other in pending:
+                other.cancel()
+    return True
+
+
+def _record_metadata(metadata_cache, metadata, results, total, progress_callback):
+    """Stores parsed metadata in the cache; False when the callback cancels."""
+    for done, ((json_path, stat), item) in enumerate(results, 1):
+        metadata[json_path] = item
+        metadata_cache.store(json_path, stat, item)
+        if progress_callback and progress_callback("metadata", done, total, json_path) is False:
+            return False
+    return True
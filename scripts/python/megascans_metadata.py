@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import threading
+from collections import namedtuple
+
+# ijson streams the file and lets parsing stop once every field is found;
+# without it the whole document is loaded with the json module.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# -----------------------------------------------------------------------------
+# Megascans JSON metadata for the material builders (createOctaneMaterial,
+# createRedshiftMaterial, createSolarisMaterials, material_library)
+#
+# Only a few fields are read: "meta" items ({"key": ..., "value": ...}) for
+# height, scan area and tileability, plus the first category. Results are
+# cached per file while its mtime and size match, in memory and in
+# $HOUDINI_USER_PREF_DIR/ax_megascans_metadata.json, so rebuilding a folder
+# doesn't reopen its JSON. No hou imports: read_metadata runs in workers.
+# -----------------------------------------------------------------------------
+
+CACHE_FILE_NAME = "ax_megascans_metadata.json"
+CACHE_VERSION = 1
+
+# height: displacement scale as written in the file (first number of "0.02 m")
+# physical_size: (width, height) in meters from the scan area, e.g. "2x2 m"
+# tileable: bool, category: first Megascans category ("surface", "3d", ...)
+MegascansMetadata = namedtuple(
+    "MegascansMetadata", ["height", "physical_size", "tileable", "category"], defaults=(None, None, None, None)
+)
+
+_META_FIELDS = {
+    "height": "height",
+    "scanArea": "physical_size",
+    "physicalSize": "physical_size",
+    "tileable": "tileable",
+}
+_UNIT_SCALE = {"mm": 0.001, "cm": 0.01, "m": 1.0}
+_NUMBER = re.compile(r"([0-9]*\.?[0-9]+)")
+
+
+def _parse_height(value):
+    match = _NUMBER.search(str(value)) if value else None
+    return float(match.group(1)) if match else None
+
+
+def _parse_size(value):
+    numbers = [float(n) for n in _NUMBER.findall(str(value))]
+    if not numbers:
+        return None
+    unit = re.search(r"(mm|cm|m)\s*$", str(value).strip())
+    scale = _UNIT_SCALE[unit.group(1)] if unit else 1.0
+    width, height = (numbers + numbers)[:2]
+    return (width * scale, height * scale)
+
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "yes", "1")
+    return bool(value)
+
+
+_PARSERS = {"height": _parse_height, "physical_size": _parse_size, "tileable": _parse_bool}
+
+
+class _Collector:
+    """Keeps the first value seen for each field, in document order."""
+
+    def __init__(self):
+        self.fields = {}
+        self.asset_type = None
+
+    def meta_item(self, key, value):
+        field = _META_FIELDS.get(key)
+        if field and field not in self.fields:
+            parsed = _PARSERS[field](value)
+            if parsed is not None:
+                self.fields[field] = parsed
+
+    def category(self, value):
+        if value and "category" not in self.fields:
+            self.fields["category"] = str(value)
+
+    def complete(self):
+        return len(self.fields) == len(MegascansMetadata._fields)
+
+    def result(self):
+        if "category" not in self.fields and self.asset_type:
+            self.fields["category"] = self.asset_type
+        return MegascansMetadata(**self.fields)
+
+
+def _scalar(value):
+    return float(value) if type(value).__name__ == "Decimal" else value
+
+
+def _collect_events(f, collector):
+    """Feeds ijson parse events, stopping as soon as every field is found."""
+    maps = []  # [items, pending key] per open JSON object
+    for prefix, event, value in ijson.parse(f):
+        if event == "start_map":
+            maps.append([{}, None])
+        elif event == "end_map":
+            items = maps.pop()[0]
+            if "key" in items and "value" in items:
+                collector.meta_item(items["key"], items["value"])
+                if collector.complete():
+                    return
+        elif event == "map_key":
+            maps[-1][1] = value
+        elif event in ("string", "number", "boolean"):
+            if prefix == "categories.item":
+                collector.category(value)
+            elif prefix == "semanticTags.asset_type":
+                collector.asset_type = value
+            elif maps and maps[-1][1] in ("key", "value"):
+                maps[-1][0][maps[-1][1]] = _scalar(value)
+
+
+def _collect_tree(obj, collector):
+    """Walks a loaded document in the same order as _collect_events."""
+    if isinstance(obj, dict):
+        for value in obj.values():
+            _collect_tree(value, collector)
+        if "key" in obj and "value" in obj:
+            collector.meta_item(obj.get("key"), obj.get("value"))
+    elif isinstance(obj, list):
+        for item in obj:
+            _collect_tree(item, collector)
+
+
+def read_metadata(path):
+    """Reads the metadata of one Megascans JSON file; unreadable files give empty metadata."""
+    collector = _Collector()
+    try:
+        if ijson is not None:
+            with open(path, "rb") as f:
+                _collect_events(f, collector)
+        else:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                for category in data.get("categories") or ():
+                    collector.category(category)
+                    break
+                semantic_tags = data.get("semanticTags")
+                if isinstance(semantic_tags, dict):
+                    collector.asset_type = semantic_tags.get("asset_type")
+            _collect_tree(data, collector)
+    except Exception:
+        pass
+    return collector.result()
+
+
+def merge_metadata(items):
+    """One MegascansMetadata taking each field from the first item that has it."""
+    fields = {}
+    for item in items:
+        for field, value in item._asdict().items():
+            if value is not None:
+                fields.setdefault(field, value)
+    return MegascansMetadata(**fields)
+
+
+def json_files(folder):
+    """Sorted paths of the .json files directly in folder."""
+    try:
+        with os.scandir(folder) as entries:
+            return sorted(entry.path for entry in entries if entry.name.lower().endswith('.json') and entry.is_file())
+    except OSError:
+        return []
+
+
+class MetadataCache:
+    """
+    Metadata keyed by normalized path, valid while mtime and size match.
+    With a cache_path the entries are loaded from and saved to that JSON
+    file, so they survive between sessions.
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self._entries = None  # path -> [mtime_ns, size, MegascansMetadata fields...]
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self._entries = data.get("files", {})
+
+    def lookup(self, path, stat):
+        """Cached metadata for path if the entry matches stat, else None."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(os.path.normcase(os.path.abspath(path)))
+        if entry is None or entry[:2] != [stat.st_mtime_ns, stat.st_size]:
+            return None
+        fields = entry[2:]
+        if fields[1] is not None:
+            fields[1] = tuple(fields[1])
+        return MegascansMetadata(*fields)
+
+    def store(self, path, stat, metadata):
+        with self._lock:
+            self._load()
+            self._entries[os.path.normcase(os.path.abspath(path))] = [stat.st_mtime_ns, stat.st_size] + list(metadata)
+            self._dirty = True
+
+    def read(self, path):
+        """Metadata of one JSON file, parsed only when it changed since it was cached."""
+        stat = os.stat(path)
+        metadata = self.lookup(path, stat)
+        if metadata is None:
+            metadata = read_metadata(path)
+            self.store(path, stat, metadata)
+        return metadata
+
+    def folder_metadata(self, folder):
+        """Merged metadata of the JSON files in folder (sorted by name); saves new entries."""
+        items = []
+        for path in json_files(folder):
+            try:
+                items.append(self.read(path))
+            except OSError:
+                continue
+        self.save()
+        return merge_metadata(items)
+
+    def save(self):
+        with self._lock:
+            if not (self._dirty and self.cache_path):
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            temp_path = self.cache_path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"version": CACHE_VERSION, "files": self._entries}, f)
+            os.replace(temp_path, self.cache_path)
+            self._dirty = False
+
+
+_pref_dir = os.environ.get("HOUDINI_USER_PREF_DIR")
+metadata_cache = MetadataCache(os.path.join(_pref_dir, CACHE_FILE_NAME) if _pref_dir else None)
+
+
+def folder_metadata(folder):
+    """Cached MegascansMetadata for the Megascans JSON files in a texture folder."""
+    return metadata_cache.folder_metadata(folder)
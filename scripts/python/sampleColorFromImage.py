@@ -1,8 +1,9 @@
 import hou
 import os
-import colorsys
-import random
 from PIL import Image, ImageDraw
+import image_sampling
+import color_palette
+import batch_palettes
 from functools import partial
 from PySide2 import QtCore, QtGui, QtWidgets
 
@@ -13,39 +14,52 @@ def resolve_path(path):
     except Exception:
         return os.path.normpath(path)
 
-def sample_image_colors(image_path, num_samples=9, mode="default", seed=1):
-    random.seed(seed)
-    img = Image.open(image_path).convert("RGB")
-    width, height = img.size
+# Keep-masks per mode over vectorized saturation/value arrays
+MODE_FILTERS = {
+    "dark": lambda s, v: v < 0.4,
+    "bright": lambda s, v: v > 0.6,
+    "muted": lambda s, v: s < 0.4,
+    "deep": lambda s, v: (s > 0.6) & (v < 0.5),
+}
+
+# Palette methods offered in the UI; "samples", the original random-sample picker, stays the default
+METHOD_LABELS = dict(samples="Random Samples", **color_palette.PALETTE_LABELS)
+
+def sample_image_colors(image_path, num_samples=9, mode="default", seed=1, method="samples", sampling="random"):
+    pixels = image_sampling.load_rgb_array(image_path)
+    if method not in color_palette.PALETTE_METHODS:
+        return sample_random_colors(pixels, num_samples, mode, seed, sampling)
+
+    mask = None
+    if mode in MODE_FILTERS:
+        mask = lambda rgb: MODE_FILTERS[mode](*image_sampling.saturation_value(rgb))
+    colors, sample_positions = color_palette.image_palette(pixels, num_samples, method, seed, mask)
+    if not colors:
+        colors, sample_positions = color_palette.image_palette(pixels, num_samples, method, seed)
+
+    count = len(colors)
+    positions = [i / (count - 1) if count > 1 else 0.5 for i in range(count)]
+    return list(zip(positions, colors)), sample_positions
+
+def sample_random_colors(pixels, num_samples=9, mode="default", seed=1, sampling="random"):
+    height, width = pixels.shape[:2]
 
     sample_count = max(300, num_samples * 10)
-    sampled = []
-    positions_sampled = []
-
-    for _ in range(sample_count):
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        r, g, b = img.getpixel((x, y))
-        rgb = (r / 255.0, g / 255.0, b / 255.0)
-
-        if mode != "random":
-            h, s, v = colorsys.rgb_to_hsv(*rgb)
-            if mode == "dark" and v >= 0.4:
-                continue
-            elif mode == "bright" and v <= 0.6:
-                continue
-            elif mode == "muted" and s >= 0.4:
-                continue
-            elif mode == "deep" and not (s > 0.6 and v < 0.5):
-                continue
-
-        sampled.append(rgb)
-        positions_sampled.append((x, y))
+    xs, ys, rgb, rng = image_sampling.sample_pixels(pixels, seed, sample_count, sampling)
+
+    if mode in MODE_FILTERS:
+        keep = MODE_FILTERS[mode](*image_sampling.saturation_value(rgb))
+        xs, ys, rgb = xs[keep], ys[keep], rgb[keep]
+
+    sampled = [tuple(c) for c in rgb.tolist()]
+    positions_sampled = list(zip(xs.tolist(), ys.tolist()))
 
     if not sampled:
-        sampled = [(r / 255.0, g / 255.0, b / 255.0) for _ in range(num_samples)
-                   for r, g, b in [img.getpixel((random.randint(0, width - 1), random.randint(0, height - 1)))]]
-        positions_sampled = [(random.randint(0, width - 1), random.randint(0, height - 1)) for _ in range(num_samples)]
+        sampled = []
+        for _ in range(num_samples):
+            x, y = rng.randint(0, width - 1), rng.randint(0, height - 1)
+            sampled.append(tuple((pixels[y, x] / 255.0).tolist()))
+        positions_sampled = [(rng.randint(0, width - 1), rng.randint(0, height - 1)) for _ in range(num_samples)]
 
     unique = []
     unique_positions = []
@@ -109,6 +123,73 @@ def create_color_ramp(colors):
     color_node.parm("ramp").set(ramp)
     return color_node
 
+PREVIEW_SIZE = 400
+
+def draw_sample_markers(image, sample_positions, sampled_colors, source_size):
+    """Paints the sample markers onto a preview image of the source at source_size (w, h)."""
+    radius = 30
+    stroke = 35
+    scale_x = image.width / source_size[0]
+    scale_y = image.height / source_size[1]
+
+    draw = ImageDraw.Draw(image)
+    for (x, y), (_, rgb) in zip(sample_positions, sampled_colors):
+        px = int(x * scale_x)
+        py = int(y * scale_y)
+        fill_color = tuple(int(c * 255) for c in rgb)
+        draw.ellipse((px - stroke, py - stroke, px + stroke, py + stroke), fill="white")        # outer
+        draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill=fill_color)     # inner
+    return image
+
+def to_qimage(image):
+    """Detached QImage copy of a PIL RGB image (safe to build off the GUI thread)."""
+    data = image.tobytes("raw", "RGB")
+    return QtGui.QImage(data, image.width, image.height, image.width * 3, QtGui.QImage.Format_RGB888).copy()
+
+class PreviewSignals(QtCore.QObject):
+    # job id, preview QImage, sampled colors, sample positions, final (high quality) pass
+    ready = QtCore.Signal(int, object, object, object, bool)
+    failed = QtCore.Signal(int, str)
+
+class PreviewJob(QtCore.QRunnable):
+    """
+    Samples the image and renders the marked preview off the Qt thread.
+    A nearest-neighbour preview is sent first when the filtered thumbnail
+    isn't cached yet, then the LANCZOS one. The job bails out between steps
+    once is_current() says a newer job has been queued.
+    """
+
+    def __init__(self, job_id, params, is_current, signals):
+        super(PreviewJob, self).__init__()
+        self.job_id = job_id
+        self.params = params
+        self.is_current = is_current
+        self.signals = signals
+
+    def run(self):
+        image_path, num_samples, mode, seed, method, sampling = self.params
+        try:
+            pixels = image_sampling.load_rgb_array(image_path)
+            if not self.is_current():
+                return
+            sampled_colors, sample_positions = sample_image_colors(image_path, num_samples, mode, seed, method, sampling)
+            source_size = (pixels.shape[1], pixels.shape[0])
+
+            if image_sampling.image_cache.peek(image_path, PREVIEW_SIZE) is None:
+                if not self.is_current():
+                    return
+                fast = Image.fromarray(image_sampling.nearest_preview(pixels, PREVIEW_SIZE))
+                draw_sample_markers(fast, sample_positions, sampled_colors, source_size)
+                self.signals.ready.emit(self.job_id, to_qimage(fast), sampled_colors, sample_positions, False)
+
+            if not self.is_current():
+                return
+            final = Image.fromarray(image_sampling.load_preview_array(image_path, PREVIEW_SIZE)).copy()
+            draw_sample_markers(final, sample_positions, sampled_colors, source_size)
+            self.signals.ready.emit(self.job_id, to_qimage(final), sampled_colors, sample_positions, True)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+
 class ImageRampUI(QtWidgets.QDialog):
     def __init__(self, parent=None):
         super(ImageRampUI, self).__init__(parent or hou.ui.mainQtWindow())
@@ -118,11 +199,24 @@ class ImageRampUI(QtWidgets.QDialog):
         self.image_path = ""
         self.num_samples = 9
         self.mode = "default"
+        self.method = "samples"
+        self.sampling = "random"
         self.seed = 1
         self.sampled_colors = []
         self.sample_positions = []
         self.original_pixmap = None
 
+        # Preview jobs run one at a time; a newer job id makes older ones stale
+        self._preview_pool = QtCore.QThreadPool(self)
+        self._preview_pool.setMaxThreadCount(1)
+        self._preview_job_id = 0
+        self._preview_done_id = 0
+        self._swatches_job_id = 0
+        # Owned by the dialog so queued results outlive the finished runnable
+        self._preview_signals = PreviewSignals(self)
+        self._preview_signals.ready.connect(self.on_preview_ready)
+        self._preview_signals.failed.connect(self.on_preview_failed)
+
         self.image_preview = QtWidgets.QLabel()
         self.image_preview.setAlignment(QtCore.Qt.AlignCenter)
         self.image_preview.setScaledContents(False)
@@ -164,6 +258,27 @@ class ImageRampUI(QtWidgets.QDialog):
             mode_layout.addWidget(btn)
         layout.addLayout(mode_layout)
 
+        method_layout = QtWidgets.QHBoxLayout()
+        method_layout.addWidget(QtWidgets.QLabel("Palette Method:"))
+        self.method_combo = QtWidgets.QComboBox()
+        for method, label in METHOD_LABELS.items():
+            self.method_combo.addItem(label, method)
+        self.method_combo.setCurrentIndex(self.method_combo.findData(self.method))
+        self.method_combo.currentIndexChanged.connect(self.set_method)
+        method_layout.addWidget(self.method_combo)
+        layout.addLayout(method_layout)
+
+        # Only used by the Random Samples method; palettes read a regular grid
+        sampling_layout = QtWidgets.QHBoxLayout()
+        sampling_layout.addWidget(QtWidgets.QLabel("Sampling:"))
+        self.sampling_combo = QtWidgets.QComboBox()
+        for pattern, label in image_sampling.SAMPLING_LABELS.items():
+            self.sampling_combo.addItem(label, pattern)
+        self.sampling_combo.currentIndexChanged.connect(self.set_sampling)
+        self.sampling_combo.setEnabled(self.method not in color_palette.PALETTE_METHODS)
+        sampling_layout.addWidget(self.sampling_combo)
+        layout.addLayout(sampling_layout)
+
         file_layout = QtWidgets.QHBoxLayout()
         file_btn = QtWidgets.QPushButton("Select Image")
         file_btn.clicked.connect(self.select_image)
@@ -183,6 +298,11 @@ class ImageRampUI(QtWidgets.QDialog):
         self.generate_btn.clicked.connect(self.generate_ramp)
         layout.addWidget(self.generate_btn)
 
+        self.batch_btn = QtWidgets.QPushButton("Batch Folder to Swatches...")
+        self.batch_btn.setToolTip("Write an .ase palette for every image in a folder using the current settings")
+        self.batch_btn.clicked.connect(self.batch_folder)
+        layout.addWidget(self.batch_btn)
+
         self.setLayout(layout)
 
     def update_slider_label(self, value):
@@ -202,11 +322,20 @@ class ImageRampUI(QtWidgets.QDialog):
         self.mode_buttons[mode].setStyleSheet("background-color: lightblue")
         self.update_preview()
 
+    def set_method(self, index):
+        self.method = self.method_combo.itemData(index)
+        self.sampling_combo.setEnabled(self.method not in color_palette.PALETTE_METHODS)
+        self.update_preview()
+
+    def set_sampling(self, index):
+        self.sampling = self.sampling_combo.itemData(index)
+        self.update_preview()
+
     def select_image(self):
         path = hou.ui.selectFile(
             title="Select Image File",
             file_type=hou.fileType.Image,
-            pattern="*.png *.jpg *.jpeg *.tif *.tiff *.exr"
+            pattern="*.png *.jpg *.jpeg *.tif *.tiff *.tx *.exr *.hdr"
         )
         if path:
             resolved = resolve_path(path)
@@ -228,55 +357,53 @@ class ImageRampUI(QtWidgets.QDialog):
     def update_preview(self):
         if not self.image_path:
             return
-        try:
-            img = Image.open(self.image_path).convert("RGB")
-            self.sampled_colors, self.sample_positions = sample_image_colors(
-                self.image_path, self.num_samples, self.mode, self.seed
-            )
+        # Drop queued jobs that never started; a running one stops at its next check
+        self._preview_pool.clear()
+        self._preview_job_id += 1
+        job_id = self._preview_job_id
+        job = PreviewJob(
+            job_id,
+            (self.image_path, self.num_samples, self.mode, self.seed, self.method, self.sampling),
+            lambda: job_id == self._preview_job_id,
+            self._preview_signals,
+        )
+        self._preview_pool.start(job)
 
-            img_qt = img.copy()
-            max_width = 400
-            max_height = 400
-            img_qt.thumbnail((max_width, max_height), Image.LANCZOS)
-            radius = 30
-            stroke = 35
-            scale_x = img_qt.width / img.width
-            scale_y = img_qt.height / img.height
-
-            draw = ImageDraw.Draw(img_qt)
-            for (x, y), (_, rgb) in zip(self.sample_positions, self.sampled_colors):
-                px = int(x * scale_x)
-                py = int(y * scale_y)
-                fill_color = tuple(int(c * 255) for c in rgb)
-                draw.ellipse((px - stroke, py - stroke, px + stroke, py + stroke), fill="white")        # outer
-                draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill=fill_color)     # inner
-
-            data = img_qt.tobytes("raw", "RGB")
-            qimg = QtGui.QImage(data, img_qt.width, img_qt.height, QtGui.QImage.Format_RGB888)
-            pixmap = QtGui.QPixmap.fromImage(qimg)
-            self.original_pixmap = pixmap
-
-            scaled_pixmap = pixmap.scaled(
-                self.image_preview.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
-            )
-            self.image_preview.setPixmap(scaled_pixmap)
+    def on_preview_ready(self, job_id, qimg, sampled_colors, sample_positions, final):
+        if job_id != self._preview_job_id:
+            return
+        if final:
+            self._preview_done_id = job_id
+        self.sampled_colors, self.sample_positions = sampled_colors, sample_positions
 
-            while self.color_swatches_layout.count():
-                child = self.color_swatches_layout.takeAt(0)
-                if child.widget():
-                    child.widget().deleteLater()
-
-            for _, color in self.sampled_colors:
-                swatch = QtWidgets.QLabel()
-                swatch.setFixedSize(24, 24)
-                swatch.setStyleSheet(
-                    f"background-color: rgb({int(color[0]*255)}, {int(color[1]*255)}, {int(color[2]*255)}); "
-                    "border: 1px solid black;"
-                )
-                self.color_swatches_layout.addWidget(swatch)
+        pixmap = QtGui.QPixmap.fromImage(qimg)
+        self.original_pixmap = pixmap
 
-        except Exception as e:
-            hou.ui.displayMessage(f"Error loading preview: {e}", severity=hou.severityType.Error)
+        transform = QtCore.Qt.SmoothTransformation if final else QtCore.Qt.FastTransformation
+        scaled_pixmap = pixmap.scaled(self.image_preview.size(), QtCore.Qt.KeepAspectRatio, transform)
+        self.image_preview.setPixmap(scaled_pixmap)
+
+        # Both passes of a job carry the same colors; build the swatches once
+        if self._swatches_job_id == job_id:
+            return
+        self._swatches_job_id = job_id
+        while self.color_swatches_layout.count():
+            child = self.color_swatches_layout.takeAt(0)
+            if child.widget():
+                child.widget().deleteLater()
+
+        for _, color in self.sampled_colors:
+            swatch = QtWidgets.QLabel()
+            swatch.setFixedSize(24, 24)
+            swatch.setStyleSheet(
+                f"background-color: rgb({int(color[0]*255)}, {int(color[1]*255)}, {int(color[2]*255)}); "
+                "border: 1px solid black;"
+            )
+            self.color_swatches_layout.addWidget(swatch)
+
+    def on_preview_failed(self, job_id, message):
+        if job_id == self._preview_job_id:
+            hou.ui.displayMessage(f"Error loading preview: {message}", severity=hou.severityType.Error)
 
     def resizeEvent(self, event):
         super(ImageRampUI, self).resizeEvent(event)
@@ -287,6 +414,15 @@ class ImageRampUI(QtWidgets.QDialog):
             self.image_preview.setPixmap(scaled_pixmap)
 
     def generate_ramp(self):
+        if self.image_path and self._preview_done_id != self._preview_job_id:
+            # The preview is still catching up; sample the current settings directly
+            try:
+                self.sampled_colors, self.sample_positions = sample_image_colors(
+                    self.image_path, self.num_samples, self.mode, self.seed, self.method, self.sampling
+                )
+            except Exception as e:
+                hou.ui.displayMessage(f"Error loading image: {e}", severity=hou.severityType.Error)
+                return
         if not self.image_path or not self.sampled_colors:
             hou.ui.displayMessage("No image or sampled colors", severity=hou.severityType.Warning)
             return
@@ -296,6 +432,48 @@ class ImageRampUI(QtWidgets.QDialog):
         except Exception as e:
             hou.ui.displayMessage(f"Failed to create ramp: {e}", severity=hou.severityType.Error)
 
+    def batch_folder(self):
+        # Batch output is always a palette; with Random Samples selected, ask which method to use
+        method = self.method
+        if method not in color_palette.PALETTE_METHODS:
+            labels = tuple(color_palette.PALETTE_LABELS[name] for name in color_palette.PALETTE_METHODS)
+            choice = hou.ui.displayMessage(
+                "Batch extraction writes palettes. Which palette method should it use?",
+                buttons=labels + ("Cancel",), close_choice=len(labels), title="Batch Palette Method",
+            )
+            if choice == len(labels):
+                return
+            method = color_palette.PALETTE_METHODS[choice]
+
+        folder = hou.ui.selectFile(title="Select Image Folder", file_type=hou.fileType.Directory)
+        if not folder:
+            return
+        folder = resolve_path(folder)
+
+        try:
+            with hou.InterruptableOperation(
+                "Extracting palettes", long_operation_name="Batch palette extraction", open_interrupt_dialog=True
+            ) as operation:
+                def progress(done, total, rel_path):
+                    operation.updateLongProgress(done / float(total), f"{done}/{total}  {rel_path}")
+
+                manifest = batch_palettes.batch_extract_palettes(
+                    folder, count=self.num_samples, method=method, seed=self.seed, progress_callback=progress
+                )
+        except hou.OperationInterrupted:
+            hou.ui.displayMessage("Batch palette extraction cancelled; palettes already written are kept.")
+            return
+        except Exception as e:
+            hou.ui.displayMessage(f"Batch palette extraction failed: {e}", severity=hou.severityType.Error)
+            return
+
+        message = f"Wrote {len(manifest['images'])} palettes to:\n{os.path.join(folder, 'palettes')}"
+        if manifest["errors"]:
+            failed = "\n".join(f"{path}: {error}" for path, error in sorted(manifest["errors"].items()))
+            hou.ui.displayMessage(message, severity=hou.severityType.Warning, details=failed)
+        else:
+            hou.ui.displayMessage(message)
+
 def show_image_ramp_ui():
     ui = ImageRampUI()
     ui.show()
@@ -1,67 +1,95 @@
 import hou
 import os
-import random
-from PIL import Image, ImageQt, ImageDraw
-import colorsys
+import numpy as np
+from PIL import Image, ImageQt
+import image_sampling
+import color_palette
 from PySide6 import QtWidgets, QtGui, QtCore
 
 # -----------------------------------------------------------------------------
 # CORE LOGIC (No UI)
 # -----------------------------------------------------------------------------
 
+# Keep-masks per filter mode over vectorized saturation/value arrays
+FILTER_MODES = {
+    "bright": lambda s, v: v > 0.7,
+    "dark": lambda s, v: v < 0.3,
+    "muted": lambda s, v: s < 0.3,
+    "deep": lambda s, v: (s > 0.6) & (v < 0.5),
+}
+
+def filter_mask(rgb, filter_mode):
+    """Boolean mask of the (n, 3) float colors passing the filter mode."""
+    if filter_mode not in FILTER_MODES:
+        return np.ones(len(rgb), dtype=bool)
+    return FILTER_MODES[filter_mode](*image_sampling.saturation_value(rgb))
+
+# Candidates drawn for the "samples" method; the even patterns need far fewer
+CANDIDATE_COUNTS = {"random": 10000, "stratified": 1024, "poisson": 1024}
+
+def pick_colors(pixels, num_samples, seed, filter_mode, method="samples", sampling="random"):
+    """
+    Picks the ramp colors from an image array. method is one of the
+    color_palette methods, or "samples" for the original random picks, whose
+    candidates follow the image_sampling pattern given by sampling.
+    Returns a list of (x, y, (r, g, b)) with colors in the 0-1 range,
+    ordered as they go on the ramp.
+    """
+    if method in color_palette.PALETTE_METHODS:
+        colors, positions = color_palette.image_palette(
+            pixels, num_samples, method, seed, mask=lambda rgb: filter_mask(rgb, filter_mode)
+        )
+        return [(x, y, rgb) for (x, y), rgb in zip(positions, colors)]
+
+    candidate_count = CANDIDATE_COUNTS.get(sampling, CANDIDATE_COUNTS["random"])
+    xs, ys, rgb, rng = image_sampling.sample_pixels(pixels, seed, candidate_count, sampling)
+    keep = filter_mask(rgb, filter_mode)
+    xs, ys, rgb = xs[keep], ys[keep], rgb[keep]
+    if not len(rgb):
+        return []
+
+    # Picks depend only on the candidate count, so indices match random.sample over the colors
+    picks = rng.sample(range(len(rgb)), min(num_samples, len(rgb)))
+    picked = [(x, y, tuple(c)) for x, y, c in zip(xs[picks].tolist(), ys[picks].tolist(), rgb[picks].tolist())]
+    picked.sort(key=lambda item: sum(item[2]))
+    return picked
+
 def sample_image_colors_to_ramp(
     hda_node,
     image_parm="image_path",
     ramp_parm="ramp",
     samples_parm="samples",
     seed_parm="seed",
-    filter_parm="filter_mode"
+    filter_parm="filter_mode",
+    method_parm="palette_method",
+    sampling_parm="sampling"
 ):
     # (Same code as before for the ramp generation logic...)
     image_path = os.path.expandvars(hda_node.parm(image_parm).eval())
     num_samples = max(1, int(hda_node.parm(samples_parm).eval()))
     seed = int(hda_node.parm(seed_parm).eval())
     filter_mode = hda_node.parm(filter_parm).evalAsString()
+    # HDA versions without the palette method parm keep the original random picks
+    method = hda_node.parm(method_parm).evalAsString() if hda_node.parm(method_parm) else "samples"
+    sampling = hda_node.parm(sampling_parm).evalAsString() if hda_node.parm(sampling_parm) else "random"
 
     if not os.path.exists(image_path):
         hou.ui.displayMessage(f"Image not found:\n{image_path}")
         return
 
     try:
-        image = Image.open(image_path).convert("RGB")
+        pixels = image_sampling.load_rgb_array(image_path)
     except Exception as e:
         hou.ui.displayMessage(f"Failed to load image:\n{str(e)}")
         return
 
-    width, height = image.size
-    random.seed(seed)
-
-    candidate_count = 10000
-    sampled_pixels = [
-        image.getpixel((random.randint(0, width - 1), random.randint(0, height - 1)))
-        for _ in range(candidate_count)
-    ]
-
-    def rgb_to_hsv(rgb):
-        return colorsys.rgb_to_hsv(*(c / 255.0 for c in rgb))
-
-    def passes_filter(rgb):
-        h, s, v = rgb_to_hsv(rgb)
-        if filter_mode == "bright": return v > 0.7
-        elif filter_mode == "dark": return v < 0.3
-        elif filter_mode == "muted": return s < 0.3
-        elif filter_mode == "deep": return s > 0.6 and v < 0.5
-        else: return True
+    picked = pick_colors(pixels, num_samples, seed, filter_mode, method, sampling)
 
-    filtered = [rgb for rgb in sampled_pixels if passes_filter(rgb)]
-
-    if not filtered:
+    if not picked:
         hou.ui.displayMessage(f"No pixels matched filter '{filter_mode}'.")
         return
 
-    final_colors = random.sample(filtered, min(num_samples, len(filtered)))
-    final_colors = [[c / 255.0 for c in color] for color in final_colors]
-    final_colors.sort(key=lambda rgb: sum(rgb))
+    final_colors = [list(rgb) for _, _, rgb in picked]
 
     positions = [float(i) / (len(final_colors) - 1) if len(final_colors) > 1 else 0.5 for i in range(len(final_colors))]
     bases = [hou.rampBasis.Linear] * len(final_colors)
@@ -78,6 +106,9 @@ def sample_image_colors_to_ramp(
 
 preview_window_instance = None
 
+# Longest edge of the image drawn in the preview window
+PREVIEW_MAX_SIZE = 2048
+
 def show_image_preview_with_markers(hda_node):
     global preview_window_instance
 
@@ -97,7 +128,8 @@ def show_image_preview_with_markers(hda_node):
 
             # Data containers
             self.cached_image_path = None
-            self.original_image = None # PIL Image
+            self.original_image = None # PIL Image (downsampled for display)
+            self.image_size = None     # Full-resolution (width, height) the samples refer to
             self.sampled_data = []     # List of (x, y, rgb_tuple)
 
             # UI Setup
@@ -116,6 +148,7 @@ def show_image_preview_with_markers(hda_node):
             # State tracking
             self.last_params = {
                 "image_path": None, "seed": None, "samples": None, "filter_mode": None,
+                "method": None, "sampling": None,
             }
 
             self.update_timer = QtCore.QTimer(self)
@@ -158,6 +191,10 @@ def show_image_preview_with_markers(hda_node):
                 seed = int(self.hda_node.parm("seed").eval())
                 samples = int(self.hda_node.parm("samples").eval())
                 filter_mode = self.hda_node.parm("filter_mode").evalAsString()
+                method_parm = self.hda_node.parm("palette_method")
+                method = method_parm.evalAsString() if method_parm else "samples"
+                sampling_parm = self.hda_node.parm("sampling")
+                sampling = sampling_parm.evalAsString() if sampling_parm else "random"
             except hou.ObjectWasDeleted:
                 self.update_timer.stop()
                 self.close()
@@ -167,13 +204,16 @@ def show_image_preview_with_markers(hda_node):
                 image_path != self.last_params["image_path"] or
                 seed != self.last_params["seed"] or
                 samples != self.last_params["samples"] or
-                filter_mode != self.last_params["filter_mode"]
+                filter_mode != self.last_params["filter_mode"] or
+                method != self.last_params["method"] or
+                sampling != self.last_params["sampling"]
             )
 
             if changed:
                 self.last_params.update({
                     "image_path": image_path, "seed": seed, 
                     "samples": samples, "filter_mode": filter_mode,
+                    "method": method, "sampling": sampling,
                 })
                 # Reload data and redraw
                 self.process_image_data()
@@ -195,56 +235,22 @@ def show_image_preview_with_markers(hda_node):
                 return
 
             try:
-                # Store the original PIL image
-                self.original_image = Image.open(path).convert("RGB")
+                # Decoded once per file version; seed/sample changes hit the cache
+                pixels = image_sampling.load_rgb_array(path)
+                self.original_image = Image.fromarray(image_sampling.load_preview_array(path, PREVIEW_MAX_SIZE))
             except Exception:
                 self.original_image = None
                 return
+            self.image_size = (pixels.shape[1], pixels.shape[0])
 
-            width, height = self.original_image.size
-            random.seed(seed)
-
-            # 1. Filter candidates
-            candidate_count = 10000
-            candidates = []
-            for _ in range(candidate_count):
-                cx, cy = random.randint(0, width - 1), random.randint(0, height - 1)
-                candidates.append((cx, cy, self.original_image.getpixel((cx, cy))))
-
-            def rgb_to_hsv(rgb):
-                return colorsys.rgb_to_hsv(*(c / 255.0 for c in rgb))
-
-            def passes_filter(rgb):
-                h, s, v = rgb_to_hsv(rgb)
-                if filter_mode == "bright": return v > 0.7
-                elif filter_mode == "dark": return v < 0.3
-                elif filter_mode == "muted": return s < 0.3
-                elif filter_mode == "deep": return s > 0.6 and v < 0.5
-                return True
-
-            filtered_candidates = [item for item in candidates if passes_filter(item[2])]
-
-            # 2. Pick Final Sample Points
-            # We store the coordinate (x,y) and color so we can draw it later
-            # regardless of image scale.
-            self.sampled_data = []
-            if filtered_candidates:
-                # We need random positions from the filtered set, but we want 
-                # new random positions for the visualization to match the ramp logic
-                # Ideally, we should visualize exactly what the ramp sees.
-                # For visualization purposes, let's just pick 'samples' amount of random spots
-                # that pass the filter to show where colors COULD come from.
-                
-                # To be accurate to the ramp logic:
-                # The ramp logic grabs pixel values. To visualize *location*, 
-                # we just grab random valid coordinates.
-                for _ in range(samples):
-                     # Randomly pick a valid pixel location from the filtered list
-                     # (In a real scenario, you might want spatial distribution, 
-                     # but here we pick from the pool of valid colors)
-                     import random as rnd
-                     chosen = rnd.choice(filtered_candidates)
-                     self.sampled_data.append(chosen)
+            # Same picks as sample_image_colors_to_ramp, so the markers show
+            # exactly where the ramp colors come from.
+            picked = pick_colors(
+                pixels, samples, seed, filter_mode, self.last_params["method"], self.last_params["sampling"]
+            )
+            self.sampled_data = [
+                (int(x), int(y), tuple(int(round(c * 255)) for c in rgb)) for x, y, rgb in picked
+            ]
 
         def draw_preview(self):
             """
@@ -277,11 +283,10 @@ def show_image_preview_with_markers(hda_node):
 
             # 4. Calculate coordinate translation
             # We need to know where (0,0) of the image ended up relative to the label center
-            orig_w, orig_h = self.original_image.size
+            orig_w, orig_h = self.image_size
             final_w = scaled_pixmap.width()
-            final_h = scaled_pixmap.height()
 
-            scale_factor = final_w / orig_w # Uniform scale because of KeepAspectRatio
+            scale_factor = final_w / orig_w # Uniform scale because of KeepAspectRatio; used for x and y
 
             # 5. Prepare to Draw Markers
             # We draw onto the Scaled Pixmap so the markers are crisp 
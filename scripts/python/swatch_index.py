@@ -0,0 +1,291 @@
+import os
+import math
+import sqlite3
+from collections import namedtuple
+
+import numpy as np
+
+import ase_codec
+import color_palette
+
+# -----------------------------------------------------------------------------
+# SQLite index of every swatch in the .ase libraries under a folder tree
+# (used by axtools.swatches.SwatchViewer)
+#
+# Each indexed file records its mtime and size; scan() only re-decodes files
+# that changed and drops the ones that disappeared, so reopening the panel
+# reads folders, names and colors straight from the database. Colors are
+# stored as 0-1 sRGB and CIELAB (D65) for search and nearest-color lookup.
+# -----------------------------------------------------------------------------
+
+SCHEMA_VERSION = 1
+INDEX_FILE_NAME = "ase_swatch_index.db"
+
+MATCH_METRICS = ("ciede2000", "cie76")
+# Upper bound on query x swatch distances evaluated at once
+MAX_MATCH_ELEMENTS = 1 << 20
+
+# name, 0-1 sRGB tuple, CIELAB tuple, source .ase path, group name (or None)
+IndexedSwatch = namedtuple("IndexedSwatch", ["name", "rgb", "lab", "path", "group"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    folder TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS swatches (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    grp TEXT,
+    r REAL NOT NULL, g REAL NOT NULL, b REAL NOT NULL,
+    lab_l REAL NOT NULL, lab_a REAL NOT NULL, lab_b REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_folder ON files(folder);
+CREATE INDEX IF NOT EXISTS swatches_file ON swatches(file_id, position);
+CREATE INDEX IF NOT EXISTS swatches_name ON swatches(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS swatches_lightness ON swatches(lab_l);
+"""
+
+_SWATCH_COLUMNS = "s.name, s.r, s.g, s.b, s.lab_l, s.lab_a, s.lab_b, f.path, s.grp"
+
+
+def _normpath(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _row_to_swatch(row):
+    name, r, g, b, lab_l, lab_a, lab_b, path, group = row
+    return IndexedSwatch(name, (r, g, b), (lab_l, lab_a, lab_b), path, group)
+
+
+def find_ase_files(root):
+    """{normalized path: os.stat_result} for every .ase file under root."""
+    found = {}
+    pending = [root]
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith(".ase") and entry.is_file():
+                        found[_normpath(entry.path)] = entry.stat()
+        except OSError:
+            continue
+    return found
+
+
+class SwatchIndex:
+    """
+    Connection to a swatch index database. One instance per thread: the
+    panel reads through its own instance while a background scan writes
+    through another (the database runs in WAL mode so reads don't block).
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with self._conn:
+                self._conn.executescript("DROP TABLE IF EXISTS swatches; DROP TABLE IF EXISTS files;")
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self._conn.close()
+
+    # -------------------------------------------------------------------------
+    # Updating
+    # -------------------------------------------------------------------------
+
+    def scan(self, root, progress_callback=None):
+        """
+        Brings the index up to date with the .ase files under root: files
+        whose mtime or size changed are re-decoded, new ones added and
+        missing ones removed. Files outside root are left alone.
+        progress_callback(done, total, path) is called per re-decoded file.
+        Returns (updated, removed) file counts.
+        """
+        root = _normpath(root)
+        on_disk = find_ase_files(root) if os.path.isdir(root) else {}
+        prefix = os.path.join(root, "")
+        known = {
+            path: (file_id, mtime_ns, size)
+            for file_id, path, mtime_ns, size in self._conn.execute("SELECT id, path, mtime_ns, size FROM files")
+            if path == root or path.startswith(prefix)
+        }
+
+        removed = [known[path][0] for path in known if path not in on_disk]
+        changed = [
+            (path, stat) for path, stat in sorted(on_disk.items())
+            if known.get(path, (None,))[1:] != (stat.st_mtime_ns, stat.st_size)
+        ]
+
+        if removed:
+            with self._conn:
+                self._conn.executemany("DELETE FROM files WHERE id = ?", [(file_id,) for file_id in removed])
+
+        for done, (path, stat) in enumerate(changed, 1):
+            self._index_file(path, stat)
+            if progress_callback:
+                progress_callback(done, len(changed), path)
+        return len(changed), len(removed)
+
+    def _index_file(self, path, stat):
+        error = None
+        try:
+            # Decoded directly: scanning shouldn't churn the panel's library cache
+            with open(path, "rb") as f:
+                colors = ase_codec.decode(f.read())
+        except IOError as e:
+            colors, error = (), str(e)
+        except ase_codec.AseError as e:
+            colors, error = e.colors, str(e)
+
+        lab = color_palette.srgb_to_lab([c.rgb for c in colors]).tolist() if colors else []
+        rows = [
+            (i, color.name, color.group) + tuple(color.rgb) + tuple(lab[i])
+            for i, color in enumerate(colors)
+        ]
+        with self._conn:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            file_id = self._conn.execute(
+                "INSERT INTO files (path, folder, mtime_ns, size, error) VALUES (?, ?, ?, ?, ?)",
+                (path, os.path.dirname(path), stat.st_mtime_ns, stat.st_size, error),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO swatches (file_id, position, name, grp, r, g, b, lab_l, lab_a, lab_b) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(file_id,) + row for row in rows],
+            )
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def folders(self, root):
+        """Indexed folders under root that hold at least one .ase file, sorted."""
+        root = _normpath(root)
+        prefix = os.path.join(root, "")
+        return [
+            folder for (folder,) in self._conn.execute("SELECT DISTINCT folder FROM files ORDER BY folder")
+            if folder == root or folder.startswith(prefix)
+        ]
+
+    def all_swatches(self, root=None):
+        """Every indexed swatch, optionally only from files under root."""
+        rows = self._conn.execute(
+            f"SELECT {_SWATCH_COLUMNS} FROM swatches s JOIN files f ON f.id = s.file_id ORDER BY f.path, s.position"
+        )
+        swatches = [_row_to_swatch(row) for row in rows]
+        if root is None:
+            return swatches
+        prefix = os.path.join(_normpath(root), "")
+        return [swatch for swatch in swatches if swatch.path.startswith(prefix)]
+
+    def file_swatches(self, path):
+        """The indexed swatches of one file, in file order."""
+        rows = self._conn.execute(
+            f"SELECT {_SWATCH_COLUMNS} FROM swatches s JOIN files f ON f.id = s.file_id "
+            "WHERE f.path = ? ORDER BY s.position",
+            (_normpath(path),),
+        )
+        return [_row_to_swatch(row) for row in rows]
+
+    def search(self, text, limit=500):
+        """Swatches whose name contains text (case-insensitive), across all libraries."""
+        pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        rows = self._conn.execute(
+            f"SELECT {_SWATCH_COLUMNS} FROM swatches s JOIN files f ON f.id = s.file_id "
+            "WHERE s.name LIKE ? ESCAPE '\\' ORDER BY s.name COLLATE NOCASE, f.path LIMIT ?",
+            (pattern, limit),
+        )
+        return [_row_to_swatch(row) for row in rows]
+
+    def nearest(self, rgb, limit=10, max_distance=None):
+        """
+        The indexed swatches closest to a 0-1 sRGB color by Lab Euclidean
+        distance (CIE76), nearest first. max_distance (in Lab units) narrows
+        the lookup to a lightness band served by the lab_l index.
+        Returns a list of (distance, IndexedSwatch).
+        """
+        lab_l, lab_a, lab_b = color_palette.srgb_to_lab([rgb])[0].tolist()
+        where, params = "", []
+        if max_distance is not None:
+            where = "WHERE s.lab_l BETWEEN ? AND ?"
+            params = [lab_l - max_distance, lab_l + max_distance]
+        rows = self._conn.execute(
+            f"SELECT {_SWATCH_COLUMNS}, "
+            "(s.lab_l - ?) * (s.lab_l - ?) + (s.lab_a - ?) * (s.lab_a - ?) + (s.lab_b - ?) * (s.lab_b - ?) AS d2 "
+            f"FROM swatches s JOIN files f ON f.id = s.file_id {where} ORDER BY d2 LIMIT ?",
+            [lab_l, lab_l, lab_a, lab_a, lab_b, lab_b] + params + [limit],
+        )
+        results = [(math.sqrt(row[-1]), _row_to_swatch(row[:-1])) for row in rows]
+        if max_distance is not None:
+            results = [item for item in results if item[0] <= max_distance]
+        return results
+
+
+class SwatchMatcher:
+    """
+    In-memory nearest-color search over a fixed set of swatches (a library,
+    search results or SwatchIndex.all_swatches()). The swatch Lab values are
+    kept in one array and every query batch is matched against all of them
+    in vectorized chunks, so results are exact for either metric.
+    """
+
+    def __init__(self, swatches):
+        self.swatches = list(swatches)
+        if self.swatches:
+            self._lab = color_palette.srgb_to_lab([swatch.rgb for swatch in self.swatches])
+        else:
+            self._lab = np.empty((0, 3))
+
+    def __len__(self):
+        return len(self.swatches)
+
+    def distances(self, colors, metric="ciede2000"):
+        """(len(colors), len(swatches)) distances from 0-1 sRGB colors to every swatch."""
+        if metric not in MATCH_METRICS:
+            raise ValueError(f"Unknown match metric '{metric}'")
+        query = color_palette.srgb_to_lab(np.asarray(colors, dtype=np.float64).reshape(-1, 3))
+        result = np.empty((len(query), len(self._lab)))
+        step = max(1, MAX_MATCH_ELEMENTS // max(1, len(self._lab)))
+        for start in range(0, len(query), step):
+            chunk = query[start:start + step, None, :]
+            if metric == "ciede2000":
+                result[start:start + step] = color_palette.ciede2000(chunk, self._lab[None, :, :])
+            else:
+                result[start:start + step] = np.sqrt(((chunk - self._lab[None, :, :]) ** 2).sum(axis=2))
+        return result
+
+    def nearest(self, colors, count=1, metric="ciede2000"):
+        """For each 0-1 sRGB color, its count closest swatches as [(distance, swatch), ...]."""
+        if not self.swatches:
+            return [[] for _ in colors]
+        distances = self.distances(colors, metric)
+        count = min(count, len(self.swatches))
+        results = []
+        for row in distances:
+            candidates = np.argpartition(row, count - 1)[:count] if count < len(row) else np.arange(len(row))
+            ordered = candidates[np.argsort(row[candidates], kind="stable")]
+            results.append([(float(row[i]), self.swatches[i]) for i in ordered])
+        return results
+
+    def snap(self, colors, metric="ciede2000"):
+        """The nearest swatch for every color, as [(distance, swatch), ...] in input order."""
+        if not self.swatches:
+            return []
+        distances = self.distances(colors, metric)
+        best = distances.argmin(axis=1)
+        return [(float(distances[i, j]), self.swatches[j]) for i, j in enumerate(best)]
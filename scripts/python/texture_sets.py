@@ -0,0 +1,90 @@
+import re
+import os
+
+# -----------------------------------------------------------------------------
+# Texture-set classification shared by the material builders
+# (createOctaneMaterial, createRedshiftMaterial, createSolarisMaterials)
+#
+# File stems are sanitized the way the builders always named materials
+# (runs of non-alphanumerics become "_") and split into tokens. A file
+# belongs to a channel when its trailing tokens equal the tokens of one of
+# the configured suffixes, compared case-insensitively, longest suffix
+# first; the tokens before it are the material name. The directory is
+# classified once into {material: {suffix: filename}}, so every channel
+# lookup is a dict hit and "rock" never picks up "rock_wall" files.
+# -----------------------------------------------------------------------------
+
+TEXTURE_EXTENSIONS = ('.png', '.jpg', '.tga', '.tif', '.exr')
+PREVIEW_KEYWORDS = ("Preview", "preview")
+
+_NON_ALNUM = re.compile(r'[^a-zA-Z0-9]+')
+
+
+def is_texture_file(filename):
+    """True for image files the builders pick up (preview renders excluded)."""
+    return filename.lower().endswith(TEXTURE_EXTENSIONS) and not any(p in filename for p in PREVIEW_KEYWORDS)
+
+
+def tokenize(text):
+    """Sanitized "_" tokens of a file stem or suffix, in order."""
+    return _NON_ALNUM.sub('_', text).rstrip('_').split('_')
+
+
+def suffix_table(suffixes):
+    """
+    {token count: {lowercase token tuple: [suffix, ...]}} for the configured
+    suffixes. Spellings that tokenize the same ("AO", "ao") share an entry.
+    """
+    table = {}
+    for suffix in suffixes:
+        tokens = tuple(token.lower() for token in tokenize(suffix) if token)
+        if not tokens:
+            continue
+        spellings = table.setdefault(len(tokens), {}).setdefault(tokens, [])
+        if suffix not in spellings:
+            spellings.append(suffix)
+    return table
+
+
+def classify(filename, table):
+    """
+    (material name, [matching suffixes]) for a texture file, or (None, [])
+    when its stem doesn't end in a configured suffix.
+    """
+    tokens = tokenize(os.path.splitext(filename)[0])
+    lowered = tuple(token.lower() for token in tokens)
+    for count in sorted(table, reverse=True):
+        if count >= len(tokens):
+            continue
+        spellings = table[count].get(lowered[-count:])
+        if spellings:
+            return "_".join(tokens[:-count]), spellings
+    return None, []
+
+
+def index_texture_sets(files, suffixes):
+    """
+    {material: {suffix: filename}} for the given file names. When several
+    files classify the same (e.g. .jpg and .exr), the first in sorted order
+    wins so rebuilds are stable.
+    """
+    table = suffix_table(suffixes)
+    index = {}
+    for filename in sorted(files):
+        name, spellings = classify(filename, table)
+        if not name:
+            continue
+        channels = index.setdefault(name, {})
+        for suffix in spellings:
+            channels.setdefault(suffix, filename)
+    return index
+
+
+def find_texture(index, name, texture_set):
+    """(suffix, filename) of the first suffix of texture_set present for name, else (None, None)."""
+    channels = index.get(name)
+    if channels:
+        for suffix in texture_set:
+            if suffix in channels:
+                return suffix, channels[suffix]
+    return None, None
@@ -0,0 +1,38 @@
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# -----------------------------------------------------------------------------
+# Process pools for the batch tools (batch_palettes, material_library)
+#
+# Workers are spawned in a plain Python interpreter, so worker functions must
+# live in modules that import without hou / Qt.
+# -----------------------------------------------------------------------------
+
+
+def python_executable():
+    """
+    Interpreter for the worker processes. Inside Houdini sys.executable is
+    the Houdini binary, so use the Python bundled with $HFS instead.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    hfs = os.environ.get("HFS", "")
+    version = f"{sys.version_info[0]}{sys.version_info[1]}"
+    for candidate in (
+        os.path.join(hfs, "python", "bin", "python3"),
+        os.path.join(hfs, f"python{version}", "python.exe"),
+        os.path.join(hfs, "Frameworks", "Python.framework", "Versions", "Current", "bin", "python3"),
+        os.path.join(hfs, "bin", "hython.exe" if os.name == "nt" else "hython"),
+    ):
+        if os.path.isfile(candidate):
+            return candidate
+    return sys.executable
+
+
+def process_pool(max_workers=None):
+    """A ProcessPoolExecutor whose workers are spawned with python_executable()."""
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(python_executable())
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)